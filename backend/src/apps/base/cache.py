@@ -0,0 +1,338 @@
+"""
+Cache helpers: versioned per-user namespaces and a two-level cache.
+
+Values cached with get_or_compute() or set_many() live in the shared
+Django cache and in an in-process LRU in front of it, so repeated reads
+in a process cost no round trip. User versions are kept in the same LRU,
+so a hit on a user's key costs no round trip either. The in-process
+copies are kept for at most LOCAL_CACHE_TIMEOUT seconds, which is the
+longest a process can serve a user's data after another process wrote
+it; the process doing the write moves to the new version at once.
+Cached values are shared between requests and must not be modified.
+
+Values have a soft timeout: past it they are stale, and for up to
+stale_timeout seconds more one caller recomputes them while every other
+caller is served the stale value. Concurrent misses of a key are
+computed once, by the caller holding its lock in the shared cache.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+# key -> (local expiry, fresh until, value) of the process's copies
+_local = OrderedDict()
+_local_lock = threading.Lock()
+# key -> Event set when this process finishes computing the key
+_computing = {}
+# Seconds between checks for a value another process is computing
+LOCK_POLL_INTERVAL = 0.05
+
+_deferred = threading.local()
+
+
+def _version_key(user_id):
+    return f"user:{user_id}:version"
+
+
+def get_user_version(user_id):
+    """
+    Get the cache version for a user's data.
+
+    The version is read from the process for up to LOCAL_CACHE_TIMEOUT
+    seconds, and from the shared cache otherwise. A missing version is
+    seeded with a random one rather than a fixed number, so entries
+    written under a previously evicted version are never reused.
+
+    Args:
+        user_id: ID of the user owning the cached data
+
+    Returns:
+        str: Current version of the user's cache namespace
+    """
+    key = _version_key(user_id)
+    now = time.time()
+    entry = _get_local(key, now)
+    if entry is not None:
+        return entry[1]
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    _set_local(key, (now + settings.LOCAL_CACHE_TIMEOUT, version), now)
+    return version
+
+
+def bump_user_version(user_id):
+    """
+    Invalidate everything cached for a user by moving to a new version.
+
+    The new version is random rather than incremented, so writers bumping
+    concurrently never agree on the same one and no bump is lost, even
+    with cache backends whose incr() is not atomic.
+
+    Args:
+        user_id: ID of the user whose data changed
+    """
+    if user_id is None:
+        return
+    user_ids = getattr(_deferred, "user_ids", None)
+    if user_ids is not None:
+        user_ids.add(user_id)
+        return
+    key = _version_key(user_id)
+    version = uuid.uuid4().hex
+    cache.set(key, version, timeout=None)
+    now = time.time()
+    _set_local(key, (now + settings.LOCAL_CACHE_TIMEOUT, version), now)
+
+
+@contextmanager
+def deferred_version_bumps():
+    """
+    Bump each user's version once at the end instead of on every write.
+
+    Enter it outside the transaction making the writes, so the versions
+    move only once they are committed.
+
+    Yields:
+        set: IDs of the users whose versions will be bumped
+    """
+    if getattr(_deferred, "user_ids", None) is not None:
+        yield _deferred.user_ids
+        return
+    _deferred.user_ids = user_ids = set()
+    try:
+        yield user_ids
+    finally:
+        _deferred.user_ids = None
+    for user_id in user_ids:
+        bump_user_version(user_id)
+
+
+def user_cache_key(user_id, name):
+    """
+    Build a cache key inside a user's versioned namespace.
+
+    Args:
+        user_id: ID of the user owning the cached data
+        name: Name of the cached value within the namespace
+
+    Returns:
+        str: Cache key that changes whenever the user's version is bumped
+    """
+    return f"user:{user_id}:v{get_user_version(user_id)}:{name}"
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=None):
+    """
+    Get a cached value, computing and caching it on a miss.
+
+    Args:
+        key: Cache key
+        compute: Callable returning the value
+        timeout: Seconds the value is fresh
+        stale_timeout: Seconds a stale value may still be served while it is
+            recomputed, defaults to CACHE_STALE_TIMEOUT
+
+    Returns:
+        tuple: The value, and "HIT", "STALE" or "MISS"
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.CACHE_STALE_TIMEOUT
+    now = time.time()
+    entry = _get_entry(key, now)
+    if entry and entry[0] > now:
+        return entry[1], "HIT"
+
+    event, leader = _claim(key)
+    if not leader:
+        if entry:
+            return entry[1], "STALE"
+        entry = _wait_for(key, event)
+        if entry:
+            return entry[1], "HIT"
+        # The leader is taking too long: compute the value here, leaving the
+        # leader's claim, and its other waiters, to the leader
+        value = compute()
+        _set_entry(key, value, timeout, stale_timeout)
+        return value, "MISS"
+    try:
+        value = compute()
+        _set_entry(key, value, timeout, stale_timeout)
+    finally:
+        _release(key, event)
+    return value, "MISS"
+
+
+def set_value(key, value, timeout, stale_timeout=None):
+    """
+    Cache a value in both levels, replacing any cached one.
+
+    Args:
+        key: Cache key
+        value: Value to cache
+        timeout: Seconds the value is fresh
+        stale_timeout: Seconds it may be served stale afterwards, defaults
+            to CACHE_STALE_TIMEOUT
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.CACHE_STALE_TIMEOUT
+    _set_entry(key, value, timeout, stale_timeout)
+
+
+def get_many(keys):
+    """
+    Get the fresh cached values of several keys.
+
+    Keys missing from the process are fetched from the shared cache with
+    one get_many() call.
+
+    Args:
+        keys: Cache keys
+
+    Returns:
+        dict: Values of the keys that have a fresh value
+    """
+    now = time.time()
+    found = {}
+    missing = []
+    for key in keys:
+        entry = _get_local(key, now)
+        if entry is None:
+            missing.append(key)
+        elif entry[0] > now:
+            found[key] = entry[1]
+    if missing:
+        for key, entry in cache.get_many(missing).items():
+            _set_local(key, entry, now)
+            if entry[0] > now:
+                found[key] = entry[1]
+    return found
+
+
+def set_many(values, timeout):
+    """
+    Cache several values in both levels, with one set_many() call.
+
+    Args:
+        values: Dict of values by cache key
+        timeout: Seconds the values are fresh
+    """
+    now = time.time()
+    entries = {key: (now + timeout, value) for key, value in values.items()}
+    cache.set_many(entries, timeout)
+    for key, entry in entries.items():
+        _set_local(key, entry, now)
+
+
+def clear_local():
+    """Drop every value held by the process"""
+    with _local_lock:
+        _local.clear()
+
+
+def _get_entry(key, now):
+    """Get the (fresh until, value) entry of a key from either level"""
+    entry = _get_local(key, now)
+    if entry is None:
+        entry = cache.get(key)
+        if entry is not None:
+            _set_local(key, entry, now)
+    return entry
+
+
+def _set_entry(key, value, timeout, stale_timeout):
+    """Store a value in both levels"""
+    now = time.time()
+    entry = (now + timeout, value)
+    cache.set(key, entry, timeout + stale_timeout)
+    _set_local(key, entry, now, stale_timeout)
+
+
+def _get_local(key, now):
+    """Get the entry of a key held by the process, if it has not expired"""
+    with _local_lock:
+        local = _local.get(key)
+        if local is None:
+            return None
+        if local[0] <= now:
+            del _local[key]
+            return None
+        _local.move_to_end(key)
+        return local[1:]
+
+
+def _set_local(key, entry, now, stale_timeout=0):
+    """Keep an entry in the process for up to LOCAL_CACHE_TIMEOUT seconds"""
+    expires = min(entry[0] + stale_timeout, now + settings.LOCAL_CACHE_TIMEOUT)
+    if expires <= now:
+        return
+    with _local_lock:
+        _local[key] = (expires, *entry)
+        _local.move_to_end(key)
+        while len(_local) > settings.LOCAL_CACHE_MAX_ITEMS:
+            _local.popitem(last=False)
+
+
+def _claim(key):
+    """
+    Claim the computation of a key.
+
+    Returns:
+        tuple: Event set when the computation in this process ends, and
+            whether the caller is to compute the value
+    """
+    with _local_lock:
+        event = _computing.get(key)
+        if event is not None:
+            return event, False
+        event = _computing[key] = threading.Event()
+    if cache.add(f"{key}:lock", True, settings.CACHE_LOCK_TIMEOUT):
+        return event, True
+    # Another process computes it
+    _release(key, event, shared=False)
+    return None, False
+
+
+def _release(key, event, shared=True):
+    """
+    End a computation claimed with _claim(), by the caller that claimed it.
+
+    Args:
+        key: Cache key that was computed
+        event: Event the claim returned
+        shared: Whether the lock in the shared cache was taken too
+    """
+    if shared:
+        cache.delete(f"{key}:lock")
+    with _local_lock:
+        if _computing.get(key) is event:
+            del _computing[key]
+    event.set()
+
+
+def _wait_for(key, event):
+    """
+    Wait for the value another caller is computing.
+
+    Returns:
+        tuple: The (fresh until, value) entry, None if it did not arrive
+            within CACHE_LOCK_TIMEOUT seconds
+    """
+    if event is not None:
+        event.wait(settings.CACHE_LOCK_TIMEOUT)
+        return _get_entry(key, time.time())
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            _set_local(key, entry, time.time())
+            return entry
+    return None
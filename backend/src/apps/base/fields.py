@@ -0,0 +1,69 @@
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class RankedChoiceField(models.PositiveSmallIntegerField):
+    """
+    Choice field stored as the position of its value in the choices.
+
+    Python code, querysets, forms and serializers keep working with the
+    string values ("low", "urgent", ...), while the column holds a small
+    integer, so it is compact to store and index and sorts by meaning:
+    ORDER BY on the column is an ORDER BY on rank. The order of the choices
+    is therefore part of the schema; new choices go at the end.
+
+    Args:
+        aliases: Optional mapping of legacy values to the choice they stand
+            for, accepted on input but never returned
+    """
+
+    def __init__(self, *args, aliases=None, **kwargs):
+        self.aliases = dict(aliases or {})
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.aliases:
+            kwargs["aliases"] = self.aliases
+        return name, path, args, kwargs
+
+    @cached_property
+    def ranks(self):
+        """Rank of each choice value"""
+        return {value: rank for rank, (value, label) in enumerate(self.choices)}
+
+    @cached_property
+    def values(self):
+        """Choice value of each rank"""
+        return {rank: value for value, rank in self.ranks.items()}
+
+    @cached_property
+    def validators(self):
+        # The integer range validators would compare the string values with
+        # numbers; the choices already bound them
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.values.get(value, value)
+
+    def to_python(self, value):
+        if value is None or value == "":
+            return value
+        if isinstance(value, int):
+            return self.values.get(value, value)
+        return self.aliases.get(value, value)
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or isinstance(value, int):
+            return value
+        value = self.aliases.get(value, value)
+        try:
+            return self.ranks[value]
+        except KeyError:
+            raise ValueError(
+                f"Field '{self.name}' expected one of {list(self.ranks)} "
+                f"but got {value!r}."
+            )
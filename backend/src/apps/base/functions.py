@@ -0,0 +1,94 @@
+from django.db.models import DateField, Func, IntegerField, Value
+
+
+class DaysBetween(Func):
+    """
+    Whole number of days from the second date expression to the first.
+
+    Returns NULL when either date is NULL, so it can be used directly
+    on nullable date columns such as due dates.
+    """
+
+    arity = 2
+    output_field = IntegerField()
+    template = "(%(expressions)s)"
+    arg_joiner = " - "
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function="DATEDIFF",
+            template="%(function)s(%(expressions)s)",
+            arg_joiner=", ",
+            **extra_context,
+        )
+
+
+class AddDays(Func):
+    """
+    Date expression moved by a whole number of days.
+
+    NULL dates stay NULL, so it can be used in UPDATEs of nullable date
+    columns such as start and due dates.
+    """
+
+    output_field = DateField()
+    template = "(%(expressions)s)"
+    arg_joiner = " + "
+
+    def __init__(self, expression, days, **extra):
+        super().__init__(expression, Value(int(days)), **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="date(%(expressions)s || ' days')",
+            arg_joiner=", ",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="DATE_ADD(%(expressions)s DAY)",
+            arg_joiner=", INTERVAL ",
+            **extra_context,
+        )
+
+
+class ChoiceRank(Func):
+    """
+    Position of a field's value in an ordered list of choices.
+
+    Sorts choice fields by meaning rather than alphabetically, e.g. low,
+    medium, high, urgent. The choices are written into the SQL as literals
+    instead of query parameters, so the expression compiles to the same SQL
+    in a query as in an index and the database can use that index to sort.
+    Values outside the choices rank as NULL.
+    """
+
+    output_field = IntegerField()
+
+    def __init__(self, expression, choices, **extra):
+        self.choices = list(choices)
+        super().__init__(expression, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        field_sql, params = compiler.compile(self.source_expressions[0])
+        whens = " ".join(
+            "WHEN %s = '%s' THEN %d" % (field_sql, choice.replace("'", "''"), rank)
+            for rank, choice in enumerate(self.choices)
+        )
+        return f"(CASE {whens} ELSE NULL END)", params
@@ -1,3 +1,5 @@
 from .time_stamped import TimeStampedModel
 from .auditable import AuditableModel
-from .trackable import TrackableModel
\ No newline at end of file
+from .trackable import TrackableModel
+from .soft_deletable import SoftDeletableModel
+from .tracking import FieldTrackerMixin, CounterFieldsMixin
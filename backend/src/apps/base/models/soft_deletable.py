@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class SoftDeletableModel(models.Model):
+    """Rows deactivated through the trash remember when they were trashed"""
+
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the row was moved to the trash",
+    )
+
+    class Meta:
+        abstract = True
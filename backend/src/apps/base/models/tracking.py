@@ -0,0 +1,63 @@
+class FieldTrackerMixin:
+    """
+    Remembers the values of tracked_fields as last loaded or saved.
+
+    Signal receivers use get_saved_values() to work out what changed in a
+    save without reading the row back from the database.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_saved_values()
+        return instance
+
+    def remember_saved_values(self):
+        """Snapshot the current values of the tracked fields"""
+        deferred = self.get_deferred_fields()
+        if any(field in deferred for field in self.tracked_fields):
+            self._saved_values = None
+        else:
+            self._saved_values = {
+                field: getattr(self, field) for field in self.tracked_fields
+            }
+
+    def get_saved_values(self):
+        """
+        Get the tracked field values as they are stored in the database.
+
+        Returns:
+            dict: Tracked field values, or None if they are not known
+        """
+        return getattr(self, "_saved_values", None)
+
+    def get_current_values(self):
+        """Get the current (possibly unsaved) values of the tracked fields"""
+        return {field: getattr(self, field) for field in self.tracked_fields}
+
+
+class CounterFieldsMixin:
+    """
+    Keeps save() from overwriting counters maintained with F() updates.
+
+    Counter columns are changed in place by the database, so the values on
+    a loaded instance may be stale. Saving an existing instance therefore
+    writes every concrete field except counter_fields.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
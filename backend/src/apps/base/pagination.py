@@ -0,0 +1,291 @@
+import binascii
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import get_or_compute, user_cache_key
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (created_at, id), newest first.
+
+    Each page is fetched with a range condition on the last row seen
+    instead of an OFFSET, and no total is counted, so deep pages cost the
+    same as the first one. Rows inserted while a client pages through the
+    list never shift the pages it has not seen yet. Other orderings cannot
+    be paged this way and are rejected.
+    """
+
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+    invalid_ordering_message = "Cursor pagination only supports -created_at."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Fetch the page after (or before) the position in the cursor.
+
+        Args:
+            queryset: Filtered queryset to paginate
+            request: The current request
+            view: The view being paginated
+
+        Returns:
+            list: Objects on the requested page
+
+        Raises:
+            ValidationError: If another ordering than -created_at is requested
+        """
+        ordering = request.query_params.get(self.ordering_query_param)
+        if ordering and ordering != "-created_at":
+            raise ValidationError(
+                {self.ordering_query_param: [self.invalid_ordering_message]}
+            )
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            reverse = False
+            queryset = queryset.order_by("-created_at", "-id")
+        else:
+            created_at, pk, reverse = cursor
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gte=created_at)
+                    & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+                ).order_by("created_at", "id")
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lte=created_at)
+                    & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+                ).order_by("-created_at", "-id")
+
+        # One extra row tells whether there is a page beyond this one
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        if reverse:
+            self.page.reverse()
+        self.has_next = has_more if not reverse else True
+        self.has_previous = cursor is not None if not reverse else has_more
+        return self.page
+
+    def get_paginated_response(self, data):
+        """Wrap the page in next/previous cursor links"""
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the paginated response for the API schema"""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        """Build the link to the page after the last row"""
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        """Build the link to the page before the first row"""
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.build_link(self.page[0], reverse=True)
+
+    def build_link(self, obj, reverse):
+        """Build a page link positioned on the given object"""
+        position = [obj.created_at.isoformat(), obj.pk, reverse]
+        cursor = urlsafe_b64encode(json.dumps(position).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """
+        Read the position from the request's cursor parameter.
+
+        Returns:
+            tuple: (created_at, id, reverse), or None on the first page
+
+        Raises:
+            NotFound: If the cursor cannot be decoded
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk, reverse = json.loads(urlsafe_b64decode(encoded.encode()))
+            return datetime.fromisoformat(created_at), int(pk), bool(reverse)
+        except (binascii.Error, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class NoCountPagination(PageNumberPagination):
+    """
+    Page number pagination that does not count the result set.
+
+    One row more than the page size is fetched to tell whether a next page
+    exists, so a page costs a single query. Subclasses may return a total
+    from get_count(), which is then reported as approximate_count.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Fetch the requested page plus one row.
+
+        Args:
+            queryset: Filtered queryset to paginate
+            request: The current request
+            view: The view being paginated
+
+        Returns:
+            list: Objects on the requested page
+
+        Raises:
+            NotFound: If the page number is invalid or past the last page
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message)
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset : offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.has_next = len(rows) > page_size
+        self.count = self.get_count(queryset)
+        return rows[:page_size]
+
+    def get_count(self, queryset):
+        """Get the total to report with the page, None to report none"""
+        return None
+
+    def get_paginated_response(self, data):
+        """Wrap the page in has_next and next/previous page links"""
+        payload = {
+            "has_next": self.has_next,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload["approximate_count"] = self.count
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the paginated response for the API schema"""
+        return {
+            "type": "object",
+            "required": ["has_next", "results"],
+            "properties": {
+                "has_next": {"type": "boolean"},
+                "approximate_count": {"type": "integer"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        """Build the link to the next page"""
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        """Build the link to the previous page"""
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class EstimatedCountPagination(NoCountPagination):
+    """
+    Count-free pagination that reports a cheap approximate total.
+
+    On PostgreSQL the total is the planner's row estimate, which costs no
+    scan. Estimates below PAGINATION_EXACT_COUNT_THRESHOLD, and totals on
+    other databases, come from an exact COUNT(*) cached in the user's
+    namespace for PAGINATION_COUNT_CACHE_TIMEOUT seconds, so it is also
+    dropped as soon as the user writes.
+    """
+
+    def get_count(self, queryset):
+        """Get the planner estimate or a cached exact count"""
+        queryset = queryset.order_by()
+        if connections[queryset.db].vendor == "postgresql":
+            estimate = self.get_planner_estimate(queryset)
+            if estimate >= settings.PAGINATION_EXACT_COUNT_THRESHOLD:
+                return estimate
+        return self.get_cached_count(queryset)
+
+    def get_planner_estimate(self, queryset):
+        """
+        Get the number of rows the PostgreSQL planner expects a query to return.
+
+        Args:
+            queryset: Queryset to estimate
+
+        Returns:
+            int: Estimated row count
+        """
+        sql, params = queryset.query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_cached_count(self, queryset):
+        """
+        Count the queryset, reusing a recent count of the same query.
+
+        Args:
+            queryset: Queryset to count
+
+        Returns:
+            int: Number of rows, at most PAGINATION_COUNT_CACHE_TIMEOUT old, or
+                CACHE_STALE_TIMEOUT more while a request recounts it
+        """
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.md5(f"{sql}:{params}".encode()).hexdigest()
+        key = user_cache_key(self.request.user.pk, f"count:{digest}")
+        count, _ = get_or_compute(
+            key, queryset.count, settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        )
+        return count
@@ -0,0 +1,95 @@
+"""
+Renderers for streamed exports.
+
+Each renderer turns an iterable of rows into text one chunk at a time,
+so an export can be sent with a StreamingHttpResponse while the rows are
+still being read from the database. They also render ordinary response
+data, such as validation errors, so DRF can use them for any response of
+a view that offers them.
+"""
+
+import csv
+import io
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+# Rows rendered into each chunk of a stream
+ROWS_PER_CHUNK = 500
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Base class of renderers producing text a chunk of rows at a time.
+
+    Subclasses implement render_header() and render_rows().
+    """
+
+    charset = "utf-8"
+
+    def render_header(self, fields):
+        """Get the text sent before the first row"""
+        return ""
+
+    def render_rows(self, rows, fields):
+        """Get the text of a list of rows"""
+        raise NotImplementedError
+
+    def stream(self, rows, fields):
+        """
+        Render rows lazily.
+
+        The header is yielded before the first row is read, so the response
+        starts before the query has returned anything.
+
+        Args:
+            rows: Iterable of tuples of values, in the order of fields
+            fields: Names of the columns
+
+        Yields:
+            str: The header, then the rows in chunks of ROWS_PER_CHUNK
+        """
+        header = self.render_header(fields)
+        if header:
+            yield header
+        rows = iter(rows)
+        while chunk := list(islice(rows, ROWS_PER_CHUNK)):
+            yield self.render_rows(chunk, fields)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list of dicts, or a single dict, e.g. an error response"""
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        values = [[row.get(field) for field in fields] for row in rows]
+        return "".join(self.stream(values, fields)).encode(self.charset)
+
+
+class CSVRenderer(StreamingRenderer):
+    """Rows as comma-separated values with a header line"""
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def render_header(self, fields):
+        return self.render_rows([fields], fields)
+
+    def render_rows(self, rows, fields):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Rows as newline-delimited JSON, one object per line"""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    encoder = DjangoJSONEncoder()
+
+    def render_rows(self, rows, fields):
+        return "".join(
+            self.encoder.encode(dict(zip(fields, row))) + "\n" for row in rows
+        )
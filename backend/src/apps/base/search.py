@@ -0,0 +1,197 @@
+"""
+Full-text search backed by the database's own text index.
+
+On SQLite each searchable table gets an external-content FTS5 table named
+<table>_fts, kept in step by triggers; on PostgreSQL it gets a generated
+tsvector column, search_vector, with a GIN index. Either way the index is
+maintained by the database on every write, including bulk_create() and
+queryset update(), so no Python code has to remember to refresh it.
+
+The FTS5 table also indexes the column naming the row's owner, so a search
+only walks the owner's part of each word's postings instead of every
+user's matches. Other databases have no index; search() falls back to
+icontains there.
+"""
+
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = "english"
+MAX_TERMS = 10
+
+
+def create_search_index(schema_editor, table, fields, scope):
+    """
+    Create the full-text index of a table and fill it with the existing rows.
+
+    Safe to run again, e.g. after SQLite rebuilt the table and dropped its
+    triggers.
+
+    Args:
+        schema_editor: Schema editor of the running migration
+        table: Name of the table to index
+        fields: Text columns to index, most important first
+        scope: Column naming the owner searches are limited to
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        columns = ", ".join([*fields, scope])
+        new_values = ", ".join(f"new.{column}" for column in [*fields, scope])
+        old_values = ", ".join(f"old.{column}" for column in [*fields, scope])
+        remove_old = (
+            f"INSERT INTO {table}_fts({table}_fts, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old_values});"
+        )
+        add_new = (
+            f"INSERT INTO {table}_fts(rowid, {columns}) VALUES (new.id, {new_values});"
+        )
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5("
+            f"{columns}, content='{table}', content_rowid='id', "
+            "tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_insert "
+            f"AFTER INSERT ON {table} BEGIN {add_new} END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_delete "
+            f"AFTER DELETE ON {table} BEGIN {remove_old} END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_update "
+            f"AFTER UPDATE OF {columns} ON {table} BEGIN {remove_old} {add_new} END"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')"
+        )
+    elif vendor == "postgresql":
+        weights = "ABCD"
+        vector = " || ".join(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({field}, '')), "
+            f"'{weights[min(index, 3)]}')"
+            for index, field in enumerate(fields)
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({vector}) STORED"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_search_idx "
+            f"ON {table} USING GIN (search_vector)"
+        )
+
+
+def drop_search_index(schema_editor, table):
+    """
+    Drop the full-text index of a table.
+
+    Args:
+        schema_editor: Schema editor of the running migration
+        table: Name of the indexed table
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{trigger}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_idx")
+        schema_editor.execute(
+            f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector"
+        )
+
+
+def get_search_terms(query):
+    """
+    Split a user's search query into plain words.
+
+    Operators and punctuation are dropped, so no input can break the
+    database's query syntax.
+
+    Args:
+        query: Raw search string
+
+    Returns:
+        list: Up to MAX_TERMS words
+    """
+    return re.findall(r"\w+", query or "")[:MAX_TERMS]
+
+
+def search(queryset, query, fields, scope):
+    """
+    Filter a queryset to the rows matching every word of a query, best first.
+
+    Matching rows are annotated with search_rank, higher meaning more
+    relevant, and ordered by it, then newest first.
+
+    Args:
+        queryset: Queryset of an indexed model to search within
+        query: Raw search string
+        fields: Indexed text fields, used where there is no index
+        scope: (column, value) pair of the indexed owner column, matching
+            every row the queryset can return
+
+    Returns:
+        QuerySet: The ranked matches
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    table = queryset.model._meta.db_table
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        # Quoted terms are matched literally and ANDed with the owner
+        column, value = scope
+        match = " ".join(f'"{term}"' for term in terms) + f' {column}:"{value}"'
+        # The owner column must not count towards bm25(), which is lower
+        # for better matches
+        weights = ", ".join(["1.0"] * len(fields) + ["0.0"])
+        matches = f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH %s"
+        # bm25() reads the corpus statistics every time the MATCH runs, so
+        # the ranks of all matches are materialized once per query and
+        # looked up by row, rather than matched again for each row
+        rank = (
+            f"WITH ranks AS MATERIALIZED (SELECT rowid AS id, "
+            f"-bm25({table}_fts, {weights}) AS rank FROM {table}_fts "
+            f"WHERE {table}_fts MATCH %s) "
+            f"SELECT rank FROM ranks WHERE ranks.id = {table}.id"
+        )
+        queryset = queryset.filter(
+            RawSQL(f"{table}.id IN ({matches})", [match], output_field=BooleanField())
+        ).annotate(search_rank=RawSQL(f"({rank})", [match], output_field=FloatField()))
+    elif vendor == "postgresql":
+        tsquery = f"plainto_tsquery('{SEARCH_CONFIG}', %s)"
+        queryset = queryset.filter(
+            RawSQL(
+                f"{table}.search_vector @@ {tsquery}",
+                [" ".join(terms)],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({table}.search_vector, {tsquery})",
+                [" ".join(terms)],
+                output_field=FloatField(),
+            )
+        )
+    else:
+        queryset = queryset.filter(
+            reduce(
+                and_,
+                (
+                    reduce(
+                        or_, (Q(**{f"{field}__icontains": term}) for field in fields)
+                    )
+                    for term in terms
+                ),
+            )
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    return queryset.order_by("-search_rank", "-created_at", "-id")
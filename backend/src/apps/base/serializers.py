@@ -0,0 +1,107 @@
+"""
+Cache of serialized objects for list responses.
+
+Serializers opt in with FragmentCacheMixin and
+Meta.list_serializer_class = FragmentCacheListSerializer. A list then
+looks up the cached representation of every object with one get_many()
+call (see base.cache) and only serializes the misses.
+
+An object's fragment is keyed on its model, primary key, updated_at, the
+serializer and its fragment_version, so saving the object or changing
+the serializer's output replaces it. Values that change without touching
+updated_at are part of the key as well: the fragment_key_fields (such as
+counters kept up to date with queryset updates), the keys of nested
+serializers that use the mixin, the strings rendered by
+StringRelatedFields (such as the user a project was created by), and the
+day for serializers with fragment_daily set, whose output depends on
+today's date.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework import serializers
+
+from .cache import get_many, set_many
+
+
+class FragmentCacheMixin:
+    """
+    Serializer mixin building the fragment cache key of an object.
+
+    Bump fragment_version whenever the serializer's output changes.
+    """
+
+    fragment_version = 1
+    fragment_key_fields = ()
+    fragment_daily = False
+
+    def get_fragment_key(self, instance, nested_keys=None):
+        """
+        Get the cache key of an object's representation.
+
+        Args:
+            instance: Object to serialize
+            nested_keys: Dict remembering the keys of nested objects, so
+                objects shared by a list, such as a project, are keyed once
+
+        Returns:
+            str: Key that changes whenever the representation may change
+        """
+        parts = [
+            type(self).__module__,
+            type(self).__qualname__,
+            self.fragment_version,
+            instance.updated_at.isoformat(),
+        ]
+        parts.extend(getattr(instance, name) for name in self.fragment_key_fields)
+        if nested_keys is None:
+            nested_keys = {}
+        for field in self.fields.values():
+            if isinstance(field, serializers.StringRelatedField):
+                related = field.get_attribute(instance)
+                parts.append(None if related is None else str(related))
+            elif isinstance(field, FragmentCacheMixin):
+                nested = field.get_attribute(instance)
+                if nested is None:
+                    parts.append(None)
+                    continue
+                memo = (field.field_name, nested.pk, nested.updated_at)
+                if memo not in nested_keys:
+                    nested_keys[memo] = field.get_fragment_key(nested, nested_keys)
+                parts.append(nested_keys[memo])
+        if self.fragment_daily:
+            parts.append(timezone.now().date())
+        digest = hashlib.md5(repr(parts).encode()).hexdigest()
+        return f"fragment:{instance._meta.label_lower}:{instance.pk}:{digest}"
+
+
+class FragmentCacheListSerializer(serializers.ListSerializer):
+    """
+    List serializer assembling cached fragments of its child's objects.
+
+    The fragments are shared by every request and must not be modified.
+    FRAGMENT_CACHE_TIMEOUT set to 0 turns the cache off.
+    """
+
+    def to_representation(self, data):
+        if settings.FRAGMENT_CACHE_TIMEOUT <= 0:
+            return super().to_representation(data)
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        items = list(data)
+        nested_keys = {}
+        keys = [self.child.get_fragment_key(item, nested_keys) for item in items]
+        cached = get_many(keys)
+        missing = {}
+        fragments = []
+        for item, key in zip(items, keys):
+            fragment = cached.get(key)
+            if fragment is None:
+                fragment = missing[key] = self.child.to_representation(item)
+            fragments.append(fragment)
+        if missing:
+            set_many(missing, settings.FRAGMENT_CACHE_TIMEOUT)
+        return fragments
@@ -1,3 +1,194 @@
-from django.test import TestCase
+import threading
+import time
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+
+from . import cache as two_level
+from .throttling import clear_throttles, hit
+
+User = get_user_model()
+
+
+class SlidingWindowTest(SimpleTestCase):
+    """Test the sliding window request counter"""
+
+    def setUp(self):
+        clear_throttles()
+
+    def test_limit_within_window(self):
+        """Test that requests beyond the limit wait for the next window"""
+        for _ in range(3):
+            self.assertIsNone(hit("key", 3, 60, 120.0))
+        # The window's requests count in full until the next one starts
+        self.assertEqual(hit("key", 3, 60, 150.0), 30.0)
+        # Other keys have budgets of their own
+        self.assertIsNone(hit("other", 3, 60, 150.0))
+
+    def test_previous_window_slides_out(self):
+        """Test that the previous window counts by its remaining overlap"""
+        for _ in range(4):
+            hit("key", 4, 60, 100.0)
+        # 5/6 of the previous window overlaps: 4 * 5/6 + 1 > 4 requests
+        self.assertIsNone(hit("key", 4, 60, 125.0))
+        self.assertAlmostEqual(hit("key", 4, 60, 125.0), 10.0)
+        # Half of it overlaps: 4 * 0.5 + 1 < 4 requests
+        self.assertIsNone(hit("key", 4, 60, 150.0))
+
+
+class EndpointThrottleTest(APITestCase):
+    """Test the per-scope request budgets of the API"""
+
+    def setUp(self):
+        """Create a user and log in"""
+        clear_throttles()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(self.user)
+
+    def rates(self, **rates):
+        """Override some of the throttle rates"""
+        return self.settings(
+            REST_FRAMEWORK={
+                **settings.REST_FRAMEWORK,
+                "DEFAULT_THROTTLE_RATES": {
+                    **api_settings.DEFAULT_THROTTLE_RATES,
+                    **rates,
+                },
+            }
+        )
+
+    def test_heavy_budget(self):
+        """Test that the dashboard has its own budget and sends Retry-After"""
+        url = reverse("projects:project-dashboard")
+        with self.rates(heavy="2/min"):
+            for _ in range(2):
+                self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertGreater(int(response["Retry-After"]), 0)
+            # Reads are counted separately
+            response = self.client.get(reverse("projects:project-list"))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_auth_budget(self):
+        """Test that anonymous logins are limited by client address"""
+        self.client.force_authenticate(None)
+        url = reverse("user-login")
+        data = {"email": "test@example.com", "password": "wrong"}
+        with self.rates(auth="1/min"):
+            self.assertNotEqual(
+                self.client.post(url, data).status_code,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+            response = self.client.post(url, data)
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class TwoLevelCacheTest(SimpleTestCase):
+    """Test the in-process cache in front of the shared cache"""
+
+    def setUp(self):
+        cache.clear()
+        two_level.clear_local()
+
+    def test_local_level(self):
+        """Test that the process serves values without the shared cache"""
+        self.assertEqual(two_level.get_or_compute("key", lambda: 1, 60), (1, "MISS"))
+        cache.clear()
+        self.assertEqual(two_level.get_or_compute("key", lambda: 2, 60), (1, "HIT"))
+        two_level.clear_local()
+        self.assertEqual(two_level.get_or_compute("key", lambda: 3, 60), (3, "MISS"))
+        two_level.clear_local()
+        self.assertEqual(two_level.get_or_compute("key", lambda: 4, 60), (3, "HIT"))
+
+    def test_stale_while_revalidate(self):
+        """Test that a stale value is served while another caller recomputes"""
+        two_level.set_value("key", "old", timeout=0, stale_timeout=60)
+        cache.add("key:lock", True)
+        self.assertEqual(
+            two_level.get_or_compute("key", lambda: "new", 60), ("old", "STALE")
+        )
+        cache.delete("key:lock")
+        self.assertEqual(
+            two_level.get_or_compute("key", lambda: "new", 60), ("new", "MISS")
+        )
+
+    def test_single_flight(self):
+        """Test that concurrent misses compute the value once"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    two_level.get_or_compute("key", compute, 60)[0]
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 5)
+
+    def test_slow_leader_keeps_its_claim(self):
+        """Test that a waiter giving up on a slow leader leaves its claim"""
+        started = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                time.sleep(0.5)
+            return len(calls)
+
+        with self.settings(CACHE_LOCK_TIMEOUT=0.1):
+            leader = threading.Thread(
+                target=lambda: two_level.get_or_compute("key", compute, 60)
+            )
+            leader.start()
+            started.wait()
+            # The waiter gives up on the leader and computes the value itself
+            self.assertEqual(two_level.get_or_compute("key", compute, 60), (2, "MISS"))
+            self.assertIn("key", two_level._computing)
+            leader.join()
+        self.assertNotIn("key", two_level._computing)
+        self.assertEqual(len(calls), 2)
+
+    def test_user_version(self):
+        """Test that versions are read in process and every bump changes them"""
+        version = two_level.get_user_version(1)
+        cache.clear()
+        self.assertEqual(two_level.get_user_version(1), version)
+        two_level.bump_user_version(1)
+        bumped = two_level.get_user_version(1)
+        self.assertNotEqual(bumped, version)
+        # A bump by another process is read once the local copy expires
+        cache.set("user:1:version", "other", timeout=None)
+        self.assertEqual(two_level.get_user_version(1), bumped)
+        two_level.clear_local()
+        self.assertEqual(two_level.get_user_version(1), "other")
+
+    def test_get_many(self):
+        """Test that several values are read with one shared cache call"""
+        two_level.set_many({"a": 1, "b": 2}, 60)
+        two_level.clear_local()
+        self.assertEqual(two_level.get_many(["a", "b", "c"]), {"a": 1, "b": 2})
+        cache.clear()
+        self.assertEqual(two_level.get_many(["a", "b"]), {"a": 1, "b": 2})
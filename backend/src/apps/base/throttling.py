@@ -0,0 +1,135 @@
+"""
+Request rate limits with in-process sliding-window counters.
+
+Every request is counted against one budget, chosen by the view:
+
+- "auth" for login, registration, token refresh and logout,
+- "heavy" for expensive endpoints such as the export, the import and the
+  dashboard,
+- otherwise "read" for safe methods and "write" for the others.
+
+Views pick "auth" or "heavy" with a throttle_scope attribute, which
+actions can set as @action(throttle_scope=...). The rates are the DRF
+DEFAULT_THROTTLE_RATES of those scopes. Budgets are per user, or per
+client IP for anonymous requests.
+
+A sliding window counter keeps only two numbers per user and scope: the
+requests in the current fixed window and in the one before it. The rate
+is estimated by weighting the previous window by how much of it still
+overlaps the sliding window, so a check is a dict lookup under a lock and
+costs no cache or database round trip. Counters are kept in memory for
+the most recently seen THROTTLE_MAX_KEYS users and scopes of the process,
+so each process enforces the rates on its own.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# key -> [start of the current window, previous count, current count]
+_windows = OrderedDict()
+_lock = threading.Lock()
+
+
+def hit(key, limit, duration, now):
+    """
+    Count a request, unless the key has used up its budget.
+
+    Args:
+        key: User and scope the request is counted for
+        limit: Requests allowed per duration
+        duration: Length of the window in seconds
+        now: Current time in seconds
+
+    Returns:
+        float: Seconds until the next request is allowed if this one is
+            refused, None if it was counted
+    """
+    start = now - now % duration
+    with _lock:
+        window = _windows.get(key)
+        if window is None:
+            window = _windows[key] = [start, 0, 0]
+            while len(_windows) > settings.THROTTLE_MAX_KEYS:
+                _windows.popitem(last=False)
+        else:
+            _windows.move_to_end(key)
+            if window[0] != start:
+                previous = window[2] if window[0] == start - duration else 0
+                window[:] = [start, previous, 0]
+
+        previous, current = window[1], window[2]
+        elapsed = now - start
+        if previous * (1 - elapsed / duration) + current < limit:
+            window[2] += 1
+            return None
+
+    if current < limit:
+        # Wait until enough of the previous window has slid out
+        return start + duration * (1 - (limit - current) / previous) - now
+    # Wait for the next window, and for enough of this one to slide out
+    return duration - elapsed + duration * (1 - limit / current)
+
+
+def clear_throttles():
+    """Forget every request counted by the process"""
+    with _lock:
+        _windows.clear()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Base class of throttles counting requests in process (see hit()).
+
+    Subclasses set a scope and implement get_cache_key() like for DRF's
+    cache-based throttles.
+    """
+
+    def allow_request(self, request, view):
+        """Count the request, refusing it if its budget is used up"""
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.retry_after = hit(self.key, self.num_requests, self.duration, self.timer())
+        return self.retry_after is None
+
+    def wait(self):
+        """Seconds until the next request is allowed, sent as Retry-After"""
+        return self.retry_after
+
+
+class EndpointRateThrottle(SlidingWindowRateThrottle):
+    """
+    Limits each user to the budget of the endpoint's scope.
+
+    The scope is the view's throttle_scope, or "read" or "write" by the
+    request method.
+    """
+
+    def __init__(self):
+        # The scope, and so the rate, is only known once the view is, in
+        # allow_request()
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None) or (
+            "read" if request.method in SAFE_METHODS else "write"
+        )
+        # Read per request, as DRF binds THROTTLE_RATES once at import
+        self.THROTTLE_RATES = api_settings.DEFAULT_THROTTLE_RATES
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
@@ -1,3 +1,120 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
 
-# Create your views here.
+from .search import get_search_terms, search
+
+
+class PaginationModeMixin:
+    """
+    Lets clients pick a pagination style with a query parameter.
+
+    Views list the extra styles they support in pagination_modes; unknown or
+    missing modes fall back to pagination_class.
+    """
+
+    pagination_query_param = "pagination"
+    pagination_modes = {}
+
+    @property
+    def paginator(self):
+        """The paginator instance for the mode requested by the client"""
+        if not hasattr(self, "_paginator"):
+            params = getattr(getattr(self, "request", None), "query_params", {})
+            mode = params.get(self.pagination_query_param)
+            pagination_class = self.pagination_modes.get(mode, self.pagination_class)
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+
+class TrashMixin:
+    """
+    Soft deletion for model viewsets.
+
+    DELETE moves the object to the trash instead of deleting it, the
+    inactive action lists the trash and the restore action brings an object
+    back. Views implement get_inactive_queryset(), trash_object() and
+    restore_object(), and may refuse a restore in get_restore_error().
+    """
+
+    def get_inactive_queryset(self):
+        """Get the user's inactive objects"""
+        raise NotImplementedError
+
+    def trash_object(self, instance):
+        """Move an object to the trash"""
+        raise NotImplementedError
+
+    def restore_object(self, instance):
+        """Bring an object back from the trash"""
+        raise NotImplementedError
+
+    def get_restore_error(self, instance):
+        """Get the reason an object cannot be restored, None if it can"""
+        return None
+
+    def perform_destroy(self, instance):
+        """Move the object to the trash instead of deleting it"""
+        self.trash_object(instance)
+
+    @action(detail=False, methods=["get"])
+    def inactive(self, request):
+        """List the user's inactive objects"""
+        queryset = self.get_inactive_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=["post"])
+    def restore(self, request, pk=None):
+        """Restore an inactive object"""
+        instance = get_object_or_404(self.get_inactive_queryset(), pk=pk)
+        self.check_object_permissions(request, instance)
+        error = self.get_restore_error(instance)
+        if error:
+            return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
+        self.restore_object(instance)
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+
+class SearchMixin:
+    """
+    Ranked full-text search for model viewsets.
+
+    The search action matches the words of ?q= against the full-text index
+    of the view's model (see base.search) within get_queryset(), so results
+    stay scoped and filtered like the list. Views name the indexed text
+    fields in search_fields and the indexed column holding the owner of a
+    row, which must be the requesting user, in search_scope_field.
+    """
+
+    search_query_param = "q"
+    search_fields = ()
+    search_scope_field = None
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """List the user's objects matching the search query, best first"""
+        query = request.query_params.get(self.search_query_param, "")
+        if not get_search_terms(query):
+            return Response(
+                {"message": "Search query is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = search(
+            self.get_queryset(),
+            query,
+            self.search_fields,
+            (self.search_scope_field, request.user.pk),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
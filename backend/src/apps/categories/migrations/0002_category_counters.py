@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='completed_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active completed tasks'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active projects'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active tasks'),
+        ),
+    ]
@@ -1,8 +1,35 @@
 from django.db import models
-from base.models import TrackableModel
+from base.models import CounterFieldsMixin, SoftDeletableModel, TrackableModel
 
 
-class Category(TrackableModel):
+class CategoryQuerySet(models.QuerySet):
+    """QuerySet for categories with database-computed counts"""
+
+    def with_counts(self):
+        """
+        Annotate num_projects, num_tasks and num_completed_tasks.
+
+        Counts projects and tasks from scratch with conditional counts. Used
+        to verify and repair the stored counter columns.
+        """
+        active_tasks = models.Q(
+            projects__is_active=True, projects__tasks__is_active=True
+        )
+        return self.annotate(
+            num_projects=models.Count(
+                "projects",
+                filter=models.Q(projects__is_active=True),
+                distinct=True,
+            ),
+            num_tasks=models.Count("projects__tasks", filter=active_tasks),
+            num_completed_tasks=models.Count(
+                "projects__tasks",
+                filter=active_tasks & models.Q(projects__tasks__status="completed"),
+            ),
+        )
+
+
+class Category(CounterFieldsMixin, SoftDeletableModel, TrackableModel):
     """
     Provides a way to group related projects and tasks together.
     Inherits from TrackableModel for audit trail and timestamps.
@@ -25,11 +52,40 @@ class Category(TrackableModel):
         default=True, help_text="Whether this category is active and can be used"
     )
 
+    # Counters maintained by projects.counters
+    project_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of active projects"
+    )
+    task_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of active tasks"
+    )
+    completed_task_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of active completed tasks"
+    )
+
+    counter_fields = ("project_count", "task_count", "completed_task_count")
+
+    objects = CategoryQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Category"
         verbose_name_plural = "Categories"
         ordering = ["name"]
         unique_together = ["name", "created_by"]
+        indexes = [
+            # Category list: created_by + is_active, ordered by name
+            models.Index(
+                fields=["created_by", "name"],
+                condition=models.Q(is_active=True),
+                name="category_owner_active_idx",
+            ),
+            # Trashed categories, for the purge
+            models.Index(
+                fields=["deleted_at"],
+                condition=models.Q(deleted_at__isnull=False),
+                name="category_trash_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -41,7 +97,7 @@ class Category(TrackableModel):
         Returns:
             int: Number of projects in this category
         """
-        return self.projects.filter(is_active=True).count()
+        return self.project_count
 
     def get_task_count(self):
         """
@@ -50,8 +106,4 @@ class Category(TrackableModel):
         Returns:
             int: Number of tasks in this category
         """
-        from tasks.models import Task
-
-        return Task.objects.filter(
-            project__category=self, project__is_active=True, is_active=True
-        ).count()
+        return self.task_count
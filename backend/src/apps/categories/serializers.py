@@ -1,15 +1,17 @@
 from rest_framework import serializers
+from base.serializers import FragmentCacheListSerializer, FragmentCacheMixin
 from .models import Category
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(FragmentCacheMixin, serializers.ModelSerializer):
     """Serializer for Category model"""
 
-    task_count = serializers.SerializerMethodField()
-    project_count = serializers.SerializerMethodField()
+    # Counters are updated without touching updated_at
+    fragment_key_fields = ("task_count", "completed_task_count", "project_count")
 
     class Meta:
         model = Category
+        list_serializer_class = FragmentCacheListSerializer
         fields = (
             "id",
             "name",
@@ -17,6 +19,7 @@ class CategorySerializer(serializers.ModelSerializer):
             "color",
             "is_active",
             "task_count",
+            "completed_task_count",
             "project_count",
             "created_at",
             "updated_at",
@@ -26,17 +29,10 @@ class CategorySerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "task_count",
+            "completed_task_count",
             "project_count",
         )
 
-    def get_task_count(self, obj):
-        """Get count of tasks in this category"""
-        return obj.get_task_count()
-
-    def get_project_count(self, obj):
-        """Get count of projects in this category"""
-        return obj.get_project_count()
-
 
 class CategoryCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new categories"""
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from base.cache import bump_user_version
+from .models import Category
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_owner_cache(sender, instance, **kwargs):
+    """Invalidate the owner's cached data when one of their categories changes"""
+    bump_user_version(instance.created_by_id)
@@ -4,6 +4,8 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 from django.db import IntegrityError
 from django.contrib.auth import get_user_model
+from projects.models import Project
+from tasks.models import Task
 from .models import Category
 
 User = get_user_model()
@@ -120,14 +122,105 @@ class CategoryViewSetTest(APITestCase):
         self.assertEqual(response.data["color"], "#FF6600")
 
     def test_delete_category(self):
-        """Test deleting a category permanently"""
+        """Test deleting a category moves it to the trash"""
         url = reverse("categories:category-detail", args=[self.category.id])
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
-        # Category should be completely deleted
-        self.assertLess(Category.objects.filter(created_by=self.user).count(), 1)
+        # Category should be inactive and trashed, not deleted
+        self.category.refresh_from_db()
+        self.assertFalse(self.category.is_active)
+        self.assertIsNotNone(self.category.deleted_at)
+        response = self.client.get(reverse("categories:category-list"))
+        self.assertEqual(response.data["count"], 0)
+
+
+class CategoryCountsTest(APITestCase):
+    """Test that category counts are read from the counter columns"""
+
+    def setUp(self):
+        """Create test user and authenticate"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_category(self, index, projects=2, tasks=3):
+        """Create a category with active and inactive projects and tasks"""
+        category = Category.objects.create(
+            name=f"Category {index}", created_by=self.user
+        )
+        for project_index in range(projects):
+            project = Project.objects.create(
+                name=f"Project {index}-{project_index}",
+                category=category,
+                created_by=self.user,
+            )
+            for task_index in range(tasks):
+                Task.objects.create(
+                    name=f"Task {task_index}",
+                    project=project,
+                    is_active=task_index > 0,
+                    created_by=self.user,
+                )
+        Project.objects.create(
+            name=f"Inactive {index}",
+            category=category,
+            is_active=False,
+            created_by=self.user,
+        )
+        return category
+
+    def test_list_counts_match_recount(self):
+        """Test that stored counts match a count from scratch"""
+        category = self.create_category(0)
+        url = reverse("categories:category-list")
+        response = self.client.get(url)
+
+        expected = Category.objects.with_counts().get(pk=category.pk)
+        data = response.data["results"][0]
+        self.assertEqual(data["project_count"], expected.num_projects)
+        self.assertEqual(data["task_count"], expected.num_tasks)
+        self.assertEqual(data["project_count"], 2)
+        self.assertEqual(data["task_count"], 4)
+
+    def test_query_count_does_not_grow_with_categories(self):
+        """Test that listing categories runs a fixed number of queries"""
+        url = reverse("categories:category-list")
+        self.create_category(0)
+        # count, page
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        for index in range(1, 6):
+            self.create_category(index)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 6)
+
+
+class CategoryCountFreePaginationTest(APITestCase):
+    """Test the count-free pagination mode of the category list"""
+
+    def setUp(self):
+        """Create test user with 3 categories"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        for index in range(3):
+            Category.objects.create(name=f"Category {index}", created_by=self.user)
+
+    def test_nocount_mode(self):
+        """Test that the list reports has_next instead of a count"""
+        url = reverse("categories:category-list") + "?pagination=nocount"
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        self.assertFalse(response.data["has_next"])
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 3)
 
 
 class CategoryUniqueConstraintTest(TestCase):
@@ -1,24 +1,27 @@
-from rest_framework import viewsets, status
+from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
-from rest_framework.decorators import action
+from base.pagination import EstimatedCountPagination, NoCountPagination
+from base.views import PaginationModeMixin, TrashMixin
+from projects import trash
 from .models import Category
 from .serializers import CategorySerializer, CategoryCreateSerializer
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(TrashMixin, PaginationModeMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing categories.
     """
 
     permission_classes = (IsAuthenticated,)
+    pagination_modes = {
+        "nocount": NoCountPagination,
+        "estimate": EstimatedCountPagination,
+    }
     serializer_class = CategorySerializer
 
     def get_queryset(self):
         """Get categories for current user"""
-        return Category.objects.filter(
-            created_by=self.request.user, is_active=True
-        ).prefetch_related("projects__tasks")
+        return Category.objects.filter(created_by=self.request.user, is_active=True)
 
     def get_serializer_class(self):
         """Use different serializers for different actions"""
@@ -34,39 +37,15 @@ class CategoryViewSet(viewsets.ModelViewSet):
         """Set the updater automatically"""
         serializer.save(updated_by=self.request.user)
 
-    # TODO: Implement soft deletion with restore functionality
-    # - Override perform_destroy to mark as inactive instead of deleting
-    # - Add inactive action to list inactive categories
-    # - Add restore action to reactivate categories
-    # - Update get_queryset to filter by is_active=True by default
-    # - Add get_object override for restore action to find inactive categories
+    def get_inactive_queryset(self):
+        """Get inactive categories for the user"""
+        return Category.objects.filter(created_by=self.request.user, is_active=False)
 
-    def perform_destroy(self, instance):
-        """Delete the category permanently"""
-        instance.delete()
+    def trash_object(self, instance):
+        """Move the category, its projects and their tasks to the trash"""
+        trash.trash_category(instance, self.request.user)
 
-
-# TODO: Future enhancements for soft deletion:
-# @action(detail=False, methods=["get"])
-# def inactive(self, request):
-#     """Get inactive categories for the user"""
-#     inactive_categories = Category.objects.filter(
-#         created_by=request.user, is_active=False
-#     )
-#     serializer = self.get_serializer(inactive_categories, many=True)
-#     return Response(serializer.data)
-
-# @action(detail=True, methods=["post"])
-# def restore(self, request, pk=None):
-#     """Restore an inactive category"""
-#     category = self.get_object()
-#     if category.is_active:
-#         return Response(
-#             {"message": "Category is already active"},
-#             status=status.HTTP_400_BAD_REQUEST,
-#         )
-#     category.is_active = True
-#     category.updated_by = request.user
-#     category.save()
-#     serializer = self.get_serializer(category)
-#     return Response(serializer.data)
+    def restore_object(self, instance):
+        """Restore the category with the projects and tasks trashed with it"""
+        trash.restore_category(instance, self.request.user)
+        instance.refresh_from_db(fields=Category.counter_fields)
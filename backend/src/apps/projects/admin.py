@@ -68,7 +68,7 @@ class ProjectAdmin(admin.ModelAdmin):
         """Display status with color coding"""
         colors = {
             "planning": "#FFA500",  # Orange
-            "active": "#008000",  # Green
+            "in progress": "#008000",  # Green
             "on_hold": "#FFD700",  # Gold
             "completed": "#0000FF",  # Blue
             "cancelled": "#FF0000",  # Red
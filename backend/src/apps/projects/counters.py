@@ -0,0 +1,243 @@
+"""
+Maintenance of the denormalized counters on Project and Category.
+
+Task and project writes are turned into deltas and applied with F()
+expressions, so concurrent writers never overwrite each other's counts.
+Bulk operations that bypass model signals call recount_projects() and
+recount_categories() to recompute the affected rows from scratch, or run
+inside deferred_counters() to have the affected projects recounted once.
+"""
+
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+
+from categories.models import Category
+from .models import Project
+
+# Project counters that also roll up into the project's category
+CATEGORY_TASK_COUNTERS = ("task_count", "completed_task_count")
+
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_counters():
+    """
+    Recount touched projects once at the end instead of applying per-task deltas.
+
+    Bulk writes that bypass model signals add the IDs of the projects they
+    touched to the yielded set; task writes that send signals, such as
+    deletes, add theirs through apply_task_change().
+
+    Yields:
+        set: IDs of the projects to recount when the block exits
+    """
+    if getattr(_deferred, "project_ids", None) is not None:
+        yield _deferred.project_ids
+        return
+    _deferred.project_ids = project_ids = set()
+    try:
+        yield project_ids
+    finally:
+        _deferred.project_ids = None
+    recount_for_projects(project_ids)
+
+
+def task_contribution(values):
+    """
+    Get what a task adds to its project's counters.
+
+    Args:
+        values: The task's tracked field values, or None if it does not exist
+
+    Returns:
+        dict: Counter increments, empty if the task does not count
+    """
+    if not values or not values["is_active"]:
+        return {}
+    return {
+        "task_count": 1,
+        "completed_task_count": 1 if values["status"] == "completed" else 0,
+        "estimated_hours_total": Decimal(values["estimated_hours"] or 0),
+        "actual_hours_total": Decimal(values["actual_hours"] or 0),
+    }
+
+
+def apply_task_change(old_values, new_values):
+    """
+    Update project and category counters for a task write.
+
+    Args:
+        old_values: Tracked values before the write, None for a new task
+        new_values: Tracked values after the write, None for a deleted task
+    """
+    project_ids = getattr(_deferred, "project_ids", None)
+    if project_ids is not None:
+        project_ids.update(
+            values["project_id"] for values in (old_values, new_values) if values
+        )
+        return
+    deltas = {}
+    if old_values:
+        delta = deltas.setdefault(old_values["project_id"], {})
+        for field, value in task_contribution(old_values).items():
+            delta[field] = delta.get(field, 0) - value
+    if new_values:
+        delta = deltas.setdefault(new_values["project_id"], {})
+        for field, value in task_contribution(new_values).items():
+            delta[field] = delta.get(field, 0) + value
+
+    for project_id, delta in deltas.items():
+        add_to_project(project_id, delta)
+
+
+def add_to_project(project_id, delta):
+    """Add counter deltas to a project and, if it is active, to its category"""
+    changes = {field: value for field, value in delta.items() if value}
+    if not changes:
+        return
+    Project.objects.filter(pk=project_id).update(
+        **{field: F(field) + value for field, value in changes.items()}
+    )
+    category_changes = {
+        field: value
+        for field, value in changes.items()
+        if field in CATEGORY_TASK_COUNTERS
+    }
+    if category_changes:
+        Category.objects.filter(
+            projects__pk=project_id, projects__is_active=True
+        ).update(
+            **{field: F(field) + value for field, value in category_changes.items()}
+        )
+
+
+def apply_project_change(project_id, old_values, new_values):
+    """
+    Update category counters for a project write.
+
+    A project adds itself and its task counters to its category while it
+    is active. When it is deleted its tasks have already been removed, so
+    only the project itself is taken away.
+
+    Args:
+        project_id: ID of the project
+        old_values: Tracked values before the write, None for a new project
+        new_values: Tracked values after the write, None for a deleted project
+    """
+    if old_values == new_values:
+        return
+
+    # New projects have no tasks yet and deleted ones have lost theirs
+    counters = {"task_count": 0, "completed_task_count": 0}
+    if old_values is not None and new_values is not None:
+        counters = (
+            Project.objects.filter(pk=project_id)
+            .values(*CATEGORY_TASK_COUNTERS)
+            .first()
+        ) or counters
+
+    deltas = {}
+    for values, sign in ((old_values, -1), (new_values, 1)):
+        if not values or not values["is_active"] or not values["category_id"]:
+            continue
+        delta = deltas.setdefault(values["category_id"], {})
+        delta["project_count"] = delta.get("project_count", 0) + sign
+        for field in CATEGORY_TASK_COUNTERS:
+            delta[field] = delta.get(field, 0) + sign * counters[field]
+
+    for category_id, delta in deltas.items():
+        changes = {field: value for field, value in delta.items() if value}
+        if changes:
+            Category.objects.filter(pk=category_id).update(
+                **{field: F(field) + value for field, value in changes.items()}
+            )
+
+
+def recount_projects(project_ids):
+    """
+    Recompute the counters of the given projects from their tasks.
+
+    The project rows are locked first, so counter deltas from concurrent
+    task writes are applied after the recount instead of being lost.
+
+    Args:
+        project_ids: Iterable of project IDs
+
+    Returns:
+        int: Number of projects whose stored counters had drifted
+    """
+    with transaction.atomic():
+        locked_ids = list(
+            Project.objects.select_for_update()
+            .filter(pk__in=set(project_ids))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        drifted = []
+        for project in Project.objects.filter(pk__in=locked_ids).with_task_counts():
+            expected = {
+                "task_count": project.num_tasks,
+                "completed_task_count": project.num_completed_tasks,
+                "estimated_hours_total": project.sum_estimated_hours,
+                "actual_hours_total": project.sum_actual_hours,
+            }
+            if any(getattr(project, f) != v for f, v in expected.items()):
+                for field, value in expected.items():
+                    setattr(project, field, value)
+                drifted.append(project)
+        Project.objects.bulk_update(drifted, Project.counter_fields)
+    return len(drifted)
+
+
+def recount_categories(category_ids):
+    """
+    Recompute the counters of the given categories from their projects and tasks.
+
+    Args:
+        category_ids: Iterable of category IDs
+
+    Returns:
+        int: Number of categories whose stored counters had drifted
+    """
+    with transaction.atomic():
+        locked_ids = list(
+            Category.objects.select_for_update()
+            .filter(pk__in=set(category_ids))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        drifted = []
+        for category in Category.objects.filter(pk__in=locked_ids).with_counts():
+            expected = {
+                "project_count": category.num_projects,
+                "task_count": category.num_tasks,
+                "completed_task_count": category.num_completed_tasks,
+            }
+            if any(getattr(category, f) != v for f, v in expected.items()):
+                for field, value in expected.items():
+                    setattr(category, field, value)
+                drifted.append(category)
+        Category.objects.bulk_update(drifted, Category.counter_fields)
+    return len(drifted)
+
+
+def recount_for_projects(project_ids):
+    """
+    Recompute counters of the given projects and of the categories they are in.
+
+    Args:
+        project_ids: Iterable of project IDs
+    """
+    project_ids = set(project_ids)
+    recount_projects(project_ids)
+    category_ids = set(
+        Project.objects.filter(pk__in=project_ids, category__isnull=False)
+        .values_list("category_id", flat=True)
+        .distinct()
+    )
+    recount_categories(category_ids)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from base.cache import deferred_version_bumps
+from categories.models import Category
+from projects.counters import deferred_counters
+from projects.models import Project
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    """
+    Hard-delete categories, projects and tasks trashed before the retention window.
+
+    Tasks are purged first, including all tasks of the projects about to
+    be purged, then projects, then categories, so no delete has to cascade
+    through a large tree. Each batch is deleted in its own
+    short transaction, which keeps locks brief on a live database, and
+    recounts its projects and bumps its owners' cache versions once
+    rather than for every row.
+    """
+
+    help = "Permanently delete rows that have been in the trash too long"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TRASH_RETENTION_DAYS,
+            help="Purge rows trashed more than this many days ago "
+            f"(default: {settings.TRASH_RETENTION_DAYS})",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows to delete per transaction (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        batch_size = options["batch_size"]
+
+        # Each level takes every row the next one would delete by cascade,
+        # such as archived projects and tasks of an expired category, which
+        # were not stamped when the category was trashed
+        categories = Category.objects.filter(deleted_at__lt=cutoff, is_active=False)
+        projects = Project.objects.filter(
+            Q(deleted_at__lt=cutoff, is_active=False) | Q(category__in=categories)
+        )
+        tasks = Task.objects.filter(
+            Q(deleted_at__lt=cutoff, is_active=False) | Q(project__in=projects)
+        )
+
+        purged = self.purge(tasks, batch_size)
+        self.stdout.write(f"Tasks purged: {purged}")
+
+        purged = self.purge(projects, batch_size)
+        self.stdout.write(f"Projects purged: {purged}")
+
+        purged = self.purge(categories, batch_size)
+        self.stdout.write(f"Categories purged: {purged}")
+
+        self.stdout.write(self.style.SUCCESS("Trash purged"))
+
+    def purge(self, queryset, batch_size):
+        """Delete the rows of a queryset in batches and return how many were deleted"""
+        purged = 0
+        while True:
+            ids = list(
+                queryset.order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return purged
+            with deferred_version_bumps(), transaction.atomic(), deferred_counters():
+                queryset.model.objects.filter(pk__in=ids).delete()
+            purged += len(ids)
+            self.stdout.write(
+                f"  {queryset.model._meta.verbose_name_plural}: {purged} deleted",
+                self.style.HTTP_INFO,
+            )
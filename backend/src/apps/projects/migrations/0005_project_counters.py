@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_alter_project_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='actual_hours_total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text='Sum of actual hours of active tasks', max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='completed_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active completed tasks'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='estimated_hours_total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text='Sum of estimated hours of active tasks', max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active tasks'),
+        ),
+    ]
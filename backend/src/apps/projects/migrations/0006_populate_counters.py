@@ -0,0 +1,88 @@
+from django.db import migrations
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def batched_ids(model):
+    """Yield primary keys of all rows of a model in ordered batches"""
+    last_id = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def populate_counters(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Category = apps.get_model("categories", "Category")
+
+    active_tasks = Q(tasks__is_active=True)
+    zero_hours = Value(0, output_field=DecimalField())
+    for ids in batched_ids(Project):
+        projects = Project.objects.filter(pk__in=ids).annotate(
+            num_tasks=Count("tasks", filter=active_tasks),
+            num_completed_tasks=Count(
+                "tasks", filter=active_tasks & Q(tasks__status="completed")
+            ),
+            sum_estimated_hours=Coalesce(
+                Sum("tasks__estimated_hours", filter=active_tasks), zero_hours
+            ),
+            sum_actual_hours=Coalesce(
+                Sum("tasks__actual_hours", filter=active_tasks), zero_hours
+            ),
+        )
+        for project in projects:
+            project.task_count = project.num_tasks
+            project.completed_task_count = project.num_completed_tasks
+            project.estimated_hours_total = project.sum_estimated_hours
+            project.actual_hours_total = project.sum_actual_hours
+        Project.objects.bulk_update(
+            projects,
+            [
+                "task_count",
+                "completed_task_count",
+                "estimated_hours_total",
+                "actual_hours_total",
+            ],
+        )
+
+    active_category_tasks = Q(projects__is_active=True, projects__tasks__is_active=True)
+    for ids in batched_ids(Category):
+        categories = Category.objects.filter(pk__in=ids).annotate(
+            num_projects=Count(
+                "projects", filter=Q(projects__is_active=True), distinct=True
+            ),
+            num_tasks=Count("projects__tasks", filter=active_category_tasks),
+            num_completed_tasks=Count(
+                "projects__tasks",
+                filter=active_category_tasks & Q(projects__tasks__status="completed"),
+            ),
+        )
+        for category in categories:
+            category.project_count = category.num_projects
+            category.task_count = category.num_tasks
+            category.completed_task_count = category.num_completed_tasks
+        Category.objects.bulk_update(
+            categories, ["project_count", "task_count", "completed_task_count"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_category_counters'),
+        ('projects', '0005_project_counters'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0003_category_indexes'),
+        ('projects', '0007_project_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_owner_active_idx',
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_by', '-created_at', '-id'], name='project_owner_active_idx'),
+        ),
+    ]
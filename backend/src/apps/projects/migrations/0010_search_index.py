@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:45
+
+from django.db import migrations
+
+from base.search import create_search_index, drop_search_index
+
+
+def create_index(apps, schema_editor):
+    create_search_index(
+        schema_editor, "projects_project", ["name", "description"], "created_by_id"
+    )
+
+
+def drop_index(apps, schema_editor):
+    drop_search_index(schema_editor, "projects_project")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_soft_delete'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
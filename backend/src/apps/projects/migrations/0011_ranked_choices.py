@@ -0,0 +1,134 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:45
+
+import base.fields
+from django.db import migrations
+from django.db.models import Case, Value, When
+
+from base.search import create_search_index
+
+BATCH_SIZE = 1000
+
+PRIORITY_CHOICES = [
+    ('low', 'Low'),
+    ('medium', 'Medium'),
+    ('high', 'High'),
+    ('urgent', 'Urgent'),
+]
+STATUS_CHOICES = [
+    ('planning', 'Planning'),
+    ('in progress', 'In Progress'),
+    ('on_hold', 'On Hold'),
+    ('completed', 'Completed'),
+    ('cancelled', 'Cancelled'),
+]
+STATUS_ALIASES = {'active': 'in progress'}
+
+
+def to_ranks(field, choices, default, aliases=None):
+    ranks = {value: rank for rank, (value, label) in enumerate(choices)}
+    ranks.update({alias: ranks[value] for alias, value in (aliases or {}).items()})
+    return Case(
+        *[When(**{field: value}, then=Value(rank)) for value, rank in ranks.items()],
+        default=Value(ranks[default]),
+    )
+
+
+def to_values(field, choices):
+    return Case(
+        *[When(**{field: rank}, then=Value(value)) for rank, (value, label) in enumerate(choices)]
+    )
+
+
+def update_in_batches(model, changes):
+    last_id = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            return
+        model.objects.filter(pk__in=ids).update(**changes)
+        last_id = ids[-1]
+
+
+def encode(apps, schema_editor):
+    update_in_batches(
+        apps.get_model("projects", "Project"),
+        {
+            "priority_rank": to_ranks("priority", PRIORITY_CHOICES, "medium"),
+            "status_rank": to_ranks(
+                "status", STATUS_CHOICES, "planning", STATUS_ALIASES
+            ),
+        },
+    )
+
+
+def decode(apps, schema_editor):
+    update_in_batches(
+        apps.get_model("projects", "Project"),
+        {
+            "priority": to_values("priority_rank", PRIORITY_CHOICES),
+            "status": to_values("status_rank", STATUS_CHOICES),
+        },
+    )
+
+
+def create_index(apps, schema_editor):
+    # SQLite rebuilds the table to change its columns, either way, which
+    # drops the full-text index triggers
+    create_search_index(
+        schema_editor, "projects_project", ["name", "description"], "created_by_id"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, create_index),
+        migrations.AddField(
+            model_name='project',
+            name='priority_rank',
+            field=base.fields.RankedChoiceField(choices=PRIORITY_CHOICES, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='status_rank',
+            field=base.fields.RankedChoiceField(choices=STATUS_CHOICES, null=True, aliases=STATUS_ALIASES),
+        ),
+        migrations.RunPython(encode, decode),
+        migrations.RemoveField(
+            model_name='project',
+            name='priority',
+        ),
+        migrations.RemoveField(
+            model_name='project',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='project',
+            old_name='priority_rank',
+            new_name='priority',
+        ),
+        migrations.RenameField(
+            model_name='project',
+            old_name='status_rank',
+            new_name='status',
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='priority',
+            field=base.fields.RankedChoiceField(choices=PRIORITY_CHOICES, default='medium'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='status',
+            field=base.fields.RankedChoiceField(aliases=STATUS_ALIASES, choices=STATUS_CHOICES, default='planning'),
+        ),
+        migrations.RunPython(create_index, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,78 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinLengthValidator
-from base.models import TrackableModel
+from django.db.models.functions import Coalesce
+from base.fields import RankedChoiceField
+from base.functions import DaysBetween
+from base.models import (
+    CounterFieldsMixin,
+    FieldTrackerMixin,
+    SoftDeletableModel,
+    TrackableModel,
+)
 from categories.models import Category
 
 
-class Project(TrackableModel):
+class ProjectQuerySet(models.QuerySet):
+    """QuerySet for projects with database-computed counts and schedule fields"""
+
+    SCHEDULE_FIELDS = ("overdue", "days_left")
+
+    def with_schedule(self, today):
+        """
+        Annotate overdue and days_left in SQL.
+
+        Mirrors Project.is_overdue() and Project.days_until_due() against
+        a single "today".
+
+        Args:
+            today: The date to compute the schedule fields against
+        """
+        today = models.Value(today, output_field=models.DateField())
+        open_project = models.Q(due_date__isnull=False) & ~models.Q(
+            status__in=["completed", "cancelled"]
+        )
+        return self.annotate(
+            overdue=models.Case(
+                models.When(
+                    open_project & models.Q(due_date__lt=today),
+                    then=models.Value(True),
+                ),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+            days_left=models.Case(
+                models.When(open_project, then=DaysBetween("due_date", today)),
+                default=models.Value(None),
+                output_field=models.IntegerField(),
+            ),
+        )
+
+    def with_task_counts(self):
+        """
+        Annotate num_tasks, num_completed_tasks and the task hour sums.
+
+        Counts tasks from scratch with conditional aggregates. Used to verify
+        and repair the stored counter columns.
+        """
+        active_tasks = models.Q(tasks__is_active=True)
+        zero_hours = models.Value(0, output_field=models.DecimalField())
+        return self.annotate(
+            num_tasks=models.Count("tasks", filter=active_tasks),
+            num_completed_tasks=models.Count(
+                "tasks", filter=active_tasks & models.Q(tasks__status="completed")
+            ),
+            sum_estimated_hours=Coalesce(
+                models.Sum("tasks__estimated_hours", filter=active_tasks), zero_hours
+            ),
+            sum_actual_hours=Coalesce(
+                models.Sum("tasks__actual_hours", filter=active_tasks), zero_hours
+            ),
+        )
+
+
+class Project(
+    CounterFieldsMixin, FieldTrackerMixin, SoftDeletableModel, TrackableModel
+):
     """Project model for organizing tasks and categories"""
 
     name = models.CharField(
@@ -21,8 +89,7 @@ class Project(TrackableModel):
     )
     start_date = models.DateField(null=True, blank=True)
     due_date = models.DateField(null=True, blank=True)
-    priority = models.CharField(
-        max_length=20,
+    priority = RankedChoiceField(
         choices=[
             ("low", "Low"),
             ("medium", "Medium"),
@@ -31,8 +98,7 @@ class Project(TrackableModel):
         ],
         default="medium",
     )
-    status = models.CharField(
-        max_length=20,
+    status = RankedChoiceField(
         choices=[
             ("planning", "Planning"),
             ("in progress", "In Progress"),
@@ -41,36 +107,91 @@ class Project(TrackableModel):
             ("cancelled", "Cancelled"),
         ],
         default="planning",
+        # Older clients and data call an in-progress project "active"
+        aliases={"active": "in progress"},
     )
     is_active = models.BooleanField(default=True)
 
+    # Counters maintained by projects.counters
+    task_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of active tasks"
+    )
+    completed_task_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of active completed tasks"
+    )
+    estimated_hours_total = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text="Sum of estimated hours of active tasks",
+    )
+    actual_hours_total = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text="Sum of actual hours of active tasks",
+    )
+
+    counter_fields = (
+        "task_count",
+        "completed_task_count",
+        "estimated_hours_total",
+        "actual_hours_total",
+    )
+    tracked_fields = ("category_id", "is_active")
+
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         db_table = "projects_project"
         ordering = ["-created_at"]
         unique_together = ["name", "created_by"]
         verbose_name = "Project"
         verbose_name_plural = "Projects"
+        indexes = [
+            # Project list: created_by + is_active, newest first
+            models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="project_owner_active_idx",
+            ),
+            # Trashed projects, for the purge
+            models.Index(
+                fields=["deleted_at"],
+                condition=models.Q(deleted_at__isnull=False),
+                name="project_trash_idx",
+            ),
+        ]
 
     def __str__(self):
         """String representation of the project"""
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Save the project and its category counters in one transaction"""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def get_task_count(self):
         """Get the total number of tasks in this project"""
-        return self.tasks.filter(is_active=True).count()
+        return self.task_count
 
     def get_completed_task_count(self):
         """Get the number of completed tasks in this project"""
-        return self.tasks.filter(status="completed", is_active=True).count()
+        return self.completed_task_count
 
     def get_progress_percentage(self):
         """Calculate project progress based on completed tasks"""
-        total_tasks = self.get_task_count()
-        if total_tasks == 0:
-            return 0
+        return self.calculate_progress(self.completed_task_count, self.task_count)
 
-        completed_tasks = self.get_completed_task_count()
-        return int((completed_tasks / total_tasks) * 100)
+    @staticmethod
+    def calculate_progress(completed_tasks, total_tasks):
+        """Calculate a progress percentage from completed and total task counts"""
+        if not total_tasks:
+            return 0
+        return completed_tasks * 100 // total_tasks
 
     def is_overdue(self):
         """Check if project is overdue"""
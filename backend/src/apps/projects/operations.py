@@ -0,0 +1,162 @@
+"""
+Set-based operations on all tasks of a project.
+
+Each operation changes the tasks with a single UPDATE instead of saving them
+one at a time, applies the Task.save status/progress rule in SQL, and keeps
+the project and category counters and the owner's cache version in step.
+"""
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from base.cache import bump_user_version
+from base.functions import AddDays
+from tasks.models import Task
+from .counters import add_to_project, recount_for_projects
+from .models import Project
+
+
+def complete_tasks(project, user):
+    """
+    Mark every open active task of a project completed.
+
+    Args:
+        project: Project whose tasks to complete
+        user: User making the change
+
+    Returns:
+        int: Number of tasks completed
+    """
+    with transaction.atomic():
+        updated = (
+            Task.objects.filter(project=project, is_active=True)
+            .exclude(status__in=["completed", "cancelled"])
+            .update(
+                status="completed",
+                progress=100,
+                updated_by=user,
+                updated_at=timezone.now(),
+            )
+        )
+        add_to_project(project.pk, {"completed_task_count": updated})
+    bump_user_version(project.created_by_id)
+    return updated
+
+
+def shift_dates(project, days, user):
+    """
+    Move the start and due dates of a project and all its tasks.
+
+    Args:
+        project: Project to reschedule
+        days: Number of days to move the dates by, negative to move them back
+        user: User making the change
+
+    Returns:
+        int: Number of tasks rescheduled
+    """
+    now = timezone.now()
+    dates = {
+        "start_date": AddDays("start_date", days),
+        "due_date": AddDays("due_date", days),
+    }
+    with transaction.atomic():
+        Project.objects.filter(pk=project.pk).update(
+            **dates, updated_by=user, updated_at=now
+        )
+        # Inactive tasks move too: they stay in the project, and restoring
+        # them should put them back in step with its new schedule
+        updated = Task.objects.filter(project=project).update(
+            **dates, updated_by=user, updated_at=now
+        )
+    bump_user_version(project.created_by_id)
+    return updated
+
+
+def find_move_clashes(project, target):
+    """
+    Find task names that would break uniqueness if the tasks moved projects.
+
+    Only active tasks move, but they may clash with any task of the target.
+
+    Args:
+        project: Project the tasks would leave
+        target: Project the tasks would join
+
+    Returns:
+        list: Names of the target's tasks that a moved task would duplicate
+    """
+    same_task = Task.objects.filter(
+        project=project,
+        is_active=True,
+        name=OuterRef("name"),
+        created_by=OuterRef("created_by"),
+    )
+    return list(
+        Task.objects.filter(Exists(same_task), project=target).values_list(
+            "name", flat=True
+        )
+    )
+
+
+def move_tasks(project, target, user):
+    """
+    Move the active tasks of a project to another project of the same owner.
+
+    Archived and trashed tasks stay behind, so restoring the project brings
+    them back to it.
+
+    Args:
+        project: Project the tasks leave
+        target: Project the tasks join
+        user: User making the change
+
+    Returns:
+        int: Number of tasks moved
+    """
+    with transaction.atomic():
+        moved = Task.objects.filter(project=project, is_active=True).update(
+            project=target,
+            owner_id=target.created_by_id,
+            updated_by=user,
+            updated_at=timezone.now(),
+        )
+        recount_for_projects([project.pk, target.pk])
+    bump_user_version(project.created_by_id)
+    return moved
+
+
+def archive_project(project, user, deleted_at=None):
+    """
+    Deactivate a project together with its active tasks.
+
+    The project is saved first, so its category gives up the project and
+    its task counters as they were; the tasks are then deactivated in one
+    UPDATE and the project's own counters emptied.
+
+    Args:
+        project: Project to archive
+        user: User making the change
+        deleted_at: Trash time to stamp on the project and tasks, None to
+            archive without trashing
+
+    Returns:
+        int: Number of tasks archived
+    """
+    with transaction.atomic():
+        project.is_active = False
+        project.deleted_at = deleted_at
+        project.updated_by = user
+        project.save()
+        archived = Task.objects.filter(project=project, is_active=True).update(
+            is_active=False,
+            deleted_at=deleted_at,
+            updated_by=user,
+            updated_at=timezone.now(),
+        )
+        Project.objects.filter(pk=project.pk).update(
+            **{field: 0 for field in Project.counter_fields}
+        )
+    bump_user_version(project.created_by_id)
+    return archived
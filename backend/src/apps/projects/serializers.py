@@ -1,12 +1,23 @@
 from rest_framework import serializers
-from .models import Project
+from base.serializers import FragmentCacheListSerializer, FragmentCacheMixin
+from .models import Project, ProjectQuerySet
 from categories.models import Category
 from categories.serializers import CategorySerializer
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(FragmentCacheMixin, serializers.ModelSerializer):
     """Serializer for Project model with computed fields"""
 
+    # Counters are updated without touching updated_at, and the schedule
+    # fields depend on today's date
+    fragment_key_fields = (
+        "task_count",
+        "completed_task_count",
+        "estimated_hours_total",
+        "actual_hours_total",
+    )
+    fragment_daily = True
+
     # Write-only field for category ID during creation/update
     category = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.none(),  # Will be set dynamically in views
@@ -18,8 +29,6 @@ class ProjectSerializer(serializers.ModelSerializer):
     category_details = CategorySerializer(source="category", read_only=True)
 
     # Computed fields
-    task_count = serializers.SerializerMethodField()
-    completed_task_count = serializers.SerializerMethodField()
     progress_percentage = serializers.SerializerMethodField()
     is_overdue = serializers.SerializerMethodField()
     days_until_due = serializers.SerializerMethodField()
@@ -29,6 +38,7 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
+        list_serializer_class = FragmentCacheListSerializer
         fields = [
             "id",
             "name",
@@ -43,6 +53,8 @@ class ProjectSerializer(serializers.ModelSerializer):
             "task_count",
             "completed_task_count",
             "progress_percentage",
+            "estimated_hours_total",
+            "actual_hours_total",
             "is_overdue",
             "days_until_due",
             "created_at",
@@ -69,22 +81,25 @@ class ProjectSerializer(serializers.ModelSerializer):
 
         return data
 
-    def get_task_count(self, obj):
-        """Get total task count"""
-        return obj.get_task_count()
-
-    def get_completed_task_count(self, obj):
-        """Get completed task count"""
-        return obj.get_completed_task_count()
+    def update(self, instance, validated_data):
+        """Update the instance and drop schedule annotations that are now stale"""
+        instance = super().update(instance, validated_data)
+        for field in ProjectQuerySet.SCHEDULE_FIELDS:
+            instance.__dict__.pop(field, None)
+        return instance
 
     def get_progress_percentage(self, obj):
         """Get progress percentage"""
         return obj.get_progress_percentage()
 
     def get_is_overdue(self, obj):
-        """Get overdue status"""
+        """Get overdue status, preferring the SQL annotation"""
+        if hasattr(obj, "overdue"):
+            return obj.overdue
         return obj.is_overdue()
 
     def get_days_until_due(self, obj):
-        """Get days until due"""
+        """Get days until due, preferring the SQL annotation"""
+        if hasattr(obj, "days_left"):
+            return obj.days_left
         return obj.days_until_due()
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from base.cache import bump_user_version
+from .counters import apply_project_change, recount_categories
+from .models import Project
+
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_owner_cache(sender, instance, **kwargs):
+    """Invalidate the owner's cached data when one of their projects changes"""
+    bump_user_version(instance.created_by_id)
+
+
+@receiver(post_save, sender=Project)
+def update_counters_on_save(sender, instance, created, raw, **kwargs):
+    """Move the project's contribution between category counters"""
+    if raw:
+        return
+    old_values = None if created else instance.get_saved_values()
+    if old_values is None and not created:
+        # Previous state unknown: recount the category from scratch
+        recount_categories([instance.category_id])
+    else:
+        apply_project_change(instance.pk, old_values, instance.get_current_values())
+    instance.remember_saved_values()
+
+
+@receiver(post_delete, sender=Project)
+def update_counters_on_delete(sender, instance, **kwargs):
+    """Remove the project's contribution from its category counters"""
+    old_values = instance.get_saved_values() or instance.get_current_values()
+    apply_project_change(instance.pk, old_values, None)
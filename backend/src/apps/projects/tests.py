@@ -1,11 +1,22 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from base import cache as two_level
+from base.throttling import clear_throttles
 from categories.models import Category
+from tasks.models import Task
+from . import typeahead
 from .models import Project
 
 User = get_user_model()
@@ -45,6 +56,13 @@ class ProjectModelTest(TestCase):
         self.assertEqual(self.project.status, "active")
         self.assertTrue(self.project.is_active)
 
+    def test_legacy_active_status(self):
+        """Test that the legacy "active" status is read back as in progress"""
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, "in progress")
+        self.assertEqual(Project.objects.filter(status="active").count(), 1)
+        self.assertEqual(Project.objects.filter(status="in progress").count(), 1)
+
     def test_project_str(self):
         """Test string representation"""
         self.assertEqual(str(self.project), "Test Project")
@@ -121,6 +139,35 @@ class ProjectModelTest(TestCase):
         self.assertIsNone(no_due_date_project.days_until_due())
 
 
+class ProjectScheduleAnnotationTest(TestCase):
+    """Test that SQL schedule annotations match the Project model methods"""
+
+    def test_annotations_match_model_methods(self):
+        """Test overdue and days_left against the model methods"""
+        user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        cases = [
+            (None, "planning"),
+            (date.today() - timedelta(days=2), "active"),
+            (date.today() - timedelta(days=2), "completed"),
+            (date.today() - timedelta(days=2), "cancelled"),
+            (date.today(), "on_hold"),
+            (date.today() + timedelta(days=9), "planning"),
+        ]
+        for index, (due_date, project_status) in enumerate(cases):
+            Project.objects.create(
+                name=f"Project {index}",
+                due_date=due_date,
+                status=project_status,
+                created_by=user,
+            )
+
+        for project in Project.objects.with_schedule(date.today()):
+            self.assertEqual(project.overdue, project.is_overdue())
+            self.assertEqual(project.days_left, project.days_until_due())
+
+
 class ProjectViewSetTest(APITestCase):
     """Test Project ViewSet API endpoints"""
 
@@ -214,15 +261,31 @@ class ProjectViewSetTest(APITestCase):
         self.assertEqual(response.data["name"], "Updated Project")
         self.assertEqual(response.data["priority"], "urgent")
 
+    def test_update_project_schedule(self):
+        """Test that an update returns schedule fields of the new dates"""
+        url = reverse("projects:project-detail", args=[self.project.id])
+        past = date.today() - timedelta(days=2)
+        data = {"start_date": past - timedelta(days=1), "due_date": past}
+
+        response = self.client.patch(url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_overdue"])
+        self.assertEqual(response.data["days_until_due"], -2)
+
     def test_delete_project(self):
-        """Test deleting a project"""
+        """Test deleting a project moves it to the trash"""
         url = reverse("projects:project-detail", args=[self.project.id])
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
-        # Project should be completely deleted
-        self.assertLess(Project.objects.filter(created_by=self.user).count(), 1)
+        # Project should be inactive and trashed, not deleted
+        self.project.refresh_from_db()
+        self.assertFalse(self.project.is_active)
+        self.assertIsNotNone(self.project.deleted_at)
+        response = self.client.get(reverse("projects:project-list"))
+        self.assertEqual(response.data["count"], 0)
 
     def test_create_project_validation(self):
         """Test project creation validation"""
@@ -245,6 +308,641 @@ class ProjectViewSetTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+class ProjectCountsTest(APITestCase):
+    """Test that project counts are read from the counter columns"""
+
+    def setUp(self):
+        """Create test user and authenticate"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_project(self, index, tasks=4):
+        """Create a project in its own category with some completed tasks"""
+        category = Category.objects.create(
+            name=f"Category {index}", created_by=self.user
+        )
+        project = Project.objects.create(
+            name=f"Project {index}", category=category, created_by=self.user
+        )
+        for task_index in range(tasks):
+            Task.objects.create(
+                name=f"Task {task_index}",
+                project=project,
+                status="completed" if task_index % 2 else "todo",
+                created_by=self.user,
+            )
+        return project
+
+    def test_list_counts_match_recount(self):
+        """Test that stored counts match a count from scratch"""
+        project = self.create_project(0, tasks=3)
+        url = reverse("projects:project-list")
+        response = self.client.get(url)
+
+        expected = Project.objects.with_task_counts().get(pk=project.pk)
+        data = response.data["results"][0]
+        self.assertEqual(data["task_count"], expected.num_tasks)
+        self.assertEqual(data["completed_task_count"], expected.num_completed_tasks)
+        self.assertEqual(data["progress_percentage"], 33)
+
+    def test_query_count_does_not_grow_with_projects(self):
+        """Test that listing projects runs a fixed number of queries"""
+        url = reverse("projects:project-list")
+        self.create_project(0)
+        # count, page
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        for index in range(1, 6):
+            self.create_project(index)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 6)
+
+
+class ProjectCounterTest(TestCase):
+    """Test that project and category counters follow task and project writes"""
+
+    def setUp(self):
+        """Create test user with two categories and two projects"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.work = Category.objects.create(name="Work", created_by=self.user)
+        self.home = Category.objects.create(name="Home", created_by=self.user)
+        self.project = Project.objects.create(
+            name="Project", category=self.work, created_by=self.user
+        )
+        self.other_project = Project.objects.create(
+            name="Other Project", category=self.home, created_by=self.user
+        )
+
+    def assertCountersCorrect(self):
+        """Assert every stored counter equals a count from scratch"""
+        for project in Project.objects.with_task_counts():
+            self.assertEqual(project.task_count, project.num_tasks)
+            self.assertEqual(project.completed_task_count, project.num_completed_tasks)
+            self.assertEqual(project.estimated_hours_total, project.sum_estimated_hours)
+            self.assertEqual(project.actual_hours_total, project.sum_actual_hours)
+        for category in Category.objects.with_counts():
+            self.assertEqual(category.project_count, category.num_projects)
+            self.assertEqual(category.task_count, category.num_tasks)
+            self.assertEqual(
+                category.completed_task_count, category.num_completed_tasks
+            )
+
+    def test_task_lifecycle_updates_counters(self):
+        """Test create, status change, move, soft delete and delete of a task"""
+        task = Task.objects.create(
+            name="Task",
+            project=self.project,
+            estimated_hours=Decimal("3.50"),
+            actual_hours=Decimal("1.25"),
+            created_by=self.user,
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.task_count, 1)
+        self.assertEqual(self.project.estimated_hours_total, Decimal("3.50"))
+        self.assertCountersCorrect()
+
+        task.status = "completed"
+        task.save()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.completed_task_count, 1)
+        self.assertCountersCorrect()
+
+        task = Task.objects.get(pk=task.pk)
+        task.project = self.other_project
+        task.save()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.task_count, 0)
+        self.assertCountersCorrect()
+
+        task.is_active = False
+        task.save()
+        self.other_project.refresh_from_db()
+        self.assertEqual(self.other_project.task_count, 0)
+        self.assertCountersCorrect()
+
+        task.is_active = True
+        task.save()
+        task.delete()
+        self.assertCountersCorrect()
+
+    def test_project_changes_update_category_counters(self):
+        """Test moving, deactivating and deleting a project with tasks"""
+        for index in range(3):
+            Task.objects.create(
+                name=f"Task {index}",
+                project=self.project,
+                status="completed" if index == 0 else "todo",
+                created_by=self.user,
+            )
+        self.work.refresh_from_db()
+        self.assertEqual(self.work.task_count, 3)
+        self.assertEqual(self.work.completed_task_count, 1)
+
+        project = Project.objects.get(pk=self.project.pk)
+        project.category = self.home
+        project.save()
+        self.work.refresh_from_db()
+        self.home.refresh_from_db()
+        self.assertEqual(self.work.project_count, 0)
+        self.assertEqual(self.home.project_count, 2)
+        self.assertEqual(self.home.task_count, 3)
+        self.assertCountersCorrect()
+
+        project.is_active = False
+        project.save()
+        self.assertCountersCorrect()
+
+        project.is_active = True
+        project.save()
+        project.delete()
+        self.assertCountersCorrect()
+
+    def test_save_does_not_overwrite_counters(self):
+        """Test that saving a stale project instance keeps its counters"""
+        stale = Project.objects.get(pk=self.project.pk)
+        Task.objects.create(name="Task", project=self.project, created_by=self.user)
+
+        stale.name = "Renamed"
+        stale.save()
+        stale.refresh_from_db()
+        self.assertEqual(stale.task_count, 1)
+
+    def test_rebuild_counters_repairs_drift(self):
+        """Test that the management command repairs drifted counters"""
+        Task.objects.create(name="Task", project=self.project, created_by=self.user)
+        Project.objects.update(task_count=42)
+        Category.objects.update(project_count=7)
+
+        out = StringIO()
+        call_command("rebuild_counters", batch_size=1, stdout=out)
+
+        self.assertIn("Projects repaired: 2", out.getvalue())
+        self.assertIn("Categories repaired: 2", out.getvalue())
+        self.assertCountersCorrect()
+
+
+class ProjectDashboardTest(APITestCase):
+    """Test the cached project dashboard"""
+
+    def setUp(self):
+        """Create test user with a project and tasks, and authenticate"""
+        cache.clear()
+        clear_throttles()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name="Work", created_by=self.user)
+        self.project = Project.objects.create(
+            name="Test Project",
+            category=self.category,
+            status="active",
+            created_by=self.user,
+        )
+        for index, task_status in enumerate(["todo", "in_progress", "completed"]):
+            Task.objects.create(
+                name=f"Task {index}",
+                project=self.project,
+                status=task_status,
+                created_by=self.user,
+            )
+        self.url = reverse("projects:project-dashboard")
+
+    def test_dashboard_counts(self):
+        """Test dashboard counts with one aggregate query per model"""
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "projects": {"total": 1, "active": 1, "completed": 0},
+                "tasks": {"total": 3, "completed": 1, "todo": 1, "in_progress": 1},
+                "categories": {"total": 1},
+            },
+        )
+
+    def test_dashboard_is_cached_until_a_write(self):
+        """Test that repeated loads skip the database until data changes"""
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        Task.objects.create(name="New Task", project=self.project, created_by=self.user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["tasks"]["total"], 4)
+
+    def test_dashboard_fresh_bypasses_cache(self):
+        """Test that ?fresh=1 recomputes the dashboard"""
+        self.client.get(self.url)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"fresh": "1"})
+        self.assertEqual(response["X-Cache"], "BYPASS")
+
+    def test_dashboard_cache_is_per_user(self):
+        """Test that one user's writes do not invalidate another's dashboard"""
+        self.client.get(self.url)
+        other_user = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        Category.objects.create(name="Other", created_by=other_user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+
+class ProjectKeysetPaginationTest(APITestCase):
+    """Test the opt-in cursor pagination of the project list"""
+
+    def setUp(self):
+        """Create test user with 25 projects"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        for index in range(25):
+            Project.objects.create(name=f"Project {index}", created_by=self.user)
+
+    def test_walks_every_project_once(self):
+        """Test that the cursor pages cover each project once, newest first"""
+        url = reverse("projects:project-list") + "?pagination=cursor"
+        first = self.client.get(url)
+        second = self.client.get(first.data["next"])
+
+        ids = [project["id"] for project in first.data["results"]]
+        ids += [project["id"] for project in second.data["results"]]
+        expected = Project.objects.order_by("-created_at", "-id").values_list(
+            "pk", flat=True
+        )
+        self.assertEqual(ids, list(expected))
+        self.assertIsNone(second.data["next"])
+
+    def test_default_pagination_unchanged(self):
+        """Test that the page number pagination stays the default"""
+        response = self.client.get(reverse("projects:project-list"))
+        self.assertEqual(response.data["count"], 25)
+
+
+class ProjectTaskOperationsTest(APITestCase):
+    """Test the set-based project actions"""
+
+    def setUp(self):
+        """Create test user with a category, two projects and some tasks"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name="Work", created_by=self.user)
+        self.project = Project.objects.create(
+            name="Project",
+            category=self.category,
+            start_date=date(2024, 1, 1),
+            due_date=date(2024, 1, 31),
+            created_by=self.user,
+        )
+        self.target = Project.objects.create(
+            name="Target", category=self.category, created_by=self.user
+        )
+        statuses = ["todo", "in_progress", "completed", "cancelled"]
+        for index, task_status in enumerate(statuses):
+            Task.objects.create(
+                name=f"Task {index}",
+                project=self.project,
+                status=task_status,
+                due_date=date(2024, 1, 10 + index),
+                estimated_hours=Decimal("1.50"),
+                created_by=self.user,
+            )
+
+    def url(self, name, project=None):
+        """URL of a project action"""
+        project = project or self.project
+        return reverse(f"projects:project-{name}", args=[project.id])
+
+    def assertCountersMatchRecount(self):
+        """Assert that the stored counters equal a recount"""
+        for project in Project.objects.with_task_counts():
+            self.assertEqual(project.task_count, project.num_tasks)
+            self.assertEqual(project.completed_task_count, project.num_completed_tasks)
+            self.assertEqual(project.estimated_hours_total, project.sum_estimated_hours)
+        category = Category.objects.with_counts().get(pk=self.category.pk)
+        self.assertEqual(category.project_count, category.num_projects)
+        self.assertEqual(category.task_count, category.num_tasks)
+        self.assertEqual(category.completed_task_count, category.num_completed_tasks)
+
+    def test_complete_all(self):
+        """Test that open tasks are completed with full progress"""
+        response = self.client.post(self.url("complete-all"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tasks_updated"], 2)
+        statuses = Task.objects.values_list("status", "progress")
+        self.assertEqual(
+            sorted(statuses),
+            [
+                ("cancelled", 0),
+                ("completed", 100),
+                ("completed", 100),
+                ("completed", 100),
+            ],
+        )
+        self.assertCountersMatchRecount()
+
+    def test_shift_dates(self):
+        """Test that project and task dates move by the given days"""
+        response = self.client.post(self.url("shift-dates") + "?days=-5")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tasks_updated"], 4)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.start_date, date(2023, 12, 27))
+        self.assertEqual(self.project.due_date, date(2024, 1, 26))
+        self.assertEqual(
+            sorted(Task.objects.values_list("due_date", flat=True)),
+            [date(2024, 1, 5), date(2024, 1, 6), date(2024, 1, 7), date(2024, 1, 8)],
+        )
+        self.target.refresh_from_db()
+        self.assertIsNone(self.target.start_date)
+
+    def test_shift_dates_requires_days(self):
+        """Test that a missing or invalid day count is rejected"""
+        for query in ("", "?days=soon", "?days=100000"):
+            response = self.client.post(self.url("shift-dates") + query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_move_tasks_to(self):
+        """Test that all tasks move to the target project"""
+        response = self.client.post(
+            self.url("move-tasks-to"), {"project": self.target.id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tasks_updated"], 4)
+        self.assertEqual(self.target.tasks.count(), 4)
+        self.assertCountersMatchRecount()
+
+    def test_move_tasks_to_leaves_trashed_tasks(self):
+        """Test that trashed tasks stay with the project they were trashed from"""
+        trashed = Task.objects.create(
+            name="Trashed",
+            project=self.project,
+            created_by=self.user,
+            is_active=False,
+            deleted_at=timezone.now(),
+        )
+        response = self.client.post(
+            self.url("move-tasks-to"), {"project": self.target.id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tasks_updated"], 4)
+        trashed.refresh_from_db()
+        self.assertEqual(trashed.project, self.project)
+        self.assertEqual(self.target.tasks.filter(is_active=False).count(), 0)
+        self.assertCountersMatchRecount()
+
+    def test_move_tasks_to_rejects_clashes(self):
+        """Test that moving is refused when names would clash"""
+        Task.objects.create(name="Task 1", project=self.target, created_by=self.user)
+        response = self.client.post(
+            self.url("move-tasks-to"), {"project": self.target.id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["names"], ["Task 1"])
+        self.assertEqual(self.project.tasks.count(), 4)
+
+    def test_move_tasks_to_other_users_project(self):
+        """Test that tasks cannot move to another user's project"""
+        other_user = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        other_project = Project.objects.create(name="Theirs", created_by=other_user)
+        response = self.client.post(
+            self.url("move-tasks-to"), {"project": other_project.id}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_archive(self):
+        """Test that the project and its tasks are deactivated"""
+        response = self.client.post(self.url("archive"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tasks_updated"], 4)
+        self.project.refresh_from_db()
+        self.assertFalse(self.project.is_active)
+        self.assertFalse(self.project.tasks.filter(is_active=True).exists())
+        self.assertCountersMatchRecount()
+
+
+class TrashTest(APITestCase):
+    """Test soft deletion, restore and purge of categories, projects and tasks"""
+
+    def setUp(self):
+        """Create test user with a category holding two projects with tasks"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name="Work", created_by=self.user)
+        self.projects = [
+            Project.objects.create(
+                name=f"Project {index}", category=self.category, created_by=self.user
+            )
+            for index in range(2)
+        ]
+        for project in self.projects:
+            for index in range(3):
+                Task.objects.create(
+                    name=f"Task {index}",
+                    project=project,
+                    status="completed" if index == 0 else "todo",
+                    created_by=self.user,
+                )
+        # Archived before the category is trashed, so not restored with it
+        self.archived_task = Task.objects.create(
+            name="Archived", project=self.projects[0], created_by=self.user
+        )
+        self.archived_task.is_active = False
+        self.archived_task.save()
+
+    def assertCountersMatchRecount(self):
+        """Assert that the stored counters equal a recount"""
+        for project in Project.objects.with_task_counts():
+            self.assertEqual(project.task_count, project.num_tasks)
+            self.assertEqual(project.completed_task_count, project.num_completed_tasks)
+        for category in Category.objects.with_counts():
+            self.assertEqual(category.project_count, category.num_projects)
+            self.assertEqual(category.task_count, category.num_tasks)
+
+    def test_trash_category_cascades(self):
+        """Test that trashing a category trashes its projects and tasks"""
+        url = reverse("categories:category-detail", args=[self.category.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertLess(len(queries), 15)
+        self.assertFalse(Project.objects.filter(is_active=True).exists())
+        self.assertFalse(Task.objects.filter(is_active=True).exists())
+        self.category.refresh_from_db()
+        self.assertEqual(
+            set(
+                Task.objects.exclude(pk=self.archived_task.pk).values_list(
+                    "deleted_at", flat=True
+                )
+            ),
+            {self.category.deleted_at},
+        )
+        self.assertCountersMatchRecount()
+
+        response = self.client.get(reverse("categories:category-inactive"))
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], [self.category.id]
+        )
+
+    def test_restore_category(self):
+        """Test that restoring a category brings back what was trashed with it"""
+        self.client.delete(
+            reverse("categories:category-detail", args=[self.category.id])
+        )
+        url = reverse("categories:category-restore", args=[self.category.id])
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["project_count"], 2)
+        self.assertEqual(response.data["task_count"], 6)
+        self.assertEqual(Task.objects.filter(is_active=True).count(), 6)
+        self.archived_task.refresh_from_db()
+        self.assertFalse(self.archived_task.is_active)
+        self.assertCountersMatchRecount()
+
+    def test_restore_project_needs_active_category(self):
+        """Test that a project of a trashed category cannot be restored alone"""
+        self.client.delete(
+            reverse("categories:category-detail", args=[self.category.id])
+        )
+        url = reverse("projects:project-restore", args=[self.projects[0].id])
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Project.objects.filter(is_active=True).exists())
+
+    def test_trash_and_restore_project(self):
+        """Test that a project comes back with its tasks and counters"""
+        project = self.projects[0]
+        self.client.delete(reverse("projects:project-detail", args=[project.id]))
+        self.assertCountersMatchRecount()
+
+        response = self.client.post(
+            reverse("projects:project-restore", args=[project.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["task_count"], 3)
+        self.assertEqual(response.data["completed_task_count"], 1)
+        self.assertCountersMatchRecount()
+
+    def test_trash_and_restore_task(self):
+        """Test that a task comes back from the trash"""
+        task = Task.objects.get(project=self.projects[1], name="Task 0")
+        self.client.delete(reverse("tasks:task-detail", args=[task.id]))
+        response = self.client.get(reverse("tasks:task-inactive"))
+        self.assertIn(task.id, [item["id"] for item in response.data["results"]])
+
+        response = self.client.post(reverse("tasks:task-restore", args=[task.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_active"])
+        self.assertCountersMatchRecount()
+
+    def test_restore_active_object_not_found(self):
+        """Test that only inactive objects can be restored"""
+        url = reverse("projects:project-restore", args=[self.projects[0].id])
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purge_trash(self):
+        """Test that only rows trashed before the retention window are purged"""
+        self.client.delete(
+            reverse("projects:project-detail", args=[self.projects[1].id])
+        )
+        self.client.delete(
+            reverse("categories:category-detail", args=[self.category.id])
+        )
+        Project.objects.filter(pk=self.projects[1].pk).update(
+            deleted_at=timezone.now() - timedelta(days=40)
+        )
+        Task.objects.filter(project=self.projects[1]).update(
+            deleted_at=timezone.now() - timedelta(days=40)
+        )
+
+        out = StringIO()
+        call_command("purge_trash", days=30, batch_size=2, stdout=out)
+
+        self.assertIn("Tasks purged: 3", out.getvalue())
+        self.assertIn("Projects purged: 1", out.getvalue())
+        self.assertIn("Categories purged: 0", out.getvalue())
+        self.assertFalse(Project.objects.filter(pk=self.projects[1].pk).exists())
+        self.assertEqual(Task.objects.count(), 4)
+
+        call_command("purge_trash", days=0, stdout=out)
+        self.assertFalse(Category.objects.exists())
+        self.assertFalse(Task.objects.exists())
+
+    def test_purge_trash_without_cascades(self):
+        """Test that archived rows of an expired category are purged in batches"""
+        self.client.post(
+            reverse("projects:project-archive", args=[self.projects[0].id])
+        )
+        self.client.delete(
+            reverse("categories:category-detail", args=[self.category.id])
+        )
+        old = timezone.now() - timedelta(days=40)
+        for model in (Category, Project, Task):
+            model.objects.filter(deleted_at__isnull=False).update(deleted_at=old)
+
+        out = StringIO()
+        call_command("purge_trash", days=30, batch_size=2, stdout=out)
+
+        # Every task went in the task batches, so no project delete cascaded;
+        # the archived project's 4 tasks carry no trash stamp of their own
+        self.assertIn("Tasks purged: 7", out.getvalue())
+        self.assertIn("Projects purged: 2", out.getvalue())
+        self.assertIn("Categories purged: 1", out.getvalue())
+        self.assertFalse(Task.objects.exists())
+
+    def test_purge_trash_bumps_versions_per_batch(self):
+        """Test that each batch bumps its owner's cache version once"""
+        self.client.delete(
+            reverse("categories:category-detail", args=[self.category.id])
+        )
+        with mock.patch("base.cache.cache", wraps=cache) as shared:
+            call_command("purge_trash", days=0, stdout=StringIO())
+        bumps = [
+            call.args[0]
+            for call in shared.set.call_args_list
+            if call.args[0].endswith(":version")
+        ]
+        # One batch of tasks, one of projects and one of categories
+        self.assertEqual(bumps, [f"user:{self.user.pk}:version"] * 3)
+        self.assertFalse(Task.objects.exists())
+
+
 class ProjectUniqueConstraintTest(TestCase):
     """Separate test class for unique constraint to avoid transaction issues"""
 
@@ -277,3 +975,163 @@ class ProjectUniqueConstraintTest(TestCase):
         # Verify the constraint works
         self.assertEqual(Project.objects.filter(created_by=user1).count(), 1)
         self.assertEqual(Project.objects.filter(created_by=user2).count(), 1)
+
+
+class ProjectSearchTest(APITestCase):
+    """Test the full-text project search"""
+
+    def setUp(self):
+        """Create projects for two users"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        other_user = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        Project.objects.create(
+            name="Website relaunch",
+            description="New design and hosting",
+            created_by=self.user,
+        )
+        Project.objects.create(name="Garden", created_by=self.user)
+        Project.objects.create(name="Website", created_by=other_user)
+        self.client.force_authenticate(user=self.user)
+
+    def test_search_finds_users_projects(self):
+        """Test that projects are matched on name and description"""
+        url = reverse("projects:project-search")
+        for query in ("website", "hosting designs"):
+            response = self.client.get(url, {"q": query})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [project["name"] for project in response.data["results"]],
+                ["Website relaunch"],
+            )
+
+
+class TypeaheadTest(APITestCase):
+    """Test the typeahead endpoint"""
+
+    def setUp(self):
+        """Create a user with a category, project and tasks, and another user"""
+        cache.clear()
+        typeahead.clear_indexes()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        other_user = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        self.category = Category.objects.create(
+            name="Work", color="#FF0000", created_by=self.user
+        )
+        self.project = Project.objects.create(
+            name="Website relaunch", category=self.category, created_by=self.user
+        )
+        Task.objects.create(
+            name="Write launch post", project=self.project, created_by=self.user
+        )
+        Task.objects.create(
+            name="Wireframes", project=self.project, created_by=self.user
+        )
+        Project.objects.create(name="Website", created_by=other_user)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("typeahead")
+
+    def lookup(self, query, **params):
+        """Return the (type, name) pairs found for a query"""
+        response = self.client.get(self.url, {"q": query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item["type"], item["name"]) for item in response.data["results"]]
+
+    def test_prefix_lookup(self):
+        """Test that names are matched by any word prefix, name starts first"""
+        self.assertEqual(
+            self.lookup("W"),
+            [
+                ("project", "Website relaunch"),
+                ("task", "Wireframes"),
+                ("category", "Work"),
+                ("task", "Write launch post"),
+            ],
+        )
+        self.assertEqual(self.lookup("  LAUNCH"), [("task", "Write launch post")])
+        self.assertEqual(self.lookup("wi", limit=1), [("task", "Wireframes")])
+        self.assertEqual(self.lookup(""), [])
+
+    def test_result_fields(self):
+        """Test that results carry only type, id, name and the category color"""
+        response = self.client.get(self.url, {"q": "website"})
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "type": "project",
+                    "id": self.project.pk,
+                    "name": "Website relaunch",
+                    "color": "#FF0000",
+                }
+            ],
+        )
+
+    def test_lookups_reuse_index_until_write(self):
+        """Test that lookups run no queries until the user writes"""
+        self.lookup("w")
+        with CaptureQueriesContext(connection) as queries:
+            self.lookup("wr")
+        self.assertEqual(len(queries), 0)
+
+        self.client.patch(
+            reverse("projects:project-detail", args=[self.project.pk]),
+            {"name": "Webshop"},
+        )
+        self.assertIn(("project", "Webshop"), self.lookup("web"))
+        self.assertNotIn(("project", "Website relaunch"), self.lookup("web"))
+
+    def test_index_reused(self):
+        """Test that repeated lookups reuse one index and run no queries"""
+        Task.objects.bulk_create(
+            Task(
+                name=f"Task {index} step {index % 7}",
+                project=self.project,
+                created_by=self.user,
+                owner=self.user,
+            )
+            for index in range(100)
+        )
+        self.lookup("task 1")
+        index = typeahead.get_index(self.user.pk)
+        with self.assertNumQueries(0):
+            for query in ("t", "task 1", "step 4", "wri"):
+                self.lookup(query)
+        self.assertIs(typeahead.get_index(self.user.pk), index)
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=86400)
+class ProjectFragmentCacheTest(APITestCase):
+    """Test the cached representations of listed projects"""
+
+    def setUp(self):
+        """Create a user with a project and authenticate"""
+        cache.clear()
+        two_level.clear_local()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        Project.objects.create(name="Project", created_by=self.user)
+        self.url = reverse("projects:project-list")
+
+    def test_renamed_user_refreshed(self):
+        """Test that a user's new name reaches their cached projects"""
+        response = self.client.get(self.url)
+        self.assertTrue(
+            response.data["results"][0]["created_by"].startswith("testuser")
+        )
+
+        response = self.client.patch(reverse("user-info"), {"username": "renamed"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.url)
+        self.assertTrue(response.data["results"][0]["created_by"].startswith("renamed"))
@@ -0,0 +1,136 @@
+"""
+Moving categories, projects and tasks to the trash and back.
+
+Trashing deactivates a row and stamps deleted_at; the active rows below it
+are deactivated with the same stamp in set-based UPDATEs, so even a large
+category is trashed in a few statements. Restoring reactivates the rows
+that carry the parent's stamp. Trashed rows are hard-deleted later by the
+purge_trash command.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from base.cache import bump_user_version
+from categories.models import Category
+from tasks.models import Task
+from .counters import recount_categories, recount_for_projects
+from .models import Project
+from .operations import archive_project
+
+
+def trash_task(task, user):
+    """Move a task to the trash; its counters follow through Task.save"""
+    task.is_active = False
+    task.deleted_at = timezone.now()
+    task.updated_by = user
+    task.save()
+
+
+def restore_task(task, user):
+    """Bring a task back from the trash"""
+    task.is_active = True
+    task.deleted_at = None
+    task.updated_by = user
+    task.save()
+
+
+def trash_project(project, user):
+    """
+    Move a project and its active tasks to the trash.
+
+    Returns:
+        int: Number of tasks trashed with the project
+    """
+    return archive_project(project, user, deleted_at=timezone.now())
+
+
+def restore_project(project, user):
+    """
+    Bring a project back together with the tasks trashed with it.
+
+    Returns:
+        int: Number of tasks restored with the project
+    """
+    with transaction.atomic():
+        deleted_at = project.deleted_at
+        project.is_active = True
+        project.deleted_at = None
+        project.updated_by = user
+        project.save()
+        restored = Task.objects.filter(
+            project=project, is_active=False, deleted_at=deleted_at
+        ).update(
+            is_active=True, deleted_at=None, updated_by=user, updated_at=timezone.now()
+        )
+        recount_for_projects([project.pk])
+    bump_user_version(project.created_by_id)
+    return restored
+
+
+def trash_category(category, user):
+    """
+    Move a category, its active projects and their active tasks to the trash.
+
+    Returns:
+        int: Number of projects trashed with the category
+    """
+    now = timezone.now()
+    changes = {
+        "is_active": False,
+        "deleted_at": now,
+        "updated_by": user,
+        "updated_at": now,
+    }
+    with transaction.atomic():
+        category.is_active = False
+        category.deleted_at = now
+        category.updated_by = user
+        category.save()
+        trashed = Project.objects.filter(category=category, is_active=True).update(
+            **changes, **{field: 0 for field in Project.counter_fields}
+        )
+        Task.objects.filter(
+            project__in=Project.objects.filter(category=category, deleted_at=now),
+            is_active=True,
+        ).update(**changes)
+        Category.objects.filter(pk=category.pk).update(
+            **{field: 0 for field in Category.counter_fields}
+        )
+    bump_user_version(category.created_by_id)
+    return trashed
+
+
+def restore_category(category, user):
+    """
+    Bring a category back together with the projects and tasks trashed with it.
+
+    Returns:
+        int: Number of projects restored with the category
+    """
+    now = timezone.now()
+    changes = {
+        "is_active": True,
+        "deleted_at": None,
+        "updated_by": user,
+        "updated_at": now,
+    }
+    with transaction.atomic():
+        deleted_at = category.deleted_at
+        category.is_active = True
+        category.deleted_at = None
+        category.updated_by = user
+        category.save()
+        project_ids = list(
+            Project.objects.filter(
+                category=category, is_active=False, deleted_at=deleted_at
+            ).values_list("pk", flat=True)
+        )
+        Task.objects.filter(
+            project_id__in=project_ids, is_active=False, deleted_at=deleted_at
+        ).update(**changes)
+        Project.objects.filter(pk__in=project_ids).update(**changes)
+        recount_for_projects(project_ids)
+        recount_categories([category.pk])
+    bump_user_version(category.created_by_id)
+    return len(project_ids)
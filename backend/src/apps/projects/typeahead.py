@@ -0,0 +1,154 @@
+"""
+In-process prefix index for name lookups as the user types.
+
+Each user's active category, project and task names are loaded once into
+sorted lists of lowercase keys, one per word a name has, so a lookup is a
+binary search followed by a short scan, with no database query.
+Indexes are kept for the most recently active users of the process and
+rebuilt lazily when the user's cache version has moved on, which every
+write to their categories, projects or tasks does. The version is read
+from the shared cache at most once per LOCAL_CACHE_TIMEOUT seconds (see
+base.cache), which is one query when that cache is the database.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from operator import itemgetter
+
+from django.conf import settings
+
+from base.cache import get_user_version
+from categories.models import Category
+from tasks.models import Task
+from .models import Project
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+class TypeaheadIndex:
+    """
+    Sorted prefix index over one user's names.
+
+    Whole names and the tails of names from their second word on are kept
+    in two sorted lists, so names starting with the query can be listed
+    before names that only have a later word starting with it, and either
+    scan stops as soon as enough items are found.
+
+    Args:
+        items: (type, id, name, color) tuples to index
+    """
+
+    def __init__(self, items):
+        names, tails = [], []
+        for item in items:
+            name = " ".join(item[2].lower().split())
+            names.append((name, item))
+            start = name.find(" ")
+            while start != -1:
+                tails.append((name[start + 1 :], item))
+                start = name.find(" ", start + 1)
+        self.lists = []
+        for entries in (names, tails):
+            entries.sort(key=itemgetter(0))
+            self.lists.append(
+                ([key for key, item in entries], [item for key, item in entries])
+            )
+
+    def lookup(self, query, limit):
+        """
+        Find the items with a word starting with the query.
+
+        Names starting with the query come before names that only have a
+        later word starting with it; otherwise names come alphabetically.
+
+        Args:
+            query: Typed text, matched case-insensitively
+            limit: Maximum number of items to return
+
+        Returns:
+            list: Up to limit (type, id, name, color) tuples
+        """
+        prefix = " ".join(query.lower().split())
+        if not prefix:
+            return []
+        found, seen = [], set()
+        for keys, items in self.lists:
+            position = bisect_left(keys, prefix)
+            while (
+                len(found) < limit
+                and position < len(keys)
+                and keys[position].startswith(prefix)
+            ):
+                item = items[position]
+                position += 1
+                if item[:2] not in seen:
+                    seen.add(item[:2])
+                    found.append(item)
+        return found
+
+
+def build_index(user_id):
+    """
+    Load a user's active category, project and task names into an index.
+
+    Args:
+        user_id: ID of the user whose names to index
+
+    Returns:
+        TypeaheadIndex: The new index
+    """
+    items = [
+        ("category", pk, name, color)
+        for pk, name, color in Category.objects.filter(
+            created_by_id=user_id, is_active=True
+        ).values_list("pk", "name", "color")
+    ]
+    items += [
+        ("project", pk, name, color)
+        for pk, name, color in Project.objects.filter(
+            created_by_id=user_id, is_active=True
+        ).values_list("pk", "name", "category__color")
+    ]
+    items += [
+        ("task", pk, name, color)
+        for pk, name, color in Task.objects.filter(
+            owner_id=user_id, is_active=True
+        ).values_list("pk", "name", "project__category__color")
+    ]
+    return TypeaheadIndex(items)
+
+
+def get_index(user_id):
+    """
+    Get a user's index, building it if it is missing or out of date.
+
+    Args:
+        user_id: ID of the user whose index to get
+
+    Returns:
+        TypeaheadIndex: Index matching the user's current data
+    """
+    version = get_user_version(user_id)
+    with _lock:
+        cached = _indexes.get(user_id)
+        if cached and cached[0] == version:
+            _indexes.move_to_end(user_id)
+            return cached[1]
+
+    # Built outside the lock, so one user's rebuild never stalls another's
+    # lookups; a concurrent rebuild for the same user just does it twice
+    index = build_index(user_id)
+    with _lock:
+        _indexes[user_id] = (version, index)
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > settings.TYPEAHEAD_MAX_USERS:
+            _indexes.popitem(last=False)
+    return index
+
+
+def clear_indexes():
+    """Drop every index held by the process"""
+    with _lock:
+        _indexes.clear()
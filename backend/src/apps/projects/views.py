@@ -1,27 +1,54 @@
-from rest_framework import viewsets
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from base.cache import get_or_compute, set_value, user_cache_key
+from base.pagination import (
+    EstimatedCountPagination,
+    KeysetPagination,
+    NoCountPagination,
+)
+from base.views import PaginationModeMixin, SearchMixin, TrashMixin
+from . import operations, trash, typeahead
 from .models import Project
 from .serializers import ProjectSerializer
 from categories.models import Category
 from tasks.models import Task
+from users.authentications import CookieJWTStatelessAuthentication
 
+# Largest date shift accepted by the shift-dates action
+MAX_SHIFT_DAYS = 3650
 
-class ProjectViewSet(viewsets.ModelViewSet):
+
+class ProjectViewSet(
+    TrashMixin, SearchMixin, PaginationModeMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for managing projects.
     """
 
     permission_classes = (IsAuthenticated,)
+    pagination_modes = {
+        "cursor": KeysetPagination,
+        "nocount": NoCountPagination,
+        "estimate": EstimatedCountPagination,
+    }
     serializer_class = ProjectSerializer
+    search_fields = ("name", "description")
+    search_scope_field = "created_by_id"
+    # Set to "heavy" by expensive actions, see base.throttling
+    throttle_scope = None
 
     def get_queryset(self):
         """Return projects for the authenticated user"""
         return (
             Project.objects.filter(created_by=self.request.user, is_active=True)
+            .with_schedule(timezone.now().date())
             .select_related("category", "created_by", "updated_by")
-            .prefetch_related("tasks")
         )
 
     def get_serializer(self, *args, **kwargs):
@@ -38,60 +65,201 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Set created_by and updated_by automatically"""
-        serializer.save(created_by=self.request.user, updated_by=self.request.user)
+        project = serializer.save(
+            created_by=self.request.user, updated_by=self.request.user
+        )
+        self.refresh_category_counters(project)
 
     def perform_update(self, serializer):
         """Set updated_by automatically"""
-        serializer.save(updated_by=self.request.user)
+        project = serializer.save(updated_by=self.request.user)
+        self.refresh_category_counters(project)
+
+    def refresh_category_counters(self, project):
+        """Reload the counters the save changed, for the nested category response"""
+        if project.category_id:
+            project.category.refresh_from_db(fields=Category.counter_fields)
+
+    def get_inactive_queryset(self):
+        """Get inactive projects for the user"""
+        return Project.objects.filter(
+            created_by=self.request.user, is_active=False
+        ).select_related("category", "created_by", "updated_by")
+
+    def trash_object(self, instance):
+        """Move the project and its tasks to the trash"""
+        trash.trash_project(instance, self.request.user)
+
+    def get_restore_error(self, instance):
+        """Projects of a trashed category come back with the category"""
+        if instance.category_id and not instance.category.is_active:
+            return "Restore the project's category first"
+        return None
+
+    def restore_object(self, instance):
+        """Restore the project with the tasks trashed with it"""
+        trash.restore_project(instance, self.request.user)
+        instance.refresh_from_db(fields=Project.counter_fields)
+        self.refresh_category_counters(instance)
+
+    @action(detail=True, methods=["post"], url_path="complete-all")
+    def complete_all(self, request, pk=None):
+        """Mark all open tasks of the project completed"""
+        project = self.get_object()
+        completed = operations.complete_tasks(project, request.user)
+        return Response({"tasks_updated": completed})
+
+    @action(detail=True, methods=["post"], url_path="shift-dates")
+    def shift_dates(self, request, pk=None):
+        """Move the project's and its tasks' dates by ?days=N days"""
+        project = self.get_object()
+        try:
+            days = int(request.query_params.get("days", request.data.get("days")))
+        except (TypeError, ValueError):
+            days = None
+        if days is None or abs(days) > MAX_SHIFT_DAYS:
+            return Response(
+                {
+                    "message": f"days must be a whole number between "
+                    f"-{MAX_SHIFT_DAYS} and {MAX_SHIFT_DAYS}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        shifted = operations.shift_dates(project, days, request.user)
+        return Response({"projects_updated": 1, "tasks_updated": shifted})
 
-    @action(detail=False, methods=["get"])
+    @action(detail=True, methods=["post"], url_path="move-tasks-to")
+    def move_tasks_to(self, request, pk=None):
+        """Move the active tasks of the project to the project given in the body"""
+        project = self.get_object()
+        try:
+            target_id = int(request.data.get("project"))
+        except (TypeError, ValueError):
+            target_id = None
+        target = (
+            Project.objects.filter(
+                created_by=request.user, is_active=True, pk=target_id
+            )
+            .exclude(pk=project.pk)
+            .first()
+        )
+        if target is None:
+            return Response(
+                {"message": "Target project not found"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        clashes = operations.find_move_clashes(project, target)
+        if clashes:
+            return Response(
+                {
+                    "message": "The target project already has tasks with these names",
+                    "names": clashes,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        moved = operations.move_tasks(project, target, request.user)
+        return Response({"tasks_updated": moved})
+
+    @action(detail=True, methods=["post"])
+    def archive(self, request, pk=None):
+        """Deactivate the project and its tasks"""
+        project = self.get_object()
+        archived = operations.archive_project(project, request.user)
+        return Response({"projects_updated": 1, "tasks_updated": archived})
+
+    @action(detail=False, methods=["get"], throttle_scope="heavy")
     def dashboard(self, request):
-        """Get dashboard overview with project and task counts"""
-        user = request.user
-
-        # Project counts
-        total_projects = Project.objects.filter(created_by=user, is_active=True).count()
-        active_projects = Project.objects.filter(
-            created_by=user, status="active", is_active=True
-        ).count()
-        completed_projects = Project.objects.filter(
-            created_by=user, status="completed", is_active=True
-        ).count()
-
-        # Task counts
-        total_tasks = Task.objects.filter(
-            project__created_by=user, is_active=True
-        ).count()
-        completed_tasks = Task.objects.filter(
-            project__created_by=user, status="completed", is_active=True
-        ).count()
-        todo_tasks = Task.objects.filter(
-            project__created_by=user, status="todo", is_active=True
-        ).count()
-        in_progress_tasks = Task.objects.filter(
-            project__created_by=user, status="in_progress", is_active=True
-        ).count()
-
-        # Category counts
-        total_categories = Category.objects.filter(
+        """
+        Get dashboard overview with project and task counts.
+
+        The result is cached per user and invalidated whenever one of the
+        user's projects, tasks or categories is written. Pass ?fresh=1 to
+        bypass the cache. The X-Cache response header reports HIT, MISS,
+        STALE (served while another request recomputes it, see base.cache)
+        or BYPASS.
+        """
+        cache_key = user_cache_key(request.user.pk, "dashboard")
+
+        if request.query_params.get("fresh") in ("1", "true"):
+            dashboard_data = self.get_dashboard_data(request.user)
+            set_value(cache_key, dashboard_data, settings.DASHBOARD_CACHE_TIMEOUT)
+            cache_status = "BYPASS"
+        else:
+            dashboard_data, cache_status = get_or_compute(
+                cache_key,
+                lambda: self.get_dashboard_data(request.user),
+                settings.DASHBOARD_CACHE_TIMEOUT,
+            )
+
+        response = Response(dashboard_data)
+        response["X-Cache"] = cache_status
+        return response
+
+    def get_dashboard_data(self, user):
+        """Count the user's projects, tasks and categories, one query per model"""
+        project_counts = Project.objects.filter(
             created_by=user, is_active=True
-        ).count()
-
-        dashboard_data = {
-            "projects": {
-                "total": total_projects,
-                "active": active_projects,
-                "completed": completed_projects,
-            },
-            "tasks": {
-                "total": total_tasks,
-                "completed": completed_tasks,
-                "todo": todo_tasks,
-                "in_progress": in_progress_tasks,
-            },
-            "categories": {
-                "total": total_categories,
-            },
+        ).aggregate(
+            total=Count("id"),
+            active=Count("id", filter=Q(status="in progress")),
+            completed=Count("id", filter=Q(status="completed")),
+        )
+        task_counts = Task.objects.filter(owner=user, is_active=True).aggregate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status="completed")),
+            todo=Count("id", filter=Q(status="todo")),
+            in_progress=Count("id", filter=Q(status="in_progress")),
+        )
+        category_counts = Category.objects.filter(
+            created_by=user, is_active=True
+        ).aggregate(total=Count("id"))
+
+        return {
+            "projects": project_counts,
+            "tasks": task_counts,
+            "categories": category_counts,
         }
 
-        return Response(dashboard_data)
+
+class TypeaheadView(APIView):
+    """
+    Name lookups across categories, projects and tasks as the user types.
+
+    Served from an in-process prefix index of the user's names (see
+    projects.typeahead), so a keystroke costs no database query unless the
+    user has written since the index was built, or the user's cache
+    version is due to be read again from a database cache. Only the user's
+    ID is needed, so requests authenticate from the token alone, without
+    loading the user.
+    """
+
+    authentication_classes = (CookieJWTStatelessAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        """
+        Find the user's items with a word starting with ?q=.
+
+        Args:
+            request: HTTP request with the typed text in q and an optional
+                limit (default 10, at most TYPEAHEAD_MAX_RESULTS)
+
+        Returns:
+            Response: Matching items as type, id, name and color
+        """
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except (TypeError, ValueError):
+            limit = 10
+        limit = min(max(limit, 1), settings.TYPEAHEAD_MAX_RESULTS)
+
+        index = typeahead.get_index(request.user.pk)
+        items = index.lookup(request.query_params.get("q", ""), limit)
+        return Response(
+            {
+                "results": [
+                    {"type": item_type, "id": pk, "name": name, "color": color}
+                    for item_type, pk, name, color in items
+                ]
+            }
+        )
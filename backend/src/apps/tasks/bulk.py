@@ -0,0 +1,233 @@
+"""
+Batch create, update and delete of tasks.
+
+Items are validated together: the projects they reference are looked up in
+one query, which is also the ownership check, and name clashes are found
+with one query against the existing tasks. Valid items are written with
+bulk_create/bulk_update in one transaction, the touched project and category
+counters are recounted once, and invalid items are reported and skipped.
+
+Each function returns one (result, errors) pair per item, in input order:
+the written task (or trashed ID) and None, or None and the item's errors.
+"""
+
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from base.cache import bump_user_version
+from projects.counters import deferred_counters
+from projects.models import Project
+from .models import Task
+from .serializers import TaskBulkSerializer
+
+NOT_FOUND = "Not found."
+DUPLICATE_ITEM = "This task appears more than once in the request."
+NAME_TAKEN = "A task with this name already exists in the project."
+
+
+def create_tasks(user, items, context):
+    """
+    Create the valid items as new tasks.
+
+    Args:
+        user: User creating the tasks
+        items: List of task data dicts
+        context: Serializer context of the request
+
+    Returns:
+        list: (task, errors) pairs
+    """
+    context = {**context, "projects": get_user_projects(user, items)}
+    outcomes = []
+    for item in items:
+        serializer = TaskBulkSerializer(data=item, context=context)
+        if not serializer.is_valid():
+            outcomes.append((None, serializer.errors))
+            continue
+        task = Task(**serializer.validated_data, created_by=user, updated_by=user)
+        task.owner_id = task.project.created_by_id
+        task.apply_status_progress()
+        outcomes.append((task, None))
+
+    reject_name_clashes(outcomes)
+    tasks = [task for task, errors in outcomes if task]
+    with transaction.atomic(), deferred_counters() as touched:
+        Task.objects.bulk_create(tasks)
+        touched.update(task.project_id for task in tasks)
+    bump_user_version(user.pk)
+    return outcomes
+
+
+def update_tasks(user, items, context):
+    """
+    Apply the valid items as partial updates to the user's tasks.
+
+    Args:
+        user: User updating the tasks
+        items: List of task data dicts, each with the "id" of the task
+        context: Serializer context of the request
+
+    Returns:
+        list: (task, errors) pairs
+    """
+    ids = {as_int(item.get("id")) for item in items if isinstance(item, dict)}
+    tasks = Task.objects.filter(owner=user, is_active=True, pk__in=ids).in_bulk()
+    context = {**context, "projects": get_user_projects(user, items)}
+    fields = {"progress", "owner", "updated_by", "updated_at"}
+    now = timezone.now()
+    stored_keys = {task.pk: (task.name, task.project_id) for task in tasks.values()}
+    seen = set()
+    outcomes = []
+    for item in items:
+        task = tasks.get(as_int(item.get("id"))) if isinstance(item, dict) else None
+        if task is None:
+            outcomes.append((None, {"id": [NOT_FOUND]}))
+            continue
+        if task.pk in seen:
+            outcomes.append((None, {"id": [DUPLICATE_ITEM]}))
+            continue
+        seen.add(task.pk)
+        serializer = TaskBulkSerializer(task, data=item, partial=True, context=context)
+        if not serializer.is_valid():
+            outcomes.append((None, serializer.errors))
+            continue
+        for field, value in serializer.validated_data.items():
+            setattr(task, field, value)
+            fields.add(field)
+        task.apply_status_progress()
+        if task.project_moved():
+            task.owner_id = task.project.created_by_id
+        task.updated_by = user
+        task.updated_at = now
+        outcomes.append((task, None))
+
+    reject_name_clashes(outcomes)
+    tasks = [task for task, errors in outcomes if task]
+    with transaction.atomic(), deferred_counters() as touched:
+        free_taken_names(tasks, stored_keys)
+        Task.objects.bulk_update(tasks, sorted(fields))
+        for task in tasks:
+            touched.update((task.project_id, task.get_saved_values()["project_id"]))
+            task.remember_saved_values()
+    bump_user_version(user.pk)
+    return outcomes
+
+
+def delete_tasks(user, ids):
+    """
+    Move the user's tasks with the given IDs to the trash.
+
+    Args:
+        user: User deleting the tasks
+        ids: List of task IDs
+
+    Returns:
+        list: (id, errors) pairs
+    """
+    projects = dict(
+        Task.objects.filter(
+            owner=user, is_active=True, pk__in={as_int(pk) for pk in ids}
+        ).values_list("pk", "project_id")
+    )
+    seen = set()
+    outcomes = []
+    for pk in ids:
+        pk = as_int(pk)
+        if pk not in projects:
+            outcomes.append((None, {"id": [NOT_FOUND]}))
+        elif pk in seen:
+            outcomes.append((None, {"id": [DUPLICATE_ITEM]}))
+        else:
+            seen.add(pk)
+            outcomes.append((pk, None))
+
+    now = timezone.now()
+    with transaction.atomic(), deferred_counters() as touched:
+        Task.objects.filter(pk__in=seen).update(
+            is_active=False, deleted_at=now, updated_by=user, updated_at=now
+        )
+        touched.update(projects[pk] for pk in seen)
+    bump_user_version(user.pk)
+    return outcomes
+
+
+def get_user_projects(user, items):
+    """
+    Look up the active projects of the user referenced by any item.
+
+    Args:
+        user: User owning the projects
+        items: List of task data dicts
+
+    Returns:
+        dict: Projects by ID
+    """
+    ids = {as_int(item.get("project")) for item in items if isinstance(item, dict)}
+    return Project.objects.filter(created_by=user, is_active=True, pk__in=ids).in_bulk()
+
+
+def reject_name_clashes(outcomes):
+    """
+    Turn valid items that would break the name/project/creator uniqueness into errors.
+
+    Names are checked against the stored tasks the request does not rewrite
+    and against the items before them, with one query. A rejected update
+    keeps its task's stored name, which may clash with another item, so
+    the check is repeated until it rejects no update.
+
+    Args:
+        outcomes: (task, errors) pairs, updated in place
+    """
+    rejected_update = True
+    while rejected_update:
+        rejected_update = False
+        tasks = [task for task, errors in outcomes if task]
+        taken = set(
+            Task.objects.filter(
+                project_id__in={task.project_id for task in tasks},
+                name__in={task.name for task in tasks},
+            )
+            .exclude(pk__in=[task.pk for task in tasks if task.pk])
+            .values_list("name", "project_id", "created_by_id")
+        )
+        for index, (task, errors) in enumerate(outcomes):
+            if task is None:
+                continue
+            key = (task.name, task.project_id, task.created_by_id)
+            if key in taken:
+                outcomes[index] = (None, {"name": [NAME_TAKEN]})
+                rejected_update = rejected_update or task.pk is not None
+            else:
+                taken.add(key)
+
+
+def free_taken_names(tasks, stored_keys):
+    """
+    Give temporary names to updated tasks taking the name of another one.
+
+    The unique constraint is checked row by row while an UPDATE runs, so
+    tasks swapping names or projects would clash halfway through the
+    bulk_update; renaming them to unique placeholders first avoids that.
+
+    Args:
+        tasks: Tasks about to be written with bulk_update
+        stored_keys: (name, project ID) of each task as stored, by ID
+    """
+    changed = [
+        task for task in tasks if (task.name, task.project_id) != stored_keys[task.pk]
+    ]
+    vacated = {stored_keys[task.pk] for task in changed}
+    if any((task.name, task.project_id) in vacated for task in changed):
+        Task.objects.bulk_update(
+            [Task(pk=task.pk, name=uuid.uuid4().hex) for task in changed], ["name"]
+        )
+
+
+def as_int(value):
+    """Convert an ID from request data to an int, None if it is not one"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,209 @@
+"""
+Streaming import of tasks from CSV or NDJSON files.
+
+The file is parsed row by row and handled in chunks: every row is checked
+by one shared TaskBulkSerializer against the user's projects, loaded once
+for the whole file, name clashes are found with one query per chunk, and
+the valid rows of a chunk are inserted with bulk_create in their own
+transaction. Invalid rows are reported with their row number and skipped,
+so one bad row does not abort the rest of the file.
+
+Rows use the columns of the export: project may be given as project or
+project_id (an ID) or as project__name, and columns the serializer does
+not write, such as id or created_at, are ignored.
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from base.cache import bump_user_version
+from projects.counters import deferred_counters
+from projects.models import Project
+from .bulk import reject_name_clashes
+from .models import Task
+from .serializers import TaskBulkSerializer
+
+FORMATS = ("csv", "ndjson")
+INVALID_JSON = "Expected a JSON object."
+UNKNOWN_PROJECT = "No project with this name."
+
+
+def read_csv(stream):
+    """
+    Read rows from a CSV file with a header line.
+
+    Empty cells are left out, so optional fields take their defaults.
+
+    Yields:
+        dict: Each row
+    """
+    for row in csv.DictReader(stream):
+        yield {
+            column: value
+            for column, value in row.items()
+            if column and value not in ("", None)
+        }
+
+
+def read_ndjson(stream):
+    """
+    Read rows from a file with one JSON object per line.
+
+    Blank lines are skipped.
+
+    Yields:
+        dict or None: Each row, None for a line that is not a JSON object
+    """
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def guess_format(filename):
+    """
+    Get the import format of a file from its extension.
+
+    Returns:
+        str: "csv" or "ndjson", None for other extensions
+    """
+    name = (filename or "").lower()
+    for extension, file_format in EXTENSIONS.items():
+        if name.endswith(extension):
+            return file_format
+    return None
+
+
+class ImportResult:
+    """
+    Outcome of an import: counts and the first TASK_IMPORT_MAX_ERRORS row errors.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row, errors):
+        """Record a rejected row"""
+        self.failed += 1
+        if len(self.errors) < settings.TASK_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        """Summary for the API response"""
+        return {"created": self.created, "failed": self.failed, "errors": self.errors}
+
+
+def import_tasks(user, stream, file_format, batch_size=None, context=None):
+    """
+    Create tasks for a user from an open text file.
+
+    Args:
+        user: User the tasks are created for
+        stream: Text file object, opened with newline="" for CSV
+        file_format: "csv" or "ndjson"
+        batch_size: Rows validated and inserted per transaction, defaults
+            to TASK_IMPORT_BATCH_SIZE
+        context: Serializer context, e.g. of the request
+
+    Returns:
+        ImportResult: Number of created and failed rows and row errors,
+            numbered from 1 for the first row after any header
+    """
+    batch_size = batch_size or settings.TASK_IMPORT_BATCH_SIZE
+    projects = Project.objects.filter(created_by=user, is_active=True).in_bulk()
+    context = {**(context or {}), "projects": projects}
+    project_ids = {project.name: pk for pk, project in projects.items()}
+    # One serializer checks every row, so its fields are only built once
+    serializer = TaskBulkSerializer(context=context)
+    result = ImportResult()
+    rows = enumerate(READERS[file_format](stream), start=1)
+    try:
+        while chunk := list(islice(rows, batch_size)):
+            import_chunk(user, chunk, serializer, project_ids, result)
+    except (UnicodeDecodeError, csv.Error) as error:
+        # Every row before this one was created or rejected
+        result.add_error(
+            result.created + result.failed + 1,
+            {"file": [f"Import stopped, the file cannot be read: {error}"]},
+        )
+    finally:
+        if result.created:
+            bump_user_version(user.pk)
+    return result
+
+
+def import_chunk(user, chunk, serializer, project_ids, result):
+    """
+    Validate one chunk of numbered rows and insert the valid ones.
+
+    Args:
+        user: User the tasks are created for
+        chunk: List of (row number, row) pairs
+        serializer: Shared TaskBulkSerializer
+        project_ids: Project IDs of the user by name
+        result: ImportResult to add to
+    """
+    numbers = []
+    outcomes = []
+    for number, row in chunk:
+        numbers.append(number)
+        if row is None:
+            outcomes.append((None, {"non_field_errors": [INVALID_JSON]}))
+            continue
+        try:
+            data = serializer.run_validation(resolve_project(row, project_ids))
+        except ValidationError as error:
+            outcomes.append((None, error.detail))
+            continue
+        task = Task(**data, created_by=user, updated_by=user)
+        task.owner_id = task.project.created_by_id
+        task.apply_status_progress()
+        outcomes.append((task, None))
+
+    reject_name_clashes(outcomes)
+    tasks = [task for task, errors in outcomes if task]
+    with transaction.atomic(), deferred_counters() as touched:
+        Task.objects.bulk_create(tasks)
+        touched.update(task.project_id for task in tasks)
+    result.created += len(tasks)
+    for number, (task, errors) in zip(numbers, outcomes):
+        if errors:
+            result.add_error(number, errors)
+
+
+def resolve_project(row, project_ids):
+    """
+    Get the row with its project given as the "project" ID.
+
+    Returns:
+        dict: The row, with "project" set from project_id or project__name
+
+    Raises:
+        ValidationError: If the project is named and the user has no
+            project of that name
+    """
+    if row.get("project") is not None:
+        return row
+    if row.get("project_id") is not None:
+        return {**row, "project": row["project_id"]}
+    name = row.get("project__name")
+    if name is None:
+        return row
+    if name not in project_ids:
+        raise ValidationError({"project__name": [UNKNOWN_PROJECT]})
+    return {**row, "project": project_ids[name]}
@@ -0,0 +1,214 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from base.cache import clear_local
+from categories.models import Category
+from categories.views import CategoryViewSet
+from projects.models import Project
+from projects.typeahead import clear_indexes
+from projects.views import ProjectViewSet, TypeaheadView
+from tasks.models import Task
+from tasks.views import TaskViewSet
+
+User = get_user_model()
+
+STATUSES = [choice for choice, _ in Task.STATUS_CHOICES]
+PRIORITIES = [choice for choice, _ in Task.PRIORITY_CHOICES]
+# A word count that shares no factor with the project and is_active cycles,
+# so every word turns up in every project, active or not
+WORDS = [
+    "report",
+    "invoice",
+    "review",
+    "deploy",
+    "meeting",
+    "design",
+    "budget",
+    "migration",
+    "release",
+    "backup",
+    "planning",
+]
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the list endpoints with and without the model indexes.
+
+    Seeds a synthetic dataset, times the list endpoints with the indexes
+    declared in Meta.indexes dropped and then restored, and rolls everything
+    back at the end, so the database is left exactly as it was. The
+    typeahead, which needs no index, is timed alongside for its lookups.
+    """
+
+    help = "Time list endpoints on a seeded dataset with and without indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=1_000_000,
+            help="Number of tasks to seed (default: 1,000,000)",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=100,
+            help="Number of users to spread the tasks over (default: 100)",
+        )
+        parser.add_argument(
+            "--projects-per-user",
+            type=int,
+            default=10,
+            help="Number of projects per user (default: 10)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed runs per endpoint (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed(
+                options["tasks"], options["users"], options["projects_per_user"]
+            )
+            endpoints = self.get_endpoints(user, options["tasks"])
+
+            self.set_indexes(enabled=False)
+            self.clear_caches()
+            before = self.time_endpoints(endpoints, options["repeat"])
+            self.set_indexes(enabled=True)
+            self.clear_caches()
+            after = self.time_endpoints(endpoints, options["repeat"])
+
+            self.report(before, after)
+            transaction.set_rollback(True)
+
+    def seed(self, task_total, user_total, projects_per_user):
+        """Bulk insert users, categories, projects and tasks"""
+        self.stdout.write(f"Seeding {task_total} tasks for {user_total} users...")
+        users = User.objects.bulk_create(
+            User(email=f"bench-{i}@example.com", username=f"bench-{i}")
+            for i in range(user_total)
+        )
+        categories = Category.objects.bulk_create(
+            Category(name=f"Category {i}", created_by=user)
+            for user in users
+            for i in range(2)
+        )
+        projects = Project.objects.bulk_create(
+            Project(
+                name=f"Project {i}",
+                category=categories[index * 2 + i % 2],
+                created_by=user,
+            )
+            for index, user in enumerate(users)
+            for i in range(projects_per_user)
+        )
+
+        batch = []
+        for i in range(task_total):
+            project = projects[i % len(projects)]
+            batch.append(
+                Task(
+                    name=f"Task {i} {WORDS[i % len(WORDS)]}",
+                    project=project,
+                    status=STATUSES[i % len(STATUSES)],
+                    priority=PRIORITIES[i % len(PRIORITIES)],
+                    is_active=i % 10 != 0,
+                    created_by_id=project.created_by_id,
+                    owner_id=project.created_by_id,
+                )
+            )
+            if len(batch) == 10_000:
+                Task.objects.bulk_create(batch)
+                batch = []
+        Task.objects.bulk_create(batch)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        return users[0]
+
+    def get_endpoints(self, user, task_total):
+        """Build the list requests to time"""
+        factory = APIRequestFactory()
+        last_page = max(1, task_total // 10 // 20)
+        task_list = TaskViewSet.as_view({"get": "list"})
+        requests = {
+            "tasks page 1": (task_list, "/api/tasks/"),
+            "tasks last page": (task_list, f"/api/tasks/?page={last_page}"),
+            "tasks search": (
+                TaskViewSet.as_view({"get": "search"}),
+                "/api/tasks/search/?q=report",
+            ),
+            "projects page 1": (
+                ProjectViewSet.as_view({"get": "list"}),
+                "/api/projects/",
+            ),
+            "categories page 1": (
+                CategoryViewSet.as_view({"get": "list"}),
+                "/api/categories/",
+            ),
+            # Timed warm: the first run builds the user's index
+            "typeahead": (TypeaheadView.as_view(), "/api/typeahead/?q=task+1"),
+        }
+        endpoints = {}
+        for name, (view, url) in requests.items():
+            request = factory.get(url, HTTP_HOST="localhost")
+            force_authenticate(request, user=user)
+            endpoints[name] = (view, request)
+        return endpoints
+
+    def set_indexes(self, enabled):
+        """Create or drop the indexes declared on the models"""
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in (Category, Project, Task):
+                for index in model._meta.indexes:
+                    if enabled:
+                        sql = str(index.create_sql(model, editor))
+                    else:
+                        sql = f"DROP INDEX {connection.ops.quote_name(index.name)}"
+                    cursor.execute(sql)
+
+    def clear_caches(self):
+        """Start a timing run without the values cached by the previous one"""
+        cache.clear()
+        clear_local()
+        clear_indexes()
+
+    def time_endpoints(self, endpoints, repeat):
+        """
+        Return the median latency in milliseconds of each endpoint.
+
+        Rows are serialized on every run rather than served from the
+        fragment cache, so the timings reflect the queries.
+        """
+        timings = {}
+        with override_settings(FRAGMENT_CACHE_TIMEOUT=0):
+            for name, (view, request) in endpoints.items():
+                samples = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    response = view(request)
+                    response.render()
+                    samples.append((time.perf_counter() - start) * 1000)
+                timings[name] = statistics.median(samples)
+        return timings
+
+    def report(self, before, after):
+        """Print a before/after latency table"""
+        self.stdout.write(f"{'endpoint':<20}{'no indexes':>14}{'indexes':>14}")
+        for name in before:
+            self.stdout.write(
+                f"{name:<20}{before[name]:>11.1f} ms{after[name]:>11.1f} ms"
+            )
@@ -0,0 +1,66 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.imports import FORMATS, guess_format, import_tasks
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Import tasks for a user from a CSV or NDJSON file.
+
+    The file is read as a stream and imported in batches, so its size does
+    not matter; rows that fail validation are listed and skipped.
+    """
+
+    help = "Import tasks from a CSV or NDJSON file into a user's projects"
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="Email of the user owning the projects")
+        parser.add_argument("path", help="File to import")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Rows to validate and insert per transaction "
+            "(default: TASK_IMPORT_BATCH_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or guess_format(options["path"])
+        if file_format is None:
+            raise CommandError("Cannot tell the file format, pass --format")
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        try:
+            user = User.objects.get(email=options["email"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['email']}")
+
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                result = import_tasks(
+                    user, stream, file_format, batch_size=options["batch_size"]
+                )
+        except OSError as error:
+            raise CommandError(f"Cannot read {options['path']}: {error}")
+
+        for error in result.errors:
+            self.stderr.write(f"  Row {error['row']}: {json.dumps(error['errors'])}")
+        if result.failed > len(result.errors):
+            self.stderr.write(
+                f"  ... and {result.failed - len(result.errors)} more rejected rows"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Tasks imported: {result.created}, rejected: {result.failed}"
+            )
+        )
@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 1000
+
+
+def populate_owner(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    Project = apps.get_model("projects", "Project")
+
+    project_owner = Subquery(
+        Project.objects.filter(pk=OuterRef("project_id")).values("created_by_id")[:1]
+    )
+    last_id = 0
+    while True:
+        ids = list(
+            Task.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            return
+        Task.objects.filter(pk__in=ids).update(owner_id=project_owner)
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_indexes'),
+        ('tasks', '0003_task_owner'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_owner, migrations.RunPython.noop),
+    ]
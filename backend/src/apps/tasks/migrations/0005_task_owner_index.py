@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_populate_task_owner'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['owner', '-created_at'], name='task_owner_active_idx'),
+        ),
+    ]
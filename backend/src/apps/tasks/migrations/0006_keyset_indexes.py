@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_keyset_indexes'),
+        ('tasks', '0005_task_owner_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_active_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_owner_active_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['owner', '-created_at', '-id'], name='task_owner_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['project', '-created_at', '-id'], name='task_project_active_idx'),
+        ),
+    ]
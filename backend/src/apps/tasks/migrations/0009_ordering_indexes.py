@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:12
+
+import base.functions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_search_index'),
+        ('tasks', '0008_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['owner', 'due_date', 'id'], name='task_owner_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(models.F('owner'), base.functions.ChoiceRank('priority', ['low', 'medium', 'high', 'urgent']), models.F('created_at'), models.F('id'), condition=models.Q(('is_active', True)), name='task_owner_priority_idx'),
+        ),
+    ]
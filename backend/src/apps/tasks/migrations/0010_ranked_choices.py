@@ -0,0 +1,154 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:40
+
+import base.fields
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+from base.search import create_search_index
+
+BATCH_SIZE = 1000
+
+PRIORITY_CHOICES = [
+    ('low', 'Low'),
+    ('medium', 'Medium'),
+    ('high', 'High'),
+    ('urgent', 'Urgent'),
+]
+STATUS_CHOICES = [
+    ('todo', 'To Do'),
+    ('in_progress', 'In Progress'),
+    ('review', 'Review'),
+    ('completed', 'Completed'),
+    ('cancelled', 'Cancelled'),
+]
+
+
+def to_ranks(field, choices, default):
+    values = [value for value, label in choices]
+    return Case(
+        *[When(**{field: value}, then=Value(rank)) for rank, value in enumerate(values)],
+        default=Value(values.index(default)),
+    )
+
+
+def to_values(field, choices):
+    return Case(
+        *[When(**{field: rank}, then=Value(value)) for rank, (value, label) in enumerate(choices)]
+    )
+
+
+def update_in_batches(model, changes):
+    last_id = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            return
+        model.objects.filter(pk__in=ids).update(**changes)
+        last_id = ids[-1]
+
+
+def encode(apps, schema_editor):
+    update_in_batches(
+        apps.get_model("tasks", "Task"),
+        {
+            "priority_rank": to_ranks("priority", PRIORITY_CHOICES, "medium"),
+            "status_rank": to_ranks("status", STATUS_CHOICES, "todo"),
+        },
+    )
+
+
+def decode(apps, schema_editor):
+    update_in_batches(
+        apps.get_model("tasks", "Task"),
+        {
+            "priority": to_values("priority_rank", PRIORITY_CHOICES),
+            "status": to_values("status_rank", STATUS_CHOICES),
+        },
+    )
+
+
+def create_index(apps, schema_editor):
+    # SQLite rebuilds the table to change its columns, either way, which
+    # drops the full-text index triggers
+    create_search_index(
+        schema_editor, "tasks_task", ["name", "description"], "owner_id"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, create_index),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_owner_priority_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_open_due_date_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=base.fields.RankedChoiceField(choices=PRIORITY_CHOICES, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='status_rank',
+            field=base.fields.RankedChoiceField(choices=STATUS_CHOICES, null=True),
+        ),
+        migrations.RunPython(encode, decode),
+        migrations.RemoveField(
+            model_name='task',
+            name='priority',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='task',
+            old_name='priority_rank',
+            new_name='priority',
+        ),
+        migrations.RenameField(
+            model_name='task',
+            old_name='status_rank',
+            new_name='status',
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=base.fields.RankedChoiceField(choices=PRIORITY_CHOICES, default='medium', help_text='Task priority level'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=base.fields.RankedChoiceField(choices=STATUS_CHOICES, default='todo', help_text='Current task status'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['owner', 'priority', 'created_at', 'id'], name='task_owner_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'is_active', 'status'], name='task_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True), models.Q(('status__in', ['completed', 'cancelled']), _negated=True)), fields=['due_date'], name='task_open_due_date_idx'),
+        ),
+        migrations.RunPython(create_index, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,52 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
-from base.models import TrackableModel
+from base.fields import RankedChoiceField
+from base.functions import DaysBetween
+from base.models import FieldTrackerMixin, SoftDeletableModel, TrackableModel
 from projects.models import Project
 
 
-class Task(TrackableModel):
+class TaskQuerySet(models.QuerySet):
+    """QuerySet for tasks with database-computed schedule fields"""
+
+    SCHEDULE_FIELDS = ("overdue", "days_left", "completion_label")
+
+    def with_schedule(self, today):
+        """
+        Annotate overdue, days_left and completion_label in SQL.
+
+        Mirrors Task.is_overdue(), Task.days_until_due() and
+        Task.get_completion_status() against a single "today".
+
+        Args:
+            today: The date to compute the schedule fields against
+        """
+        today = models.Value(today, output_field=models.DateField())
+        return self.annotate(
+            overdue=models.Case(
+                models.When(
+                    models.Q(due_date__lt=today)
+                    & ~models.Q(status__in=["completed", "cancelled"]),
+                    then=models.Value(True),
+                ),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+            days_left=DaysBetween("due_date", today),
+            completion_label=models.Case(
+                models.When(progress=0, then=models.Value("Not Started")),
+                models.When(progress__lte=25, then=models.Value("Just Started")),
+                models.When(progress__lte=50, then=models.Value("In Progress")),
+                models.When(progress__lte=75, then=models.Value("Almost Done")),
+                models.When(progress__lt=100, then=models.Value("Nearly Complete")),
+                default=models.Value("Completed"),
+                output_field=models.CharField(),
+            ),
+        )
+
+
+class Task(FieldTrackerMixin, SoftDeletableModel, TrackableModel):
     """Task model for managing individual tasks within projects"""
 
     PRIORITY_CHOICES = [
@@ -30,16 +72,23 @@ class Task(TrackableModel):
         related_name="tasks",
         help_text="Project this task belongs to",
     )
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="owned_tasks",
+        help_text="Owner of the task's project, copied here to filter without a join",
+    )
     start_date = models.DateField(null=True, blank=True, help_text="Task start date")
     due_date = models.DateField(null=True, blank=True, help_text="Task due date")
-    priority = models.CharField(
-        max_length=10,
+    priority = RankedChoiceField(
         choices=PRIORITY_CHOICES,
         default="medium",
         help_text="Task priority level",
     )
-    status = models.CharField(
-        max_length=15,
+    status = RankedChoiceField(
         choices=STATUS_CHOICES,
         default="todo",
         help_text="Current task status",
@@ -69,6 +118,17 @@ class Task(TrackableModel):
         default=True, help_text="Whether the task is active"
     )
 
+    # Fields that feed the project and category counters
+    tracked_fields = (
+        "project_id",
+        "is_active",
+        "status",
+        "estimated_hours",
+        "actual_hours",
+    )
+
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         """Meta options for Task model"""
 
@@ -76,6 +136,50 @@ class Task(TrackableModel):
         unique_together = ["name", "project", "created_by"]
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
+        indexes = [
+            # Task list of a user: owner + is_active, newest first
+            models.Index(
+                fields=["owner", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="task_owner_active_idx",
+            ),
+            # Task list of a project: project + is_active, newest first
+            models.Index(
+                fields=["project", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="task_project_active_idx",
+            ),
+            # Task list of a user ordered by due date
+            models.Index(
+                fields=["owner", "due_date", "id"],
+                condition=models.Q(is_active=True),
+                name="task_owner_due_idx",
+            ),
+            # Task list of a user ordered by priority rank
+            models.Index(
+                fields=["owner", "priority", "created_at", "id"],
+                condition=models.Q(is_active=True),
+                name="task_owner_priority_idx",
+            ),
+            # Counts and filters by project and status
+            models.Index(
+                fields=["project", "is_active", "status"],
+                name="task_project_status_idx",
+            ),
+            # Due date lookups for tasks that can still become overdue
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(is_active=True)
+                & ~models.Q(status__in=["completed", "cancelled"]),
+                name="task_open_due_date_idx",
+            ),
+            # Trashed tasks, for the purge
+            models.Index(
+                fields=["deleted_at"],
+                condition=models.Q(deleted_at__isnull=False),
+                name="task_trash_idx",
+            ),
+        ]
 
     def __str__(self):
         """String representation of the task"""
@@ -115,10 +219,36 @@ class Task(TrackableModel):
         else:
             return "Completed"
 
-    def save(self, *args, **kwargs):
-        """Override save to auto-update progress based on status"""
+    def apply_status_progress(self):
+        """Set progress to match a completed or cancelled status"""
         if self.status == "completed":
             self.progress = 100
         elif self.status == "cancelled":
             self.progress = 0
-        super().save(*args, **kwargs)
+
+    def project_moved(self):
+        """Check if the task is new or its project differs from the saved one"""
+        saved_values = self.get_saved_values()
+        return (
+            self._state.adding
+            or saved_values is None
+            or saved_values["project_id"] != self.project_id
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        Override save to auto-update progress based on status.
+
+        The owner is copied from the project when the task is created or
+        moved to another project. The save runs in a transaction together
+        with the project and category counter updates made by the
+        post_save receiver.
+        """
+        self.apply_status_progress()
+        if self.project_moved():
+            self.owner_id = self.project.created_by_id
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "owner" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "owner"]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
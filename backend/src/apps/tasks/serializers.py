@@ -1,11 +1,16 @@
 from rest_framework import serializers
-from .models import Task
+from base.serializers import FragmentCacheListSerializer, FragmentCacheMixin
+from .models import Task, TaskQuerySet
+from projects.models import Project
 from projects.serializers import ProjectSerializer
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(FragmentCacheMixin, serializers.ModelSerializer):
     """Serializer for Task model"""
 
+    # The schedule fields depend on today's date
+    fragment_daily = True
+
     project_details = ProjectSerializer(source="project", read_only=True)
     is_overdue = serializers.SerializerMethodField()
     days_until_due = serializers.SerializerMethodField()
@@ -15,6 +20,7 @@ class TaskSerializer(serializers.ModelSerializer):
         """Meta options for TaskSerializer"""
 
         model = Task
+        list_serializer_class = FragmentCacheListSerializer
         fields = [
             "id",
             "name",
@@ -44,16 +50,29 @@ class TaskSerializer(serializers.ModelSerializer):
             "completion_status",
         ]
 
+    def update(self, instance, validated_data):
+        """Update the instance and drop schedule annotations that are now stale"""
+        instance = super().update(instance, validated_data)
+        for field in TaskQuerySet.SCHEDULE_FIELDS:
+            instance.__dict__.pop(field, None)
+        return instance
+
     def get_is_overdue(self, obj):
-        """Get overdue status"""
+        """Get overdue status, preferring the SQL annotation"""
+        if hasattr(obj, "overdue"):
+            return obj.overdue
         return obj.is_overdue()
 
     def get_days_until_due(self, obj):
-        """Get days until due"""
+        """Get days until due, preferring the SQL annotation"""
+        if hasattr(obj, "days_left"):
+            return obj.days_left
         return obj.days_until_due()
 
     def get_completion_status(self, obj):
-        """Get completion status"""
+        """Get completion status, preferring the SQL annotation"""
+        if hasattr(obj, "completion_label"):
+            return obj.completion_label
         return obj.get_completion_status()
 
     def validate(self, data):
@@ -91,3 +110,29 @@ class TaskSerializer(serializers.ModelSerializer):
                     "You can only create tasks for your own projects"
                 )
         return value
+
+
+class PrefetchedProjectField(serializers.PrimaryKeyRelatedField):
+    """Project field resolved from the projects the bulk endpoints looked up"""
+
+    def to_internal_value(self, data):
+        """Find the project in context["projects"] instead of querying"""
+        try:
+            return self.context["projects"][int(data)]
+        except (KeyError, TypeError, ValueError):
+            self.fail("does_not_exist", pk_value=data)
+
+
+class TaskBulkSerializer(TaskSerializer):
+    """
+    Serializer for one item of a bulk task request.
+
+    Projects come from a single lookup of the user's projects shared by all
+    items, so that lookup is also the ownership check.
+    """
+
+    project = PrefetchedProjectField(queryset=Project.objects.none())
+
+    def validate_project(self, value):
+        """Ownership is enforced by the shared project lookup"""
+        return value
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from base.cache import bump_user_version
+from projects.counters import apply_task_change, recount_for_projects
+from .models import Task
+
+
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_owner_cache(sender, instance, **kwargs):
+    """Invalidate the owner's cached data when one of their tasks changes"""
+    bump_user_version(instance.owner_id)
+
+
+@receiver(post_save, sender=Task)
+def update_counters_on_save(sender, instance, created, raw, **kwargs):
+    """Apply the task's change to its project and category counters"""
+    if raw:
+        return
+    old_values = None if created else instance.get_saved_values()
+    if old_values is None and not created:
+        # Previous state unknown: recount the project from scratch
+        recount_for_projects([instance.project_id])
+    else:
+        apply_task_change(old_values, instance.get_current_values())
+    instance.remember_saved_values()
+
+
+@receiver(post_delete, sender=Task)
+def update_counters_on_delete(sender, instance, **kwargs):
+    """Remove the task's contribution from its project and category counters"""
+    old_values = instance.get_saved_values() or instance.get_current_values()
+    apply_task_change(old_values, None)
@@ -1,11 +1,22 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
 from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
+import csv
+import json
+import os
+import tempfile
+from base import cache as two_level
+from base.throttling import clear_throttles
 from projects.models import Project
 from categories.models import Category
 from .models import Task
@@ -176,6 +187,47 @@ class TaskModelTest(TestCase):
         self.assertEqual(self.task.progress, 0)
 
 
+class TaskScheduleAnnotationTest(TestCase):
+    """Test that SQL schedule annotations match the Task model methods"""
+
+    def setUp(self):
+        """Create tasks covering each schedule case"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.project = Project.objects.create(name="Project", created_by=self.user)
+        cases = [
+            (None, "todo", 0),
+            (date.today() - timedelta(days=3), "in_progress", 20),
+            (date.today() - timedelta(days=3), "completed", 100),
+            (date.today() - timedelta(days=3), "cancelled", 0),
+            (date.today(), "review", 50),
+            (date.today() + timedelta(days=5), "todo", 70),
+            (date.today() + timedelta(days=40), "todo", 90),
+        ]
+        for index, (due_date, task_status, progress) in enumerate(cases):
+            Task.objects.create(
+                name=f"Task {index}",
+                project=self.project,
+                due_date=due_date,
+                status=task_status,
+                progress=progress,
+                created_by=self.user,
+            )
+
+    def test_annotations_match_model_methods(self):
+        """Test overdue, days_left and completion_label against the methods"""
+        for task in Task.objects.with_schedule(date.today()):
+            self.assertEqual(task.overdue, task.is_overdue())
+            self.assertEqual(task.days_left, task.days_until_due())
+            self.assertEqual(task.completion_label, task.get_completion_status())
+
+    def test_annotations_can_filter(self):
+        """Test that the overdue annotation can be used in filters"""
+        overdue = Task.objects.with_schedule(date.today()).filter(overdue=True)
+        self.assertEqual(list(overdue.values_list("name", flat=True)), ["Task 1"])
+
+
 class TaskViewSetTest(APITestCase):
     """Test Task ViewSet API endpoints"""
 
@@ -282,15 +334,30 @@ class TaskViewSetTest(APITestCase):
         self.assertEqual(response.data["name"], "Updated Task")
         self.assertEqual(response.data["priority"], "urgent")
 
+    def test_update_task_refreshes_schedule_fields(self):
+        """Test that schedule fields reflect the update, not the old row"""
+        url = reverse("tasks:task-detail", args=[self.task.id])
+        data = {"due_date": date.today() - timedelta(days=2)}
+
+        response = self.client.patch(url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_overdue"])
+        self.assertEqual(response.data["days_until_due"], -2)
+
     def test_delete_task(self):
-        """Test deleting a task"""
+        """Test deleting a task moves it to the trash"""
         url = reverse("tasks:task-detail", args=[self.task.id])
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
-        # Task should be completely deleted
-        self.assertLess(Task.objects.filter(project__created_by=self.user).count(), 1)
+        # Task should be inactive and trashed, not deleted
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.is_active)
+        self.assertIsNotNone(self.task.deleted_at)
+        response = self.client.get(reverse("tasks:task-list"))
+        self.assertEqual(response.data["count"], 0)
 
     def test_create_task_validation(self):
         """Test task creation validation"""
@@ -400,3 +467,906 @@ class TaskUniqueConstraintTest(TestCase):
         final_count = Task.objects.filter(project=project1).count()
         self.assertEqual(final_count, initial_count)
         self.assertEqual(Task.objects.filter(project=project2).count(), 1)
+
+
+class TaskListQueryCountTest(APITestCase):
+    """Test that listing tasks runs a fixed number of queries"""
+
+    def setUp(self):
+        """Create test user with two categories and projects"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.projects = []
+        for index in range(2):
+            category = Category.objects.create(
+                name=f"Category {index}", created_by=self.user
+            )
+            self.projects.append(
+                Project.objects.create(
+                    name=f"Project {index}", category=category, created_by=self.user
+                )
+            )
+
+    def create_tasks(self, count):
+        """Create tasks spread across the test projects"""
+        start = Task.objects.count()
+        for index in range(start, start + count):
+            Task.objects.create(
+                name=f"Task {index}",
+                project=self.projects[index % len(self.projects)],
+                status="completed" if index % 3 == 0 else "todo",
+                created_by=self.user,
+            )
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        """Test that nested project counts are not queried per task"""
+        url = reverse("tasks:task-list")
+
+        self.create_tasks(4)
+        # count, page
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 4)
+
+        self.create_tasks(20)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_nested_counts_match_recount(self):
+        """Test that nested project and category counts match a recount"""
+        self.create_tasks(6)
+        url = reverse("tasks:task-list")
+        response = self.client.get(url)
+
+        for task in response.data["results"]:
+            project = Project.objects.with_task_counts().get(pk=task["project"])
+            category = Category.objects.with_counts().get(pk=project.category_id)
+            details = task["project_details"]
+            self.assertEqual(details["task_count"], project.num_tasks)
+            self.assertEqual(
+                details["completed_task_count"], project.num_completed_tasks
+            )
+            self.assertEqual(
+                details["category_details"]["task_count"], category.num_tasks
+            )
+            self.assertEqual(
+                details["category_details"]["project_count"], category.num_projects
+            )
+
+
+class TaskOwnerTest(APITestCase):
+    """Test that tasks carry their project's owner"""
+
+    def setUp(self):
+        """Create two users with a project each"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        self.project = Project.objects.create(name="Mine", created_by=self.user)
+        self.other_project = Project.objects.create(
+            name="Theirs", created_by=self.other_user
+        )
+        self.task = Task.objects.create(
+            name="Task", project=self.project, created_by=self.user
+        )
+
+    def test_owner_set_on_create(self):
+        """Test that a new task is owned by its project's owner"""
+        self.assertEqual(self.task.owner, self.user)
+
+    def test_owner_follows_project_move(self):
+        """Test that moving a task to another project updates its owner"""
+        task = Task.objects.get(pk=self.task.pk)
+        task.project = self.other_project
+        task.save(update_fields=["project"])
+
+        task.refresh_from_db()
+        self.assertEqual(task.owner, self.other_user)
+
+    def test_list_does_not_join_projects_to_filter(self):
+        """Test that the list count filters on the task table alone"""
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("tasks:task-list"))
+
+        self.assertEqual(response.data["count"], 1)
+        count_sql = queries.captured_queries[0]["sql"]
+        self.assertIn("COUNT", count_sql.upper())
+        self.assertNotIn("projects_project", count_sql)
+
+
+class TaskKeysetPaginationTest(APITestCase):
+    """Test the opt-in cursor pagination of the task list"""
+
+    def setUp(self):
+        """Create test user with 45 tasks, some sharing a creation time"""
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name="Project", created_by=self.user)
+        for index in range(45):
+            Task.objects.create(
+                name=f"Task {index}", project=self.project, created_by=self.user
+            )
+        # Ties on created_at must be broken by id
+        Task.objects.filter(pk__in=Task.objects.order_by("pk")[10:30]).update(
+            created_at=Task.objects.order_by("pk")[10].created_at
+        )
+        self.url = reverse("tasks:task-list") + "?pagination=cursor"
+
+    def expected_ids(self):
+        """IDs of the user's tasks in list order"""
+        return list(
+            Task.objects.filter(owner=self.user)
+            .order_by("-created_at", "-id")
+            .values_list("pk", flat=True)
+        )
+
+    def test_walks_every_task_once(self):
+        """Test that following next links returns each task once, in order"""
+        seen = []
+        url = self.url
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(task["id"] for task in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(seen, self.expected_ids())
+
+    def test_stable_under_inserts(self):
+        """Test that tasks created while paging do not shift later pages"""
+        first = self.client.get(self.url)
+        Task.objects.create(name="New", project=self.project, created_by=self.user)
+        second = self.client.get(first.data["next"])
+
+        expected = self.expected_ids()[1:]
+        ids = [task["id"] for task in first.data["results"]]
+        ids += [task["id"] for task in second.data["results"]]
+        self.assertEqual(ids, expected[:40])
+
+    def test_previous_link_returns_previous_page(self):
+        """Test that the previous link of a page leads back to the page before it"""
+        first = self.client.get(self.url)
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(first.data["previous"])
+
+    def test_deep_page_is_single_query(self):
+        """Test that a page is fetched without a count or an offset"""
+        first = self.client.get(self.url)
+        second = self.client.get(first.data["next"])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(second.data["next"])
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("OFFSET", queries.captured_queries[0]["sql"].upper())
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected"""
+        response = self.client.get(self.url + "&cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_ordering_rejected(self):
+        """Test that an ordering the cursor cannot follow is rejected"""
+        response = self.client.get(self.url + "&ordering=due_date")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ordering", response.data)
+        response = self.client.get(self.url + "&ordering=-created_at")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TaskCountFreePaginationTest(APITestCase):
+    """Test the count-free and estimated-count pagination modes"""
+
+    def setUp(self):
+        """Create test user with 25 tasks"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name="Project", created_by=self.user)
+        for index in range(25):
+            Task.objects.create(
+                name=f"Task {index}", project=self.project, created_by=self.user
+            )
+        self.url = reverse("tasks:task-list")
+
+    def test_nocount_skips_count(self):
+        """Test that a page is fetched with a single query and no total"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + "?pagination=nocount")
+
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(response.data["has_next"])
+        self.assertNotIn("count", response.data)
+        self.assertNotIn("approximate_count", response.data)
+        self.assertEqual(len(response.data["results"]), 20)
+
+        last = self.client.get(response.data["next"])
+        self.assertFalse(last.data["has_next"])
+        self.assertIsNone(last.data["next"])
+        self.assertEqual(len(last.data["results"]), 5)
+
+    def test_nocount_page_past_end(self):
+        """Test that a page beyond the last one is not found"""
+        response = self.client.get(self.url + "?pagination=nocount&page=3")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_estimate_reuses_cached_count(self):
+        """Test that the approximate total is counted once until a write"""
+        url = self.url + "?pagination=estimate"
+        response = self.client.get(url)
+        self.assertEqual(response.data["approximate_count"], 25)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data["approximate_count"], 25)
+
+        Task.objects.create(name="New", project=self.project, created_by=self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.data["approximate_count"], 26)
+
+
+class TaskBulkTest(APITestCase):
+    """Test the bulk create, update and delete endpoints"""
+
+    def setUp(self):
+        """Create test user with two projects and another user's project"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name="Work", created_by=self.user)
+        self.project = Project.objects.create(
+            name="Project", category=self.category, created_by=self.user
+        )
+        self.second_project = Project.objects.create(
+            name="Second", category=self.category, created_by=self.user
+        )
+        self.other_project = Project.objects.create(
+            name="Theirs", created_by=self.other_user
+        )
+        self.url = reverse("tasks:task-bulk")
+
+    def assertCountersMatchRecount(self):
+        """Assert that the stored counters equal a recount"""
+        for project in Project.objects.with_task_counts():
+            self.assertEqual(project.task_count, project.num_tasks)
+            self.assertEqual(project.completed_task_count, project.num_completed_tasks)
+            self.assertEqual(project.estimated_hours_total, project.sum_estimated_hours)
+        category = Category.objects.with_counts().get(pk=self.category.pk)
+        self.assertEqual(category.task_count, category.num_tasks)
+        self.assertEqual(category.completed_task_count, category.num_completed_tasks)
+
+    def test_bulk_create(self):
+        """Test that valid items are created and invalid ones reported"""
+        Task.objects.create(name="Taken", project=self.project, created_by=self.user)
+        items = [
+            {"name": f"Task {index}", "project": self.project.id} for index in range(50)
+        ]
+        items += [
+            {"name": "Done", "project": self.second_project.id, "status": "completed"},
+            {"name": "Theirs", "project": self.other_project.id},
+            {"name": "Taken", "project": self.project.id},
+            {"name": "Task 0", "project": self.project.id},
+            {"project": self.project.id},
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLess(len(queries), 20)
+        self.assertEqual(response.data["succeeded"], 51)
+        self.assertEqual(response.data["failed"], 4)
+        results = response.data["results"]
+        self.assertEqual(results[0]["status"], "created")
+        self.assertEqual(results[0]["data"]["name"], "Task 0")
+        self.assertEqual(results[50]["data"]["progress"], 100)
+        self.assertIn("project", results[51]["errors"])
+        self.assertIn("name", results[52]["errors"])
+        self.assertIn("name", results[53]["errors"])
+        self.assertIn("name", results[54]["errors"])
+
+        done = Task.objects.get(name="Done")
+        self.assertEqual(done.owner, self.user)
+        self.assertEqual(done.created_by, self.user)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 52)
+        self.assertCountersMatchRecount()
+
+    def test_bulk_update(self):
+        """Test that partial updates are applied with the status rule"""
+        tasks = [
+            Task.objects.create(
+                name=f"Task {index}", project=self.project, created_by=self.user
+            )
+            for index in range(3)
+        ]
+        other_task = Task.objects.create(
+            name="Theirs", project=self.other_project, created_by=self.other_user
+        )
+        items = [
+            {"id": tasks[0].id, "status": "completed", "estimated_hours": "2.50"},
+            {"id": tasks[1].id, "project": self.second_project.id},
+            {"id": tasks[2].id, "name": "Task 0"},
+            {"id": other_task.id, "name": "Mine now"},
+        ]
+
+        response = self.client.patch(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["succeeded"], 2)
+        results = response.data["results"]
+        self.assertEqual(results[0]["data"]["progress"], 100)
+        self.assertEqual(results[1]["data"]["project"], self.second_project.id)
+        self.assertIn("name", results[2]["errors"])
+        self.assertIn("id", results[3]["errors"])
+
+        tasks[0].refresh_from_db()
+        self.assertEqual(tasks[0].progress, 100)
+        self.assertEqual(tasks[0].estimated_hours, Decimal("2.50"))
+        self.assertEqual(tasks[0].updated_by, self.user)
+        other_task.refresh_from_db()
+        self.assertEqual(other_task.name, "Theirs")
+        self.assertCountersMatchRecount()
+
+    def test_bulk_update_swaps_names(self):
+        """Test that tasks can swap names, and a rejected rename keeps its name"""
+        first, second, third = (
+            Task.objects.create(name=name, project=self.project, created_by=self.user)
+            for name in ("A", "B", "C")
+        )
+        items = [{"id": first.id, "name": "B"}, {"id": second.id, "name": "A"}]
+
+        response = self.client.patch(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["succeeded"], 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.name, second.name), ("B", "A"))
+
+        # "C" is taken, so the second task stays "A" and the first cannot take it
+        items = [{"id": first.id, "name": "A"}, {"id": second.id, "name": "C"}]
+        response = self.client.patch(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["failed"], 2)
+        self.assertEqual(
+            sorted(Task.objects.values_list("name", flat=True)), ["A", "B", "C"]
+        )
+
+    def test_bulk_delete(self):
+        """Test that the user's tasks are trashed and counters recounted"""
+        tasks = [
+            Task.objects.create(
+                name=f"Task {index}",
+                project=self.project,
+                status="completed",
+                created_by=self.user,
+            )
+            for index in range(3)
+        ]
+        other_task = Task.objects.create(
+            name="Theirs", project=self.other_project, created_by=self.other_user
+        )
+        ids = [tasks[0].id, tasks[1].id, other_task.id]
+
+        response = self.client.delete(self.url, ids, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["succeeded"], 2)
+        self.assertEqual(response.data["results"][2]["status"], "error")
+        self.assertEqual(
+            Task.objects.filter(owner=self.user, is_active=True).count(), 1
+        )
+        self.assertTrue(Task.objects.get(pk=other_task.pk).is_active)
+        self.assertIsNotNone(Task.objects.get(pk=tasks[0].pk).deleted_at)
+        self.assertCountersMatchRecount()
+
+    def test_rejects_oversized_and_malformed_requests(self):
+        """Test that the body must be a list of at most TASK_BULK_MAX_ITEMS items"""
+        with self.settings(TASK_BULK_MAX_ITEMS=2):
+            items = [
+                {"name": f"Task {index}", "project": self.project.id}
+                for index in range(3)
+            ]
+            response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {"name": "Task"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.exists())
+
+
+class TaskSearchTest(APITestCase):
+    """Test the full-text task search"""
+
+    def setUp(self):
+        """Create two users with a project and some tasks each"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        self.project = Project.objects.create(name="Mine", created_by=self.user)
+        other_project = Project.objects.create(
+            name="Theirs", created_by=self.other_user
+        )
+        self.report = Task.objects.create(
+            name="Quarterly report",
+            description="Numbers for the report",
+            project=self.project,
+            created_by=self.user,
+        )
+        self.draft = Task.objects.create(
+            name="Draft slides",
+            description="Summary of the quarterly reports",
+            project=self.project,
+            created_by=self.user,
+        )
+        Task.objects.create(name="Buy milk", project=self.project, created_by=self.user)
+        Task.objects.create(
+            name="Quarterly report", project=other_project, created_by=self.other_user
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("tasks:task-search")
+
+    def search(self, query):
+        """Return the names of the tasks found for a query"""
+        response = self.client.get(self.url, {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["name"] for task in response.data["results"]]
+
+    def test_search_ranks_users_matches(self):
+        """Test that only the user's matching tasks are found, best first"""
+        self.assertEqual(self.search("report"), ["Quarterly report", "Draft slides"])
+        self.assertEqual(
+            self.search("quarterly REPORTS"), ["Quarterly report", "Draft slides"]
+        )
+        self.assertEqual(self.search("report milk"), [])
+
+    def test_index_follows_writes(self):
+        """Test that saves, updates, bulk inserts and trashing reach the index"""
+        self.draft.name = "Slides for the board"
+        self.draft.description = ""
+        self.draft.save()
+        Task.objects.filter(pk=self.report.pk).update(name="Annual review")
+        Task.objects.bulk_create(
+            [
+                Task(
+                    name="Review notes",
+                    project=self.project,
+                    created_by=self.user,
+                    owner=self.user,
+                )
+            ]
+        )
+
+        self.assertEqual(self.search("report"), ["Annual review"])
+        self.assertEqual(self.search("board"), ["Slides for the board"])
+        self.assertCountEqual(self.search("review"), ["Annual review", "Review notes"])
+
+        self.client.delete(reverse("tasks:task-detail", args=[self.report.pk]))
+        self.assertEqual(self.search("review"), ["Review notes"])
+
+    def test_query_syntax_is_ignored(self):
+        """Test that search operators and punctuation are treated as plain words"""
+        self.assertEqual(self.search('"report" OR (milk'), [])
+        self.assertEqual(self.search("report*"), ["Quarterly report", "Draft slides"])
+
+    def test_search_requires_query(self):
+        """Test that a query without words is rejected"""
+        response = self.client.get(self.url, {"q": " ?! "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskFilterTest(APITestCase):
+    """Test filtering and ordering of the task list"""
+
+    def setUp(self):
+        """Create tasks with different statuses, priorities and due dates"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        work = Category.objects.create(name="Work", created_by=self.user)
+        home = Category.objects.create(name="Home", created_by=self.user)
+        work_project = Project.objects.create(
+            name="Work project", category=work, created_by=self.user
+        )
+        home_project = Project.objects.create(
+            name="Home project", category=home, created_by=self.user
+        )
+        today = date.today()
+        rows = [
+            ("late", work_project, "todo", "low", today - timedelta(days=2), "2.00"),
+            (
+                "done late",
+                work_project,
+                "completed",
+                "urgent",
+                today - timedelta(days=5),
+                None,
+            ),
+            ("soon", home_project, "review", "urgent", today + timedelta(days=1), None),
+            (
+                "later",
+                home_project,
+                "in_progress",
+                "medium",
+                today + timedelta(days=9),
+                "5.00",
+            ),
+            ("someday", work_project, "todo", "high", None, None),
+        ]
+        for name, project, task_status, priority, due_date, estimate in rows:
+            Task.objects.create(
+                name=name,
+                project=project,
+                status=task_status,
+                priority=priority,
+                due_date=due_date,
+                estimated_hours=estimate and Decimal(estimate),
+                created_by=self.user,
+            )
+        self.work = work
+        self.url = reverse("tasks:task-list")
+
+    def names(self, **params):
+        """Return the names of the listed tasks in order"""
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["name"] for task in response.data["results"]]
+
+    def test_filters(self):
+        """Test each filter on its own"""
+        today = date.today()
+        self.assertCountEqual(
+            self.names(status__in="todo,review"), ["late", "soon", "someday"]
+        )
+        self.assertCountEqual(self.names(priority__in="urgent"), ["done late", "soon"])
+        self.assertCountEqual(
+            self.names(
+                due_date__gte=today.isoformat(),
+                due_date__lte=(today + timedelta(days=5)).isoformat(),
+            ),
+            ["soon"],
+        )
+        self.assertEqual(self.names(overdue="true"), ["late"])
+        self.assertCountEqual(
+            self.names(overdue="false"), ["done late", "soon", "later", "someday"]
+        )
+        self.assertCountEqual(
+            self.names(category=self.work.pk), ["late", "done late", "someday"]
+        )
+        self.assertCountEqual(self.names(has_estimate="true"), ["late", "later"])
+        self.assertEqual(
+            self.names(has_estimate="false", status__in="todo"), ["someday"]
+        )
+
+    def test_ordering(self):
+        """Test that priority sorts by rank and other orderings by value"""
+        self.assertEqual(
+            self.names(ordering="-priority"),
+            ["soon", "done late", "someday", "later", "late"],
+        )
+        self.assertEqual(
+            self.names(
+                ordering="-due_date",
+                due_date__gte=(date.today() - timedelta(days=10)).isoformat(),
+            ),
+            ["later", "soon", "late", "done late"],
+        )
+        self.assertEqual(self.names(ordering="created_at")[:2], ["late", "done late"])
+
+    def test_invalid_parameters_rejected(self):
+        """Test that invalid values and unindexed orderings return 400"""
+        for params in (
+            {"status__in": "todo,sleeping"},
+            {"due_date__gte": "tomorrow"},
+            {"overdue": "maybe"},
+            {"category": "work"},
+            {"ordering": "name"},
+            {"ordering": "-progress"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(params)), response.data)
+
+
+class TaskRankedChoiceTest(APITestCase):
+    """Test that priority and status are stored as ranks and read as names"""
+
+    def setUp(self):
+        """Create a task through the API"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name="Project", created_by=self.user)
+        response = self.client.post(
+            reverse("tasks:task-list"),
+            {
+                "name": "Ranked",
+                "project": self.project.pk,
+                "priority": "urgent",
+                "status": "review",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["priority"], "urgent")
+        self.assertEqual(response.data["status"], "review")
+        self.task = Task.objects.get(pk=response.data["id"])
+
+    def test_stored_as_ranks(self):
+        """Test that the columns hold the position of the choice"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT priority, status FROM tasks_task WHERE id = %s",
+                [self.task.pk],
+            )
+            self.assertEqual(cursor.fetchone(), (3, 2))
+        self.assertEqual(self.task.priority, "urgent")
+        self.assertEqual(self.task.status, "review")
+        self.assertEqual(Task.objects.filter(priority__in=["urgent"]).count(), 1)
+
+    def test_invalid_values_rejected(self):
+        """Test that unknown names are rejected by the API and the ORM"""
+        response = self.client.patch(
+            reverse("tasks:task-detail", kwargs={"pk": self.task.pk}),
+            {"priority": "critical"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("priority", response.data)
+        with self.assertRaises(ValueError):
+            Task.objects.filter(status="sleeping").count()
+
+
+class TaskExportTest(APITestCase):
+    """Test the streamed task export"""
+
+    def setUp(self):
+        """Create tasks of two users"""
+        cache.clear()
+        clear_throttles()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        other = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        project = Project.objects.create(name="Project", created_by=self.user)
+        for index in range(3):
+            Task.objects.create(
+                name=f"Task {index}",
+                description="Line one\nline, two",
+                project=project,
+                priority="urgent" if index == 1 else "low",
+                due_date=date(2030, 1, index + 1),
+                estimated_hours=Decimal("1.50"),
+                created_by=self.user,
+            )
+        Task.objects.create(
+            name="Other",
+            project=Project.objects.create(name="Other", created_by=other),
+            created_by=other,
+        )
+        self.url = reverse("tasks:task-export")
+
+    def get_content(self, **params):
+        """Return the streamed response and its decoded body"""
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv(self):
+        """Test that the CSV export has a header and one row per own task"""
+        response, content = self.get_content(ordering="due_date")
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertIn('filename="tasks.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual([row["name"] for row in rows], ["Task 0", "Task 1", "Task 2"])
+        self.assertEqual(rows[0]["description"], "Line one\nline, two")
+        self.assertEqual(rows[0]["project__name"], "Project")
+        self.assertEqual(rows[0]["due_date"], "2030-01-01")
+        self.assertEqual(rows[0]["start_date"], "")
+        self.assertEqual(rows[1]["priority"], "urgent")
+
+    def test_ndjson_with_filters(self):
+        """Test that the NDJSON export applies the list filters"""
+        response, content = self.get_content(format="ndjson", priority__in="urgent")
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["name"], "Task 1")
+        self.assertEqual(rows[0]["status"], "todo")
+        self.assertEqual(rows[0]["estimated_hours"], "1.50")
+
+    def test_invalid_filter_rejected(self):
+        """Test that an invalid filter returns 400 instead of an export"""
+        response = self.client.get(self.url, {"status__in": "sleeping"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskImportTest(APITestCase):
+    """Test importing tasks from CSV and NDJSON files"""
+
+    def setUp(self):
+        """Create a user with two projects and a task"""
+        cache.clear()
+        clear_throttles()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        other = User.objects.create_user(
+            email="other@example.com", username="otheruser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.work = Project.objects.create(name="Work", created_by=self.user)
+        self.home = Project.objects.create(name="Home", created_by=self.user)
+        self.foreign = Project.objects.create(name="Foreign", created_by=other)
+        Task.objects.create(name="Existing", project=self.work, created_by=self.user)
+        self.url = reverse("tasks:task-import")
+
+    def upload(self, name, content, **data):
+        """Post a file to the import endpoint"""
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(self.url, {"file": upload, **data})
+
+    def test_csv_rows_imported_and_errors_reported(self):
+        """Test that valid rows are created and invalid rows reported"""
+        content = (
+            "name,project_id,project__name,status,estimated_hours,due_date\n"
+            f"Write report,{self.work.pk},,completed,2.5,2030-01-01\n"
+            ",,Home,todo,,\n"
+            "Water plants,,Home,,,\n"
+            "Sleep,,Home,sleeping,,\n"
+            f"Steal,{self.foreign.pk},,,,\n"
+            "Lost,,Nowhere,,,\n"
+            f"Existing,{self.work.pk},,,,\n"
+            "Water plants,,Home,,,\n"
+        )
+        response = self.upload("tasks.csv", content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 6)
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [2, 4, 5, 6, 7, 8])
+        self.assertIn("name", errors[2])
+        self.assertIn("status", errors[4])
+        self.assertIn("project", errors[5])
+        self.assertIn("project__name", errors[6])
+        self.assertIn("name", errors[7])
+        self.assertIn("name", errors[8])
+
+        report = Task.objects.get(name="Write report")
+        self.assertEqual(report.owner, self.user)
+        self.assertEqual(report.progress, 100)
+        self.assertEqual(report.estimated_hours, Decimal("2.50"))
+        self.assertEqual(Task.objects.get(name="Water plants").project, self.home)
+        self.work.refresh_from_db()
+        self.assertEqual(self.work.task_count, 2)
+        self.assertEqual(self.work.completed_task_count, 1)
+
+    def test_ndjson_in_batches(self):
+        """Test NDJSON import across batches, with a line that is not JSON"""
+        lines = [
+            json.dumps({"name": f"Task {index}", "project": self.home.pk})
+            for index in range(5)
+        ]
+        lines.insert(2, "not json")
+        with self.settings(TASK_IMPORT_BATCH_SIZE=2):
+            response = self.upload("tasks.txt", "\n".join(lines), format="ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(response.data["errors"][0]["row"], 3)
+        self.home.refresh_from_db()
+        self.assertEqual(self.home.task_count, 5)
+
+    def test_missing_file_or_format_rejected(self):
+        """Test that a request without a file or a known format returns 400"""
+        response = self.client.post(self.url, {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.upload("tasks.xlsx", "name\nTask\n")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.filter(name="Task").exists())
+
+    def test_command(self):
+        """Test that the import_tasks command imports a file"""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("name,project__name\nFrom command,Work\nBroken,\n")
+        self.addCleanup(os.remove, file.name)
+        out, err = StringIO(), StringIO()
+        call_command("import_tasks", self.user.email, file.name, stdout=out, stderr=err)
+        self.assertIn("Tasks imported: 1, rejected: 1", out.getvalue())
+        self.assertIn("Row 2", err.getvalue())
+        self.assertTrue(Task.objects.filter(name="From command").exists())
+
+
+class BenchmarkTaskListCommandTest(TestCase):
+    """Test the list benchmark command on a tiny dataset"""
+
+    def test_benchmark_reports_and_rolls_back(self):
+        """Test that the benchmark prints timings and leaves no data behind"""
+        out = StringIO()
+        call_command("benchmark_task_list", tasks=50, users=2, repeat=1, stdout=out)
+
+        self.assertIn("tasks page 1", out.getvalue())
+        self.assertIn("tasks search", out.getvalue())
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(User.objects.filter(email__startswith="bench-").exists())
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=86400)
+class TaskFragmentCacheTest(APITestCase):
+    """Test that task lists reuse the cached representation of each task"""
+
+    def setUp(self):
+        """Create a user with a task and authenticate"""
+        cache.clear()
+        two_level.clear_local()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name="Project", created_by=self.user)
+        self.task = Task.objects.create(
+            name="Task", project=self.project, created_by=self.user
+        )
+        self.url = reverse("tasks:task-list")
+
+    def get_names(self):
+        """List the tasks and return their names by ID"""
+        response = self.client.get(self.url)
+        return {task["id"]: task["name"] for task in response.data["results"]}
+
+    def test_fragment_reused_until_saved(self):
+        """Test that a task is serialized again only once it is saved"""
+        self.get_names()
+        # Writes that bypass updated_at keep the cached fragment
+        Task.objects.filter(pk=self.task.pk).update(name="Renamed")
+        self.assertEqual(self.get_names(), {self.task.pk: "Task"})
+        self.task.refresh_from_db()
+        self.task.save()
+        self.assertEqual(self.get_names(), {self.task.pk: "Renamed"})
+        with self.settings(FRAGMENT_CACHE_TIMEOUT=0):
+            Task.objects.filter(pk=self.task.pk).update(name="Uncached")
+            self.assertEqual(self.get_names(), {self.task.pk: "Uncached"})
+
+    def test_nested_counters_refreshed(self):
+        """Test that a project's counter change reaches its cached tasks"""
+        self.client.get(self.url)
+        Task.objects.create(name="Second", project=self.project, created_by=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [
+                task["project_details"]["task_count"]
+                for task in response.data["results"]
+            ],
+            [2, 2],
+        )
@@ -1,27 +1,77 @@
-from django.shortcuts import render
-from rest_framework import viewsets
+import io
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from base.pagination import (
+    EstimatedCountPagination,
+    KeysetPagination,
+    NoCountPagination,
+)
+from base.renderers import CSVRenderer, NDJSONRenderer
+from base.views import PaginationModeMixin, SearchMixin, TrashMixin
+from . import bulk, imports
+from .filters import TaskFilterBackend, TaskOrderingFilter
 from .models import Task
 from .serializers import TaskSerializer
+from categories.models import Category
+from projects import trash
 from projects.models import Project
 
 
-# Create your views here.
-
-
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(TrashMixin, SearchMixin, PaginationModeMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing tasks.
     """
 
     permission_classes = (IsAuthenticated,)
+    pagination_modes = {
+        "cursor": KeysetPagination,
+        "nocount": NoCountPagination,
+        "estimate": EstimatedCountPagination,
+    }
     serializer_class = TaskSerializer
+    filter_backends = (TaskFilterBackend, TaskOrderingFilter)
+    search_fields = ("name", "description")
+    search_scope_field = "owner_id"
+    # Set to "heavy" by expensive actions, see base.throttling
+    throttle_scope = None
+    export_fields = (
+        "id",
+        "name",
+        "description",
+        "project_id",
+        "project__name",
+        "status",
+        "priority",
+        "progress",
+        "start_date",
+        "due_date",
+        "estimated_hours",
+        "actual_hours",
+        "created_at",
+        "updated_at",
+    )
 
     def get_queryset(self):
         """Return tasks for the authenticated user's projects"""
-        queryset = Task.objects.filter(
-            project__created_by=self.request.user, is_active=True
-        ).select_related("project", "created_by", "updated_by")
+        queryset = (
+            Task.objects.filter(owner=self.request.user, is_active=True)
+            .with_schedule(timezone.now().date())
+            .select_related(
+                "project",
+                "project__category",
+                "project__created_by",
+                "project__updated_by",
+                "created_by",
+                "updated_by",
+            )
+        )
 
         # Filter by specific project if provided
         project_id = self.request.query_params.get("project")
@@ -48,8 +98,194 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Set created_by and updated_by automatically"""
-        serializer.save(created_by=self.request.user, updated_by=self.request.user)
+        task = serializer.save(
+            created_by=self.request.user, updated_by=self.request.user
+        )
+        self.refresh_project_counters(task)
 
     def perform_update(self, serializer):
         """Set updated_by automatically"""
-        serializer.save(updated_by=self.request.user)
+        task = serializer.save(updated_by=self.request.user)
+        self.refresh_project_counters(task)
+
+    def refresh_project_counters(self, task):
+        """Reload the counters the save changed, for the nested project response"""
+        task.project.refresh_from_db(fields=Project.counter_fields)
+        if task.project.category_id:
+            task.project.category.refresh_from_db(fields=Category.counter_fields)
+
+    def get_inactive_queryset(self):
+        """Get inactive tasks of the user's projects"""
+        return Task.objects.filter(
+            owner=self.request.user, is_active=False
+        ).select_related(
+            "project",
+            "project__category",
+            "project__created_by",
+            "project__updated_by",
+            "created_by",
+            "updated_by",
+        )
+
+    def trash_object(self, instance):
+        """Move the task to the trash"""
+        trash.trash_task(instance, self.request.user)
+
+    def get_restore_error(self, instance):
+        """Tasks of a trashed project come back with the project"""
+        if not instance.project.is_active:
+            return "Restore the task's project first"
+        return None
+
+    def restore_object(self, instance):
+        """Restore the task"""
+        trash.restore_task(instance, self.request.user)
+        self.refresh_project_counters(instance)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=(CSVRenderer, NDJSONRenderer),
+        pagination_class=None,
+        throttle_scope="heavy",
+    )
+    def export(self, request):
+        """
+        Stream all of the user's tasks as ?format=csv (default) or ndjson.
+
+        Takes the same filters and ordering as the list. Rows are read as
+        plain values through a server-side cursor, TASK_EXPORT_CHUNK_SIZE at
+        a time, and written out as they arrive, so memory use does not grow
+        with the number of tasks.
+        """
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values_list(*self.export_fields)
+            .iterator(chunk_size=settings.TASK_EXPORT_CHUNK_SIZE)
+        )
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(rows, self.export_fields),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{renderer.format}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        parser_classes=(MultiPartParser,),
+        throttle_scope="heavy",
+    )
+    def import_file(self, request):
+        """
+        Create tasks from an uploaded CSV or NDJSON file.
+
+        The file is sent as the multipart field "file"; its format is taken
+        from the "format" field or the file extension. Rows are imported in
+        batches and invalid rows are skipped and reported, see tasks.imports.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"message": "Upload the file in the field file"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = request.data.get("format") or imports.guess_format(upload.name)
+        if file_format not in imports.FORMATS:
+            return Response(
+                {"message": f"format must be one of: {', '.join(imports.FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        result = imports.import_tasks(
+            request.user, stream, file_format, context=self.get_serializer_context()
+        )
+        return Response(result.as_dict())
+
+    @action(detail=False, methods=["post"], url_path="bulk", url_name="bulk")
+    def bulk_create(self, request):
+        """Create a list of tasks in one request"""
+        items, error = self.get_bulk_items(request)
+        if error:
+            return error
+        outcomes = bulk.create_tasks(request.user, items, self.get_serializer_context())
+        return self.get_bulk_response(outcomes, "created")
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Partially update a list of tasks, each identified by its "id" """
+        items, error = self.get_bulk_items(request)
+        if error:
+            return error
+        outcomes = bulk.update_tasks(request.user, items, self.get_serializer_context())
+        return self.get_bulk_response(outcomes, "updated")
+
+    @bulk_create.mapping.delete
+    def bulk_delete(self, request):
+        """Delete a list of tasks given by ID"""
+        ids, error = self.get_bulk_items(request)
+        if error:
+            return error
+        outcomes = bulk.delete_tasks(request.user, ids)
+        return Response(
+            self.summarize_bulk_results(
+                [
+                    {"id": pk, "status": "deleted"} if pk else error_result(errors)
+                    for pk, errors in outcomes
+                ]
+            )
+        )
+
+    def get_bulk_items(self, request):
+        """
+        Get the list of items of a bulk request.
+
+        Returns:
+            tuple: (items, None), or (None, error response) if the body is
+            not a non-empty list of at most TASK_BULK_MAX_ITEMS items
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            message = "Expected a non-empty list of items"
+        elif len(items) > settings.TASK_BULK_MAX_ITEMS:
+            message = f"At most {settings.TASK_BULK_MAX_ITEMS} items are allowed"
+        else:
+            return items, None
+        return None, Response({"message": message}, status=status.HTTP_400_BAD_REQUEST)
+
+    def get_bulk_response(self, outcomes, label):
+        """Serialize the written tasks, reloaded in one query, next to the errors"""
+        written = self.get_queryset().in_bulk(
+            [task.pk for task, errors in outcomes if task]
+        )
+        data = dict(
+            zip(written, self.get_serializer(list(written.values()), many=True).data)
+        )
+        results = [
+            (
+                {"id": task.pk, "status": label, "data": data.get(task.pk)}
+                if task
+                else error_result(errors)
+            )
+            for task, errors in outcomes
+        ]
+        return Response(self.summarize_bulk_results(results))
+
+    def summarize_bulk_results(self, results):
+        """Wrap per-item results with success and error counts"""
+        failed = sum(1 for result in results if result["status"] == "error")
+        return {
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        }
+
+
+def error_result(errors):
+    """Per-item result of a bulk item that was not written"""
+    return {"status": "error", "errors": errors}
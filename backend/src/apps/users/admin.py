@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from .models import AccountDeletion, RevokedToken, User
 
 
 @admin.register(User)
@@ -60,3 +60,37 @@ class CustomUserAdmin(UserAdmin):
             },
         ),
     )
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    """
+    Shows queued account deletions and how far the background job has got.
+    """
+
+    list_display = ("email", "status", "step", "rows_processed", "requested_at")
+    list_filter = ("status",)
+    search_fields = ("email",)
+    readonly_fields = (
+        "user",
+        "email",
+        "status",
+        "step",
+        "rows_processed",
+        "error",
+        "requested_at",
+        "started_at",
+        "claimed_at",
+        "finished_at",
+    )
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    """
+    Lists revoked tokens until compact_revoked_tokens deletes them.
+    """
+
+    list_display = ("jti", "revoked_at", "expires_at")
+    search_fields = ("jti",)
+    readonly_fields = ("jti", "revoked_at", "expires_at")
@@ -1,5 +1,20 @@
+import time
+
+from django.conf import settings
+from rest_framework.authentication import (
+    BaseAuthentication,
+    SessionAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# Imported by its app path, not relative to this module: the settings load
+# this module as apps.users.authentications, and a relative import would
+# give it a second cache the user signals never clear
+from users import revocation, user_cache
 
 
 class CookieJWTAuthentication(JWTAuthentication):
@@ -8,6 +23,10 @@ class CookieJWTAuthentication(JWTAuthentication):
 
     This provides better security by preventing XSS attacks from accessing
     the token through JavaScript.
+
+    The token's user is served from a short-lived in-process cache (see
+    users.user_cache) and revoked tokens are refused from an in-process set
+    (see users.revocation), so most requests authenticate without a query.
     """
 
     def authenticate(self, request):
@@ -31,8 +50,131 @@ class CookieJWTAuthentication(JWTAuthentication):
             validated_token = self.get_validated_token(token)
         except AuthenticationFailed as e:
             raise AuthenticationFailed(f"Token validation failed:{str(e)}")
+        if revocation.is_revoked(validated_token.get(api_settings.JTI_CLAIM)):
+            raise AuthenticationFailed("Token validation failed:Token has been revoked")
         try:
             user = self.get_user(validated_token)
             return user, validated_token
         except AuthenticationFailed as e:
             raise AuthenticationFailed(f"Error retrieving user: {str(e)}")
+
+    def get_user(self, validated_token):
+        """
+        Get the token's user from the cache, loading it on a miss.
+
+        Users are only cached once they passed the active check. Tokens tied
+        to the password hash (CHECK_REVOKE_TOKEN) are always checked
+        against the stored user.
+
+        Args:
+            validated_token: The validated access token
+
+        Returns:
+            User: The authenticated user
+        """
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        return user_cache.get_user(
+            user_id,
+            lambda: super(CookieJWTAuthentication, self).get_user(validated_token),
+        )
+
+
+class CookieJWTStatelessAuthentication(CookieJWTAuthentication):
+    """
+    Cookie JWT authentication that builds the user from the token alone.
+
+    request.user is a TokenUser carrying the token's user ID, so no user is
+    loaded at all. Meant for read-only views that only need
+    request.user.pk; a deactivated user keeps access to them until their
+    access token expires.
+    """
+
+    def get_user(self, validated_token):
+        """
+        Get a user backed by the token's claims.
+
+        Args:
+            validated_token: The validated access token
+
+        Returns:
+            TokenUser: The token's user, without a database lookup
+
+        Raises:
+            InvalidToken: If the token has no user ID claim
+        """
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+
+class DispatchingAuthentication(BaseAuthentication):
+    """
+    Runs only the authenticator matching the credentials a request carries.
+
+    Trying every configured class in turn would look up the session of a
+    request that authenticates with a JWT cookie. Instead the request is
+    looked at once and handed to a single authenticator, by precedence:
+
+        access_token cookie: CookieJWTAuthentication
+        Authorization: Token header: TokenAuthentication
+        session cookie: SessionAuthentication, with its CSRF check
+
+    Requests with none of these are anonymous. The chosen authenticator and
+    the time it took are stored on the request as authentication_timing and
+    reported in the Server-Timing header (see users.middleware).
+    """
+
+    def __init__(self):
+        self.authenticators = {
+            "cookie_jwt": CookieJWTAuthentication(),
+            "token": TokenAuthentication(),
+            "session": SessionAuthentication(),
+        }
+
+    def get_authenticator_name(self, request):
+        """
+        Pick the authenticator for the credentials of a request.
+
+        Returns:
+            str: Key of the authenticator, None if the request carries no
+                credentials
+        """
+        if request.COOKIES.get("access_token"):
+            return "cookie_jwt"
+        header = get_authorization_header(request).split()
+        if header and header[0].lower() == TokenAuthentication.keyword.lower().encode():
+            return "token"
+        if request.COOKIES.get(settings.SESSION_COOKIE_NAME):
+            return "session"
+        return None
+
+    def authenticate(self, request):
+        """
+        Authenticate the request with the matching authenticator.
+
+        Args:
+            request: The HTTP request object
+
+        Returns:
+            tuple: (user, auth) if authentication successful, None otherwise
+        """
+        name = self.get_authenticator_name(request)
+        if name is None:
+            return None
+        start = time.perf_counter()
+        try:
+            return self.authenticators[name].authenticate(request)
+        finally:
+            request._request.authentication_timing = (
+                name,
+                time.perf_counter() - start,
+            )
+
+    def authenticate_header(self, request):
+        """Challenge of the authenticator the request was meant for"""
+        name = self.get_authenticator_name(request)
+        if name is None:
+            return None
+        return self.authenticators[name].authenticate_header(request)
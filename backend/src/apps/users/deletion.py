@@ -0,0 +1,154 @@
+"""
+Batched deletion of user accounts.
+
+Deleting a User row directly would delete or detach everything that points
+at it in one transaction. Instead the account is deactivated when deletion
+is requested, and delete_accounts later works through an AccountDeletion:
+it deletes the rows the user owns, nulls the remaining references to the
+user, each in small batches with their own transaction, and only then
+deletes the user row itself, which by then has almost nothing to cascade.
+"""
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from base.cache import bump_user_version
+from categories.models import Category
+from projects.models import Project
+from tasks.models import Task
+from .models import AccountDeletion, User
+
+# Rows deleted with the account, as (model, field naming the owner), in
+# an order where each model's rows are gone before those they belong to
+OWNED_ROWS = (
+    (Task, "owner"),
+    (Project, "created_by"),
+    (Category, "created_by"),
+)
+
+
+def request_account_deletion(user):
+    """
+    Deactivate a user and queue their account for deletion.
+
+    Args:
+        user: User whose account to delete
+
+    Returns:
+        AccountDeletion: The queued (or already queued) deletion
+    """
+    with transaction.atomic():
+        deletion, created = AccountDeletion.objects.get_or_create(
+            user=user, defaults={"email": user.email}
+        )
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+    bump_user_version(user.pk)
+    return deletion
+
+
+def process_account_deletion(deletion, batch_size, report=None):
+    """
+    Delete the account of a queued deletion in batches.
+
+    Args:
+        deletion: AccountDeletion to work off
+        batch_size: Number of rows per batch and transaction
+        report: Optional callable receiving the deletion after every batch
+    """
+    deletion.status = "running"
+    deletion.started_at = deletion.started_at or timezone.now()
+    deletion.error = ""
+    deletion.save(update_fields=["status", "started_at", "error"])
+    user_id = deletion.user_id
+
+    try:
+        for model, field in OWNED_ROWS:
+            deletion.step = f"Deleting {model._meta.verbose_name_plural}"
+            rows = model.objects.filter(**{f"{field}_id": user_id})
+            for count in delete_in_batches(rows, batch_size):
+                record_progress(deletion, count, report)
+
+        for model, field in get_user_references():
+            deletion.step = f"Detaching {model._meta.verbose_name_plural}"
+            rows = model.objects.filter(**{field.attname: user_id})
+            for count in null_in_batches(rows, field, batch_size):
+                record_progress(deletion, count, report)
+
+        deletion.step = "Deleting account"
+        with transaction.atomic():
+            User.objects.filter(pk=user_id).delete()
+    except Exception as error:
+        deletion.status = "failed"
+        deletion.error = str(error)
+        deletion.save(update_fields=["status", "step", "error"])
+        raise
+
+    deletion.status = "done"
+    deletion.step = ""
+    deletion.finished_at = timezone.now()
+    deletion.save(update_fields=["status", "step", "finished_at"])
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Delete the rows of a queryset one batch per transaction.
+
+    Rows are deactivated before they are deleted, so the counter receivers
+    of tasks and projects see rows that no longer count and have nothing
+    to update.
+
+    Yields:
+        int: Number of rows deleted by each batch
+    """
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            batch = queryset.model.objects.filter(pk__in=ids)
+            batch.update(is_active=False)
+            batch.delete()
+        yield len(ids)
+
+
+def null_in_batches(queryset, field, batch_size):
+    """
+    Clear a foreign key on the rows of a queryset one batch per transaction.
+
+    Yields:
+        int: Number of rows updated by each batch
+    """
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            queryset.model.objects.filter(pk__in=ids).update(**{field.name: None})
+        yield len(ids)
+
+
+def get_user_references():
+    """
+    Find the nullable foreign keys to the user model.
+
+    Returns:
+        list: (model, field) pairs of every SET_NULL foreign key to User,
+            except the deletion's own link to the account
+    """
+    return [
+        (relation.related_model, relation.field)
+        for relation in User._meta.related_objects
+        if relation.one_to_many
+        and relation.on_delete is models.SET_NULL
+        and relation.related_model is not AccountDeletion
+    ]
+
+
+def record_progress(deletion, count, report):
+    """Add a batch to the deletion's progress and report it"""
+    deletion.rows_processed += count
+    deletion.claimed_at = timezone.now()
+    deletion.save(update_fields=["step", "rows_processed", "claimed_at"])
+    if report:
+        report(deletion)
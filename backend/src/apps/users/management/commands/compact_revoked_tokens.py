@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.revocation import compact_revoked_tokens
+
+
+class Command(BaseCommand):
+    """
+    Delete the stored revocations of tokens that have expired.
+
+    An expired token is refused anyway, so its row only makes the table and
+    every process's set of revoked tokens bigger.
+    """
+
+    help = "Delete revoked tokens that have expired"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows to delete per transaction (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        deleted = compact_revoked_tokens(batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f"Expired revoked tokens deleted: {deleted}")
+        )
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from users.deletion import process_account_deletion
+from users.models import AccountDeletion
+
+
+class Command(BaseCommand):
+    """
+    Work off queued account deletions in batches.
+
+    Each deletion is claimed with a conditional status update, so several
+    workers can run the command side by side without picking up the same
+    account. Failed deletions are retried on the next run, and so are
+    running ones whose worker has not finished a batch for
+    ACCOUNT_DELETION_CLAIM_TIMEOUT seconds, as it most likely died.
+    """
+
+    help = "Delete the accounts of users who requested it"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows to delete or update per transaction (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        processed = failed = 0
+        stale = timezone.now() - timedelta(
+            seconds=settings.ACCOUNT_DELETION_CLAIM_TIMEOUT
+        )
+        queued = AccountDeletion.objects.filter(
+            Q(status__in=["pending", "failed"])
+            | Q(status="running", claimed_at__isnull=True)
+            | Q(status="running", claimed_at__lt=stale),
+            user__isnull=False,
+        ).values_list("pk", "status", "claimed_at")
+        for pk, queued_status, claimed_at in list(queued):
+            # Matching the old claim too means only one worker takes over a
+            # stale job
+            claimed = AccountDeletion.objects.filter(
+                pk=pk, status=queued_status, claimed_at=claimed_at
+            ).update(status="running", claimed_at=timezone.now())
+            if not claimed:
+                continue
+
+            deletion = AccountDeletion.objects.get(pk=pk)
+            self.stdout.write(f"Deleting account {deletion.email}")
+            try:
+                process_account_deletion(deletion, batch_size, report=self.report)
+            except Exception as error:
+                failed += 1
+                self.stderr.write(f"  Failed: {error}")
+                continue
+            processed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Accounts deleted: {processed}, failed: {failed}")
+        )
+
+    def report(self, deletion):
+        """Print the progress of a deletion after a batch"""
+        self.stdout.write(
+            f"  {deletion.step}: {deletion.rows_processed} rows", self.style.HTTP_INFO
+        )
@@ -0,0 +1,18 @@
+class ServerTimingMiddleware:
+    """
+    Report how long authentication took in a Server-Timing header.
+
+    Reads the (authenticator, seconds) pair DispatchingAuthentication left
+    on the request, e.g. Server-Timing: auth;desc="cookie_jwt";dur=0.42
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        timing = getattr(request, "authentication_timing", None)
+        if timing:
+            name, seconds = timing
+            response["Server-Timing"] = f'auth;desc="{name}";dur={seconds * 1000:.2f}'
+        return response
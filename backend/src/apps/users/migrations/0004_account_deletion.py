@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-16 23:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_created_at_user_created_by_user_date_joined_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(help_text='Email of the account being deleted', max_length=254)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('step', models.CharField(blank=True, help_text='What the worker is currently doing', max_length=100)),
+                ('rows_processed', models.PositiveIntegerField(default=0, help_text='Rows deleted or detached from the account so far')),
+                ('error', models.TextField(blank=True, help_text='Error of the last failed run')),
+                ('requested_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.OneToOneField(blank=True, help_text='Account being deleted, empty once it is gone', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='account_deletion', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['requested_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_revoked_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountdeletion',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='Last sign of life of the running worker', null=True),
+        ),
+    ]
@@ -81,3 +81,76 @@ class User(AbstractBaseUser, PermissionsMixin, TrackableModel):
 
     class Meta:
         app_label = "users"
+
+
+class AccountDeletion(models.Model):
+    """
+    Deletion of a user account, worked off in batches by delete_accounts.
+
+    The user is deactivated as soon as the deletion is requested. The
+    worker records its step and the rows it has handled, so progress can be
+    followed in the admin and a failed job can be picked up again. A
+    running job refreshes claimed_at after every batch; one that has not
+    for ACCOUNT_DELETION_CLAIM_TIMEOUT seconds is taken to have died with
+    its worker and is picked up again as well.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="account_deletion",
+        help_text="Account being deleted, empty once it is gone",
+    )
+    email = models.EmailField(help_text="Email of the account being deleted")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    step = models.CharField(
+        max_length=100, blank=True, help_text="What the worker is currently doing"
+    )
+    rows_processed = models.PositiveIntegerField(
+        default=0, help_text="Rows deleted or detached from the account so far"
+    )
+    error = models.TextField(blank=True, help_text="Error of the last failed run")
+    requested_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last sign of life of the running worker"
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "users"
+        ordering = ["requested_at"]
+
+    def __str__(self):
+        return f"{self.email} - {self.status}"
+
+
+class RevokedToken(models.Model):
+    """
+    A JWT revoked before it expires, identified by its jti claim.
+
+    Checked through the in-process set of users.revocation rather than
+    queried per request. Rows are only needed until the token would have
+    expired anyway; compact_revoked_tokens deletes them after that.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(
+        db_index=True, help_text="When the token expires and the row can go"
+    )
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = "users"
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,119 @@
+"""
+Revocation of JWTs before they expire.
+
+Revoked tokens are stored by jti in RevokedToken, and every process keeps
+the jtis of the revoked, still unexpired tokens in memory. Checking a
+token is a set lookup; the set is reloaded from the table at most every
+REVOKED_TOKENS_SYNC_INTERVAL seconds, so the usual case, a token that
+was never revoked, costs no query. A token revoked by another process
+is therefore refused by this one within that interval; tokens revoked
+by this process are refused right away.
+
+Rows of expired tokens are no longer needed, as the token is refused
+anyway; compact_revoked_tokens deletes them.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+# jti -> expiry timestamp of every revoked, unexpired token
+_revoked = {}
+_synced_at = None
+_sync_lock = threading.Lock()
+
+
+def revoke_token(token):
+    """
+    Revoke a token until it expires.
+
+    Args:
+        token: Validated simplejwt token (access or refresh)
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    expires = token["exp"]
+    RevokedToken.objects.get_or_create(
+        jti=jti,
+        defaults={"expires_at": datetime.fromtimestamp(expires, tz=dt_timezone.utc)},
+    )
+    _revoked[jti] = expires
+
+
+def is_revoked(jti):
+    """
+    Check whether a token has been revoked.
+
+    Args:
+        jti: The token's jti claim
+
+    Returns:
+        bool: True if the token was revoked
+    """
+    if jti is None:
+        return False
+    sync_if_due()
+    return jti in _revoked
+
+
+def sync_if_due():
+    """Reload the revoked tokens if the last load is older than the interval"""
+    if (
+        _synced_at is not None
+        and time.monotonic() - _synced_at < settings.REVOKED_TOKENS_SYNC_INTERVAL
+    ):
+        return
+    # One thread reloads; the others keep using the current set meanwhile
+    if not _sync_lock.acquire(blocking=False):
+        return
+    try:
+        sync()
+    finally:
+        _sync_lock.release()
+
+
+def sync():
+    """Replace the in-process set with the unexpired revoked tokens"""
+    global _revoked, _synced_at
+    now = timezone.now()
+    _revoked = {
+        jti: expires_at.timestamp()
+        for jti, expires_at in RevokedToken.objects.filter(
+            expires_at__gt=now
+        ).values_list("jti", "expires_at")
+    }
+    _synced_at = time.monotonic()
+
+
+def clear_revocations():
+    """Forget the in-process set, so the next check reloads it"""
+    global _revoked, _synced_at
+    _revoked = {}
+    _synced_at = None
+
+
+def compact_revoked_tokens(batch_size):
+    """
+    Delete the rows of expired revoked tokens, one batch per transaction.
+
+    Args:
+        batch_size: Number of rows per batch
+
+    Returns:
+        int: Number of rows deleted
+    """
+    deleted = 0
+    expired = RevokedToken.objects.filter(expires_at__lte=timezone.now())
+    while True:
+        ids = list(expired.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            RevokedToken.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
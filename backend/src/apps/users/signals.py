@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from base.cache import bump_user_version
+from .user_cache import forget_user
+from .models import User
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    """
+    Drop a changed user from the authentication cache of every process.
+
+    The version is bumped once the write commits, so no process can cache
+    the row as it was before under the new version.
+    """
+    forget_user(instance.pk)
+    user_id = instance.pk
+    transaction.on_commit(lambda: bump_user_version(user_id))
@@ -1,3 +1,286 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from base import cache as two_level
+from categories.models import Category
+from projects.models import Project
+from tasks.models import Task
+from . import revocation, user_cache
+from .models import AccountDeletion, RevokedToken
+
+User = get_user_model()
+
+
+class AccountDeletionTest(APITestCase):
+    """Test queued, batched deletion of user accounts"""
+
+    def setUp(self):
+        """Create a user with some data and a second user referencing them"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="leaving@example.com", username="leaving", password="testpass123"
+        )
+        self.other = User.objects.create_user(
+            email="staying@example.com", username="staying", password="testpass123"
+        )
+        category = Category.objects.create(name="Work", created_by=self.user)
+        project = Project.objects.create(
+            name="Project",
+            category=category,
+            start_date=date.today(),
+            due_date=date.today() + timedelta(days=30),
+            created_by=self.user,
+        )
+        for index in range(5):
+            Task.objects.create(
+                name=f"Task {index}",
+                project=project,
+                start_date=date.today(),
+                due_date=date.today() + timedelta(days=7),
+                created_by=self.user,
+            )
+        self.other_category = Category.objects.create(
+            name="Shared", created_by=self.other, updated_by=self.user
+        )
+        self.url = reverse("user-info")
+        self.client.force_authenticate(user=self.user)
+
+    def test_request_deletion(self):
+        """Test that requesting deletion deactivates the account and queues it"""
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "pending")
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(AccountDeletion.objects.get().user, self.user)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 5)
+
+        # Asking again does not queue a second deletion
+        self.client.delete(self.url)
+        self.assertEqual(AccountDeletion.objects.count(), 1)
+
+    def test_delete_accounts_command(self):
+        """Test that the command deletes owned rows, detaches others and the user"""
+        self.client.delete(self.url)
+        out = StringIO()
+        call_command("delete_accounts", "--batch-size", "2", stdout=out)
+
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(Project.objects.exists())
+        self.assertEqual(list(Category.objects.all()), [self.other_category])
+        self.other_category.refresh_from_db()
+        self.assertIsNone(self.other_category.updated_by)
+
+        deletion = AccountDeletion.objects.get()
+        self.assertEqual(deletion.status, "done")
+        self.assertIsNone(deletion.user)
+        self.assertEqual(deletion.email, "leaving@example.com")
+        # 5 tasks, 1 project, 1 category and 1 detached category
+        self.assertEqual(deletion.rows_processed, 8)
+        self.assertIsNotNone(deletion.finished_at)
+        self.assertIn("Accounts deleted: 1, failed: 0", out.getvalue())
+
+        # A second run finds nothing left to do
+        out = StringIO()
+        call_command("delete_accounts", stdout=out)
+        self.assertIn("Accounts deleted: 0, failed: 0", out.getvalue())
+
+    def test_stale_running_deletion_resumed(self):
+        """Test that a deletion whose worker died is picked up again"""
+        self.client.delete(self.url)
+        deletion = AccountDeletion.objects.get()
+        deletion.status = "running"
+        deletion.claimed_at = timezone.now()
+        deletion.save()
+
+        # A worker is still busy with it
+        out = StringIO()
+        call_command("delete_accounts", stdout=out)
+        self.assertIn("Accounts deleted: 0, failed: 0", out.getvalue())
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+        AccountDeletion.objects.update(claimed_at=timezone.now() - timedelta(hours=1))
+        out = StringIO()
+        call_command("delete_accounts", stdout=out)
+        self.assertIn("Accounts deleted: 1, failed: 0", out.getvalue())
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertEqual(AccountDeletion.objects.get().status, "done")
+
+
+class UserCacheTest(APITestCase):
+    """Test that cookie authentication serves users from the in-process cache"""
+
+    def setUp(self):
+        """Create a user and log in with an access token cookie"""
+        cache.clear()
+        user_cache.clear_users()
+        two_level.clear_local()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+        self.url = reverse("user-info")
+
+    def get_user_queries(self, url):
+        """Request a URL and return its status and the number of user queries"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response.status_code, sum(
+            'FROM "users_user"' in query["sql"] for query in queries.captured_queries
+        )
+
+    def test_user_loaded_once(self):
+        """Test that only the first request loads the user"""
+        self.assertEqual(self.get_user_queries(self.url), (status.HTTP_200_OK, 1))
+        self.assertEqual(self.get_user_queries(self.url), (status.HTTP_200_OK, 0))
+        with self.settings(USER_CACHE_TIMEOUT=0):
+            self.assertEqual(self.get_user_queries(self.url), (status.HTTP_200_OK, 1))
+
+    def test_changed_user_reloaded(self):
+        """Test that saving a user drops it from the cache"""
+        self.client.get(self.url)
+        self.user.username = "renamed"
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["username"], "renamed")
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertIn(
+            response.status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+    def test_user_changed_by_another_process(self):
+        """Test that a user deactivated by another process is reloaded"""
+        self.client.get(self.url)
+        # Another process deactivates the user, leaving this process's cache
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        cache.set(f"user:{self.user.pk}:version", "other", timeout=None)
+        two_level.clear_local()
+        response = self.client.get(self.url)
+        self.assertIn(
+            response.status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+    def test_stateless_typeahead(self):
+        """Test that the typeahead authenticates without loading the user"""
+        self.assertEqual(
+            self.get_user_queries(reverse("typeahead") + "?q=a"),
+            (status.HTTP_200_OK, 0),
+        )
+        self.client.cookies["access_token"] = "invalid"
+        response = self.client.get(reverse("typeahead"), {"q": "a"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticationDispatchTest(APITestCase):
+    """Test that only the authenticator matching the request's credentials runs"""
+
+    def setUp(self):
+        """Create a user"""
+        cache.clear()
+        user_cache.clear_users()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.url = reverse("user-info")
+
+    def test_cookie_jwt_skips_session(self):
+        """Test that a JWT cookie request never reads the session"""
+        self.client.login(email="test@example.com", password="testpass123")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Server-Timing"].startswith('auth;desc="cookie_jwt"'))
+        self.assertFalse(
+            any("django_session" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_session(self):
+        """Test that a session cookie alone authenticates with the session"""
+        self.client.login(email="test@example.com", password="testpass123")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Server-Timing"].startswith('auth;desc="session"'))
+
+    def test_no_credentials(self):
+        """Test that a request without credentials is anonymous and untimed"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertNotIn("Server-Timing", response)
+
+
+class TokenRevocationTest(APITestCase):
+    """Test that logging out revokes the tokens in every process"""
+
+    def setUp(self):
+        """Create a user and log in with token cookies"""
+        cache.clear()
+        user_cache.clear_users()
+        revocation.clear_revocations()
+        self.user = User.objects.create_user(
+            email="test@example.com", username="testuser", password="testpass123"
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = self.refresh.access_token
+        self.client.cookies["refresh_token"] = str(self.refresh)
+        self.client.cookies["access_token"] = str(self.access)
+
+    def test_logout_revokes_tokens(self):
+        """Test that neither token can be used after logout"""
+        refresh, access = str(self.refresh), str(self.access)
+        response = self.client.post(reverse("user-logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RevokedToken.objects.count(), 2)
+
+        self.client.cookies["refresh_token"] = refresh
+        response = self.client.post(reverse("token-refresh"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data["error"], "Token has been revoked")
+
+        self.client.cookies["access_token"] = access
+        response = self.client.get(reverse("user-info"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_by_other_process(self):
+        """Test that a token revoked elsewhere is refused after the next sync"""
+        url = reverse("user-info")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        RevokedToken.objects.create(
+            jti=self.access["jti"],
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        # The set loaded by the first request is still current
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with self.settings(REVOKED_TOKENS_SYNC_INTERVAL=0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_compact_revoked_tokens(self):
+        """Test that compaction deletes only the expired revocations"""
+        now = timezone.now()
+        RevokedToken.objects.create(jti="expired", expires_at=now - timedelta(1))
+        RevokedToken.objects.create(jti="valid", expires_at=now + timedelta(1))
+        out = StringIO()
+        call_command("compact_revoked_tokens", "--batch-size", "1", stdout=out)
+        self.assertIn("Expired revoked tokens deleted: 1", out.getvalue())
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["valid"]
+        )
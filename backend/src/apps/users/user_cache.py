@@ -0,0 +1,98 @@
+"""
+In-process cache of the users that authenticate with an access token.
+
+Every authenticated request has to turn the token's user ID into a User,
+which is one query per request for data that hardly ever changes. Users
+are kept here for up to USER_CACHE_TIMEOUT seconds, for the most recently
+seen USER_CACHE_MAX_USERS users of the process.
+
+Saving or deleting a user drops it from the cache of the process doing the
+write, and bumps the user's shared cache version once the write commits
+(see users.signals). Every hit checks that the version it was cached
+under is still current, so other processes notice the change as soon as
+they read the version again, which base.cache does at least every
+LOCAL_CACHE_TIMEOUT seconds: that is the longest a deactivated user can
+still be let in by another process.
+
+Each hit returns a fresh User instance, so a request changing its
+request.user never affects another request.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from base.cache import get_user_version
+
+_users = OrderedDict()
+_lock = threading.Lock()
+# Incremented by every invalidation, so a load that raced with one is not
+# stored
+_generation = 0
+
+
+def get_user(user_id, load):
+    """
+    Get a user from the cache, loading and caching it on a miss.
+
+    Args:
+        user_id: ID of the user
+        load: Callable returning the User, called on a miss; exceptions it
+            raises are passed on and nothing is cached
+
+    Returns:
+        User: A new instance of the cached user
+    """
+    if settings.USER_CACHE_TIMEOUT <= 0:
+        return load()
+    key = str(user_id)
+    version = get_user_version(user_id)
+    with _lock:
+        cached = _users.get(key)
+        if cached and cached[0] > time.monotonic() and cached[1] == version:
+            _users.move_to_end(key)
+            db, values = cached[2], cached[3]
+            return get_user_model().from_db(db, get_field_names(), values)
+        generation = _generation
+
+    user = load()
+    values = tuple(getattr(user, name) for name in get_field_names())
+    expires = time.monotonic() + settings.USER_CACHE_TIMEOUT
+    with _lock:
+        if generation == _generation:
+            _users[key] = (expires, version, user._state.db, values)
+            _users.move_to_end(key)
+            while len(_users) > settings.USER_CACHE_MAX_USERS:
+                _users.popitem(last=False)
+    return user
+
+
+def forget_user(user_id):
+    """
+    Drop a user from this process's cache.
+
+    Args:
+        user_id: ID of the user that changed
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+        _users.pop(str(user_id), None)
+
+
+def clear_users():
+    """Drop every user held by the process"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _users.clear()
+
+
+@cache
+def get_field_names():
+    """Get the attribute names of the user's columns, in model order"""
+    return tuple(field.attname for field in get_user_model()._meta.concrete_fields)
@@ -8,13 +8,15 @@ from .serializers import (
     LoginUserSerializer,
 )
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.views import TokenRefreshView
-from rest_framework_simplejwt.exceptions import InvalidToken
-from datetime import timedelta
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.conf import settings
+from . import revocation
+from .deletion import request_account_deletion
 from .models import User
 
 
@@ -32,6 +34,29 @@ class UserInfoView(RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
 
+    def delete(self, request, *args, **kwargs):
+        """
+        Deactivate the account and queue it for deletion.
+
+        The account is removed in the background by the delete_accounts
+        command; the session cookies are cleared right away.
+
+        Returns:
+            Response: 202 with the status of the queued deletion
+        """
+        deletion = request_account_deletion(request.user)
+        response = Response(
+            {"message": "Account scheduled for deletion", "status": deletion.status},
+            status=status.HTTP_202_ACCEPTED,
+        )
+        response.delete_cookie(
+            "access_token", samesite="Lax" if settings.DEBUG else "None"
+        )
+        response.delete_cookie(
+            "refresh_token", samesite="Lax" if settings.DEBUG else "None"
+        )
+        return response
+
 
 class UserRegistrationView(CreateAPIView):
     """
@@ -42,6 +67,7 @@ class UserRegistrationView(CreateAPIView):
     Automatically logs the user in after successful registration.
     """
 
+    throttle_scope = "auth"
     permission_classes = ()  # No authentication required for registration
     serializer_class = RegisterUserSerializer
 
@@ -94,6 +120,7 @@ class LoginView(APIView):
     HTTP-only cookies for maintaining user sessions.
     """
 
+    throttle_scope = "auth"
     permission_classes = ()  # No authentication required for login
 
     def post(self, request):
@@ -144,10 +171,12 @@ class LogoutView(APIView):
     """
     View for user logout and session termination.
 
-    Invalidates JWT tokens and removes them from cookies
-    to ensure proper user logout and security.
+    Revokes the JWT tokens (see users.revocation) and removes them from
+    cookies to ensure proper user logout and security.
     """
 
+    throttle_scope = "auth"
+
     def post(self, request):
         """
         Handle user logout request.
@@ -161,25 +190,22 @@ class LogoutView(APIView):
         refresh_token = request.COOKIES.get("refresh_token")
 
         if refresh_token:
-            # try:
-            #     refresh = RefreshToken(refresh_token)
-            #     refresh.blacklist()
-            # except Exception as e:
-            #     return Response(
-            #         {"error": "Error invalidating token:" + str(e)},
-            #         status=status.HTTP_400_BAD_REQUEST,
-            #     )
             try:
-                # In newer versions, we can just invalidate the token
-                refresh = RefreshToken(refresh_token)
-                # Mark the token as invalid
-                refresh.set_exp(lifetime=timedelta(seconds=0))
+                revocation.revoke_token(RefreshToken(refresh_token))
             except Exception as e:
                 return Response(
                     {"error": "Error invalidating token: " + str(e)},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+        access_token = request.COOKIES.get("access_token")
+        if access_token:
+            # The access token would otherwise stay usable until it expires
+            try:
+                revocation.revoke_token(AccessToken(access_token))
+            except TokenError:
+                pass
+
         response = Response(
             {"message": "Successfully logged out!"}, status=status.HTTP_200_OK
         )
@@ -201,6 +227,8 @@ class CookieTokenRefreshView(TokenRefreshView):
     cookie-based JWT tokens instead of header-based tokens.
     """
 
+    throttle_scope = "auth"
+
     def post(self, request):
         """
         Refresh access token using refresh token from cookies.
@@ -221,6 +249,11 @@ class CookieTokenRefreshView(TokenRefreshView):
 
         try:
             refresh = RefreshToken(refresh_token)
+            if revocation.is_revoked(refresh[jwt_settings.JTI_CLAIM]):
+                return Response(
+                    {"error": "Token has been revoked"},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                )
             access_token = str(refresh.access_token)
 
             response = Response(
@@ -237,7 +270,7 @@ class CookieTokenRefreshView(TokenRefreshView):
                 ),  # Lax for development, None for production
             )
             return response
-        except InvalidToken:
+        except (InvalidToken, TokenError):
             return Response(
                 {"error": "Invalid token"}, status=status.HTTP_401_UNAUTHORIZED
             )
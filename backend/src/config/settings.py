@@ -66,6 +66,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "users.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -77,17 +78,77 @@ MIDDLEWARE = [
 ]
 
 REST_FRAMEWORK = {
+    # Runs only the authenticator matching the request's credentials: the
+    # cookie-based JWT, a DRF token or a session (for the browsable API)
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.SessionAuthentication",  # For view in rest_framework dashboard
-        "rest_framework.authentication.TokenAuthentication",  # For view in rest_framework dashboard
-        "apps.users.authentications.CookieJWTAuthentication",  # Custom cookie-based JWT auth
+        "apps.users.authentications.DispatchingAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    # Request budgets per user, or per IP for anonymous requests, counted in
+    # process by sliding windows (see base.throttling). Views choose "auth"
+    # or "heavy" with throttle_scope, the others are read or write by method
+    "DEFAULT_THROTTLE_CLASSES": ("base.throttling.EndpointRateThrottle",),
+    "DEFAULT_THROTTLE_RATES": {
+        "auth": "20/min",
+        "read": "600/min",
+        "write": "120/min",
+        "heavy": "30/min",
+    },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Seconds a cached dashboard may be served; writes invalidate it sooner
+DASHBOARD_CACHE_TIMEOUT = 300
+
+# Seconds the serialized categories, projects and tasks of list responses
+# are cached; off (0) unless the deployment opts in. Saving an object
+# replaces its entry sooner
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv("FRAGMENT_CACHE_TIMEOUT", "0"))
+
+# Seconds a list total reported by ?pagination=estimate may be reused
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+
+# Days trashed categories, projects and tasks are kept before purge_trash
+# deletes them
+TRASH_RETENTION_DAYS = 30
+
+# Seconds after its last batch that a running account deletion is taken to
+# have lost its worker, so delete_accounts picks it up again
+ACCOUNT_DELETION_CLAIM_TIMEOUT = 600
+
+# Maximum number of items accepted by the bulk task endpoints
+TASK_BULK_MAX_ITEMS = 500
+
+# Rows the task export reads from the database cursor at a time
+TASK_EXPORT_CHUNK_SIZE = 2000
+
+# Rows a task import validates and inserts per transaction, and the most
+# row errors its report lists
+TASK_IMPORT_BATCH_SIZE = 1000
+TASK_IMPORT_MAX_ERRORS = 1000
+
+# PostgreSQL row estimates below this are replaced by an exact (cached) count
+PAGINATION_EXACT_COUNT_THRESHOLD = 1000
+
+# Users whose typeahead index each process keeps in memory, and the most
+# results one typeahead lookup may return
+TYPEAHEAD_MAX_USERS = 200
+TYPEAHEAD_MAX_RESULTS = 50
+
+# Seconds an authenticated user may be served from the in-process user
+# cache (0 disables it), and the most users each process keeps
+USER_CACHE_TIMEOUT = 60
+USER_CACHE_MAX_USERS = 1000
+
+# Users and scopes whose request counters each process keeps for throttling
+THROTTLE_MAX_KEYS = 10000
+
+# Seconds between reloads of the revoked tokens by each process, the longest
+# a token revoked by another process can still be used here
+REVOKED_TOKENS_SYNC_INTERVAL = 30
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -136,6 +197,41 @@ else:
 # print(f"The database engine is: {DATABASES}")
 
 
+if os.getenv("REDIS_URL"):
+    # Redis shared by every process (needs the redis package)
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+elif "test" in sys.argv[1:2]:
+    # Tests run in a single process, with a cache that starts out empty
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    # Database table shared by every process, created by the base migrations
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        }
+    }
+
+# Seconds the in-process level of the two-level cache keeps a value, and the
+# most values each process keeps (see base.cache)
+LOCAL_CACHE_TIMEOUT = 5
+LOCAL_CACHE_MAX_ITEMS = 5000
+
+# Seconds a value past its timeout may still be served while one request
+# recomputes it, and the longest a recomputation holds the key's lock
+CACHE_STALE_TIMEOUT = 30
+CACHE_LOCK_TIMEOUT = 10
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
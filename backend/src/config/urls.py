@@ -10,6 +10,7 @@ from drf_spectacular.views import (
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
+from projects.views import TypeaheadView
 
 # from django.conf.urls.static import static # Not used
 # from django.conf import settings # Not used
@@ -28,6 +29,8 @@ urlpatterns = [
     path("api/projects/", include("projects.urls")),
     # tasks
     path("api/tasks/", include("tasks.urls")),
+    # name lookups across categories, projects and tasks
+    path("api/typeahead/", TypeaheadView.as_view(), name="typeahead"),
     # OpenAPI Schema URLs
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(